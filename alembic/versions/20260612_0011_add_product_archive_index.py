@@ -0,0 +1,48 @@
+"""add composite index for the product archive list
+
+Revision ID: 20260612_0011
+Revises: 20260610_0010
+Create Date: 2026-06-12 00:11:00
+"""
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+
+revision = "20260612_0011"
+down_revision = "20260610_0010"
+branch_labels = None
+depends_on = None
+
+_INDEX_NAME = "ix_products_user_archived_updated"
+_INDEX_COLUMNS = ["user_id", "archived", "updated_at"]
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if "products" not in set(inspector.get_table_names()):
+        return
+
+    existing_columns = {column["name"] for column in inspector.get_columns("products")}
+    existing_indexes = {index["name"] for index in inspector.get_indexes("products")}
+    if _INDEX_NAME in existing_indexes or not set(_INDEX_COLUMNS).issubset(existing_columns):
+        return
+
+    with op.batch_alter_table("products") as batch_op:
+        batch_op.create_index(_INDEX_NAME, _INDEX_COLUMNS, unique=False)
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if "products" not in set(inspector.get_table_names()):
+        return
+
+    existing_indexes = {index["name"] for index in inspector.get_indexes("products")}
+    if _INDEX_NAME not in existing_indexes:
+        return
+
+    with op.batch_alter_table("products") as batch_op:
+        batch_op.drop_index(_INDEX_NAME)
@@ -0,0 +1,55 @@
+"""add composite indexes for export/import product filters and latest snapshots
+
+Revision ID: 20260614_0012
+Revises: 20260612_0011
+Create Date: 2026-06-14 00:12:00
+"""
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+
+revision = "20260614_0012"
+down_revision = "20260612_0011"
+branch_labels = None
+depends_on = None
+
+_INDEXES = (
+    ("products", "ix_products_user_shop", ["user_id", "shop_id"]),
+    ("products", "ix_products_user_source_url", ["user_id", "source_url"]),
+    ("product_snapshots", "ix_snapshots_product_scraped_at", ["product_id", "scraped_at"]),
+)
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    table_names = set(inspector.get_table_names())
+
+    for table_name, index_name, columns in _INDEXES:
+        if table_name not in table_names:
+            continue
+        existing_columns = {column["name"] for column in inspector.get_columns(table_name)}
+        existing_indexes = {index["name"] for index in inspector.get_indexes(table_name)}
+        if index_name in existing_indexes or not set(columns).issubset(existing_columns):
+            continue
+
+        with op.batch_alter_table(table_name) as batch_op:
+            batch_op.create_index(index_name, columns, unique=False)
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    table_names = set(inspector.get_table_names())
+
+    for table_name, index_name, _ in reversed(_INDEXES):
+        if table_name not in table_names:
+            continue
+        existing_indexes = {index["name"] for index in inspector.get_indexes(table_name)}
+        if index_name not in existing_indexes:
+            continue
+
+        with op.batch_alter_table(table_name) as batch_op:
+            batch_op.drop_index(index_name)
@@ -0,0 +1,64 @@
+"""add unique (user_id, keyword) constraint to exclusion keywords
+
+Revision ID: 20260616_0013
+Revises: 20260614_0012
+Create Date: 2026-06-16 00:13:00
+"""
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+
+revision = "20260616_0013"
+down_revision = "20260614_0012"
+branch_labels = None
+depends_on = None
+
+_CONSTRAINT_NAME = "uq_exclusion_keywords_user_keyword"
+
+
+def _has_user_keyword_unique(inspector) -> bool:
+    return any(
+        list(constraint.get("column_names") or []) == ["user_id", "keyword"]
+        for constraint in inspector.get_unique_constraints("exclusion_keywords")
+    )
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if "exclusion_keywords" not in set(inspector.get_table_names()):
+        return
+    if _has_user_keyword_unique(inspector):
+        return
+
+    # Keep the oldest row of any duplicate keyword registered before the constraint existed.
+    bind.execute(
+        sa.text(
+            "DELETE FROM exclusion_keywords "
+            "WHERE id NOT IN ("
+            "SELECT keep_id FROM ("
+            "SELECT MIN(id) AS keep_id FROM exclusion_keywords GROUP BY user_id, keyword"
+            ") AS kept"
+            ")"
+        )
+    )
+
+    with op.batch_alter_table("exclusion_keywords") as batch_op:
+        batch_op.create_unique_constraint(_CONSTRAINT_NAME, ["user_id", "keyword"])
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if "exclusion_keywords" not in set(inspector.get_table_names()):
+        return
+    existing_names = {
+        constraint.get("name") for constraint in inspector.get_unique_constraints("exclusion_keywords")
+    }
+    if _CONSTRAINT_NAME not in existing_names:
+        return
+
+    with op.batch_alter_table("exclusion_keywords") as batch_op:
+        batch_op.drop_constraint(_CONSTRAINT_NAME, type_="unique")
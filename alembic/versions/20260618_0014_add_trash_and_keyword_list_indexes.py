@@ -0,0 +1,62 @@
+"""add indexes for the trash list, trash auto-purge and exclusion keyword list
+
+Revision ID: 20260618_0014
+Revises: 20260616_0013
+Create Date: 2026-06-18 00:14:00
+"""
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+
+revision = "20260618_0014"
+down_revision = "20260616_0013"
+branch_labels = None
+depends_on = None
+
+_TRASHED_ONLY = sa.text("deleted_at IS NOT NULL")
+
+_INDEXES = (
+    ("products", "ix_products_user_deleted_at", ["user_id", "deleted_at"], {}),
+    (
+        "products",
+        "ix_products_trashed_deleted_at",
+        ["deleted_at"],
+        {"postgresql_where": _TRASHED_ONLY, "sqlite_where": _TRASHED_ONLY},
+    ),
+    ("exclusion_keywords", "ix_exclusion_keywords_user_created", ["user_id", "created_at"], {}),
+)
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    table_names = set(inspector.get_table_names())
+
+    for table_name, index_name, columns, dialect_kwargs in _INDEXES:
+        if table_name not in table_names:
+            continue
+        existing_columns = {column["name"] for column in inspector.get_columns(table_name)}
+        existing_indexes = {index["name"] for index in inspector.get_indexes(table_name)}
+        if index_name in existing_indexes or not set(columns).issubset(existing_columns):
+            continue
+
+        with op.batch_alter_table(table_name) as batch_op:
+            batch_op.create_index(index_name, columns, unique=False, **dialect_kwargs)
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    table_names = set(inspector.get_table_names())
+
+    for table_name, index_name, _, _ in reversed(_INDEXES):
+        if table_name not in table_names:
+            continue
+        existing_indexes = {index["name"] for index in inspector.get_indexes(table_name)}
+        if index_name not in existing_indexes:
+            continue
+
+        with op.batch_alter_table(table_name) as batch_op:
+            batch_op.drop_index(index_name)
@@ -10,6 +10,8 @@ from sqlalchemy import create_engine, inspect, text
 from sqlalchemy.engine import make_url
 from sqlalchemy.orm import declarative_base, scoped_session, sessionmaker
 
+from utils.env_helpers import env_int
+
 
 DEFAULT_DATABASE_URL = "sqlite:///mercari.db"
 logger = logging.getLogger("database")
@@ -47,10 +49,10 @@ def create_app_engine(database_url: str | None = None):
             resolved_url,
             echo=False,
             pool_pre_ping=True,
-            pool_size=5,
-            max_overflow=10,
-            pool_recycle=300,
-            pool_timeout=30,
+            pool_size=max(1, env_int("DB_POOL_SIZE", 5)),
+            max_overflow=max(0, env_int("DB_MAX_OVERFLOW", 10)),
+            pool_recycle=env_int("DB_POOL_RECYCLE_SECONDS", 300),
+            pool_timeout=max(1, env_int("DB_POOL_TIMEOUT_SECONDS", 30)),
         )
 
     return engine
@@ -62,15 +64,16 @@ SessionLocal = scoped_session(_session_factory)
 Base = declarative_base()
 
 
-def create_isolated_session():
+def create_isolated_session(**session_options):
     """Return a brand-new Session independent of the thread-scoped registry.
 
     ``SessionLocal()`` returns the shared thread-local session, so helpers
     that call ``.close()`` on it tear down the caller's session as well.
     Long-running owners (patrol loop) and self-contained helpers must use
     an isolated session so closing it never affects other code paths.
+    ``session_options`` override the factory defaults (e.g. ``expire_on_commit``).
     """
-    return _session_factory()
+    return _session_factory(**session_options)
 
 
 # Legacy compatibility patchset for databases created before the Alembic chain
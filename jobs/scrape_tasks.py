@@ -3,7 +3,10 @@ Worker-callable scrape task execution.
 """
 from __future__ import annotations
 
+import copy
 import logging
+import threading
+from concurrent.futures import Future
 from typing import Any
 
 import offmall_db
@@ -27,6 +30,56 @@ from services.scrape_request import (
 logger = logging.getLogger("scrape_tasks")
 
 
+# Per-site scraper modules; anything else falls back to Mercari.
+_SITE_SCRAPER_MODULES = {
+    "yahoo": yahoo_db,
+    "rakuma": rakuma_db,
+    "surugaya": surugaya_db,
+    "offmall": offmall_db,
+    "yahuoku": yahuoku_db,
+    "snkrdunk": snkrdunk_db,
+}
+
+
+def _resolve_site_scrapers(site: str):
+    """Return ``(scrape_single_item, scrape_search_result)`` for a site, looked up at call time."""
+    module = _SITE_SCRAPER_MODULES.get(site)
+    if module is None:
+        return scrape_single_item, scrape_search_result
+    return module.scrape_single_item, module.scrape_search_result
+
+
+# Scrapes currently running in this process, keyed by what they fetch. A job
+# that asks for the same pages while another is in flight waits for that
+# result instead of hitting the site again; filtering and saving stay per job.
+_inflight_scrapes: dict[tuple, Future] = {}
+_inflight_lock = threading.Lock()
+
+
+def _run_coalesced(key: tuple, scrape_fn, *args, **kwargs):
+    with _inflight_lock:
+        future = _inflight_scrapes.get(key)
+        is_owner = future is None
+        if is_owner:
+            future = Future()
+            _inflight_scrapes[key] = future
+
+    if not is_owner:
+        return copy.deepcopy(future.result())
+
+    try:
+        result = scrape_fn(*args, **kwargs)
+    except BaseException as exc:
+        future.set_exception(exc)
+        raise
+    else:
+        future.set_result(copy.deepcopy(result))
+        return result
+    finally:
+        with _inflight_lock:
+            _inflight_scrapes.pop(key, None)
+
+
 def _get_smoke_result_payload(request_payload: dict[str, Any]) -> dict[str, Any] | None:
     for key in ("__smoke_result", "_smoke_result", "smoke_result"):
         candidate = request_payload.get(key)
@@ -103,43 +156,21 @@ def execute_scrape_job(request_payload: dict[str, Any]) -> dict[str, Any]:
 
         if target_url:
             url_kind, target_site = classify_target_url(target_url)
-            if url_kind == "search":
-                search_scraper_map = {
-                    "yahoo": yahoo_db.scrape_search_result,
-                    "rakuma": rakuma_db.scrape_search_result,
-                    "surugaya": surugaya_db.scrape_search_result,
-                    "offmall": offmall_db.scrape_search_result,
-                    "yahuoku": yahuoku_db.scrape_search_result,
-                    "snkrdunk": snkrdunk_db.scrape_search_result,
-                    "mercari": scrape_search_result,
-                }
-                search_fn = search_scraper_map.get(target_site, scrape_search_result)
-                search_url = target_url
-                search_limit = get_internal_search_limit(limit)
-                search_depth = get_search_depth(target_site, search_limit)
-                scraped = search_fn(
-                    search_url=target_url,
-                    max_items=search_limit,
-                    max_scroll=search_depth,
-                    headless=True,
-                )
-                finalize(scraped, target_site)
-            else:
-                scraper_map = {
-                    "yahoo": yahoo_db.scrape_single_item,
-                    "rakuma": rakuma_db.scrape_single_item,
-                    "surugaya": surugaya_db.scrape_single_item,
-                    "offmall": offmall_db.scrape_single_item,
-                    "yahuoku": yahuoku_db.scrape_single_item,
-                    "snkrdunk": snkrdunk_db.scrape_single_item,
-                    "mercari": scrape_single_item,
-                }
-                scraper_fn = scraper_map.get(target_site, scrape_single_item)
-                finalize(scraper_fn(target_url, headless=True), target_site)
         else:
-            search_limit = get_internal_search_limit(limit)
-            search_depth = get_search_depth(site, search_limit)
-            search_url = build_search_url(
+            url_kind = "search"
+            target_site = site if site in _SITE_SCRAPER_MODULES else "mercari"
+        single_fn, search_fn = _resolve_site_scrapers(target_site)
+
+        if url_kind == "item":
+            scraped = _run_coalesced(
+                ("item", target_site, target_url),
+                single_fn,
+                target_url,
+                headless=True,
+            )
+            finalize(scraped, target_site)
+        else:
+            search_url = target_url or build_search_url(
                 site=site,
                 keyword=keyword,
                 price_min=normalized_price_min,
@@ -147,63 +178,17 @@ def execute_scrape_job(request_payload: dict[str, Any]) -> dict[str, Any]:
                 sort=sort,
                 category=category,
             )
-
-            if site == "yahoo":
-                items = yahoo_db.scrape_search_result(
-                    search_url=search_url,
-                    max_items=search_limit,
-                    max_scroll=search_depth,
-                    headless=True,
-                )
-                finalize(items, "yahoo")
-            elif site == "rakuma":
-                items = rakuma_db.scrape_search_result(
-                    search_url=search_url,
-                    max_items=search_limit,
-                    max_scroll=search_depth,
-                    headless=True,
-                )
-                finalize(items, "rakuma")
-            elif site == "surugaya":
-                items = surugaya_db.scrape_search_result(
-                    search_url=search_url,
-                    max_items=search_limit,
-                    max_scroll=search_depth,
-                    headless=True,
-                )
-                finalize(items, "surugaya")
-            elif site == "offmall":
-                items = offmall_db.scrape_search_result(
-                    search_url=search_url,
-                    max_items=search_limit,
-                    max_scroll=search_depth,
-                    headless=True,
-                )
-                finalize(items, "offmall")
-            elif site == "yahuoku":
-                items = yahuoku_db.scrape_search_result(
-                    search_url=search_url,
-                    max_items=search_limit,
-                    max_scroll=search_depth,
-                    headless=True,
-                )
-                finalize(items, "yahuoku")
-            elif site == "snkrdunk":
-                items = snkrdunk_db.scrape_search_result(
-                    search_url=search_url,
-                    max_items=search_limit,
-                    max_scroll=search_depth,
-                    headless=True,
-                )
-                finalize(items, "snkrdunk")
-            else:
-                items = scrape_search_result(
-                    search_url=search_url,
-                    max_items=search_limit,
-                    max_scroll=search_depth,
-                    headless=True,
-                )
-                finalize(items, "mercari")
+            search_limit = get_internal_search_limit(limit)
+            search_depth = get_search_depth(target_site, search_limit)
+            scraped = _run_coalesced(
+                ("search", target_site, search_url, search_limit, search_depth),
+                search_fn,
+                search_url=search_url,
+                max_items=search_limit,
+                max_scroll=search_depth,
+                headless=True,
+            )
+            finalize(scraped, target_site)
     except Exception as exc:
         logger.exception("Scrape task failed for site=%s", site)
         error_msg = str(exc)
@@ -1,9 +1,8 @@
 import logging
 import asyncio
 import re
-import os
-import shutil
-import uuid
+
+from bs4 import BeautifulSoup
 
 # Import selector configuration loader
 try:
@@ -13,12 +12,6 @@ except ImportError:
     def get_selectors(site, page_type, field):
         return []
 
-# Import self-healing engine
-try:
-    from services.selector_healer import get_healer
-except ImportError:
-    get_healer = None
-
 from services.mercari_item_parser import parse_mercari_item_page, _append_unique_image_url
 from services.mercari_item_parser import (
     collect_mercari_photo_urls_for_item,
@@ -640,90 +633,111 @@ def _infer_mercari_shops_status(body_text: str) -> str:
     return "unknown"
 
 
-async def _extract_first_non_empty_text_async(page, selectors: list) -> str:
-    for selector in selectors:
-        try:
-            elements = await page.query_selector_all(selector)
-        except Exception:
-            continue
-
-        for element in elements:
-            try:
-                candidate = (await element.inner_text()).strip()
-            except Exception:
-                continue
-            if candidate:
-                return candidate
-
-    return ""
-
+_SHOPS_VARIANT_NOISE_PATTERNS = (
+    re.compile(r'[¥￥]\s*[\d,]+'),
+    re.compile(r'[\d,]+\s*円'),
+    re.compile(r'残り\d+点'),
+    re.compile(r'売り切れ|在庫なし'),
+)
+_SHOPS_VARIANT_SKIP_VALUES = {"いいね", "シェア", "もっと見る"}
 
 
-async def _extract_shops_variants_async(page, label_texts: list) -> list:
+def _extract_shops_variants_from_soup(soup, label_texts: list) -> list:
     """
-    メルカリShopsのバリエーションを Playwright で取得。
+    メルカリShopsのバリエーションを、描画済み HTML のスナップショットから取得。
+
+    ブラウザへの要素ごとの問い合わせを避けるため、ページ HTML を一度だけ
+    取得してプロセス内でパースする。
     """
-    found_options = []
-    
     for label_text in label_texts:
-        # ラベルテキストを含む要素を XPath で検索
-        labels = await page.query_selector_all(
-            f"xpath=//*[contains(text(), '{label_text}')]"
-        )
-        
-        for label in labels:
-            try:
-                tag_name = await label.evaluate("el => el.tagName.toLowerCase()")
-                if tag_name in ['script', 'style']:
-                    continue
-                
-                # 親要素の nextElementSibling（コンテナ）を取得
-                container = await label.evaluate_handle(
-                    "el => el.parentElement && el.parentElement.nextElementSibling"
-                )
-                
-                # Check for truthful element handle (not None and not evaluating to null)
-                is_valid = await container.evaluate("el => el !== null")
-                if not is_valid:
-                    continue
-                
-                # コンテナの直下の子要素を取得
-                children = await container.query_selector_all(":scope > *")
-                
-                if children:
-                    options = []
-                    for child in children:
-                        raw_text = await child.inner_text()
-                        raw_text = raw_text.strip()
-                        if not raw_text:
-                            continue
-                        
-                        # 1行目のみ取得
-                        val = raw_text.split('\n')[0].strip()
-                        
-                        # 価格・在庫情報を削除（正規表現クリーニング）
-                        val = re.sub(r'[¥￥]\s*[\d,]+', '', val)
-                        val = re.sub(r'[\d,]+\s*円', '', val)
-                        val = re.sub(r'残り\d+点', '', val)
-                        val = re.sub(r'売り切れ|在庫なし', '', val)
-                        val = val.strip()
-                        
-                        # 不要なボタンを除外
-                        if val and val not in ["いいね", "シェア", "もっと見る"]:
-                            if val not in options:
-                                options.append(val)
-                    
-                    if options:
-                        found_options = options
-                        break
-                        
-            except Exception:
+        # ラベルテキストを含むテキストノードの親要素を検索
+        for text_node in soup.find_all(string=lambda value: bool(value) and label_text in value):
+            label = text_node.parent
+            if label is None or label.name in ('script', 'style'):
+                continue
+
+            # 親要素の nextElementSibling（コンテナ）を取得
+            parent = label.parent
+            container = parent.find_next_sibling() if parent is not None else None
+            if container is None:
                 continue
-        
-        if found_options:
-            break
-    
-    return found_options
+
+            options = []
+            # コンテナの直下の子要素を取得
+            for child in container.find_all(recursive=False):
+                raw_text = child.get_text("\n", strip=True)
+                if not raw_text:
+                    continue
+
+                # 1行目のみ取得
+                val = raw_text.split('\n')[0].strip()
+
+                # 価格・在庫情報を削除（正規表現クリーニング）
+                for pattern in _SHOPS_VARIANT_NOISE_PATTERNS:
+                    val = pattern.sub('', val)
+                val = val.strip()
+
+                # 不要なボタンを除外
+                if val and val not in _SHOPS_VARIANT_SKIP_VALUES and val not in options:
+                    options.append(val)
+
+            if options:
+                return options
+
+    return []
+
+
+# Shops ページのテキスト系フィールドを 1 回の page.evaluate でまとめて取得する。
+# - bodyText: 商品領域 (main) の innerText。ヘッダー・フッター・ナビゲーションを
+#   含む body 全体の計算と転送を避け、main が無い/空なら body へフォールバック。
+# - title / description: セレクタ候補を順に試し、最初の非空 innerText。
+# 要素ごとの query_selector_all + inner_text の往復を 1 往復に集約する。
+_SHOPS_TEXT_SNAPSHOT_JS = """
+({titleSelectors, descriptionSelectors}) => {
+    const firstText = (selectors) => {
+        for (const selector of selectors) {
+            let nodes;
+            try {
+                nodes = document.querySelectorAll(selector);
+            } catch (e) {
+                continue;
+            }
+            for (const node of nodes) {
+                const text = (node.innerText || '').trim();
+                if (text) {
+                    return text;
+                }
+            }
+        }
+        return '';
+    };
+    const region = document.querySelector('main');
+    const regionText = region ? region.innerText : '';
+    return {
+        bodyText: regionText && regionText.trim() ? regionText : document.body.innerText,
+        title: firstText(titleSelectors),
+        description: firstText(descriptionSelectors),
+        documentTitle: document.title || '',
+    };
+}
+"""
+
+
+async def _read_shops_text_snapshot_async(page, title_selectors: list, description_selectors: list) -> dict:
+    snapshot = await page.evaluate(
+        _SHOPS_TEXT_SNAPSHOT_JS,
+        {
+            "titleSelectors": list(title_selectors),
+            "descriptionSelectors": list(description_selectors),
+        },
+    )
+    snapshot = snapshot if isinstance(snapshot, dict) else {}
+    return {
+        "body_text": str(snapshot.get("bodyText") or ""),
+        "title": str(snapshot.get("title") or ""),
+        "description": str(snapshot.get("description") or ""),
+        "document_title": str(snapshot.get("documentTitle") or ""),
+    }
 
 
 async def _scrape_shops_product_async(url: str) -> dict:
@@ -738,14 +752,22 @@ async def _scrape_shops_product_async(url: str) -> dict:
                 await page.wait_for_selector("h1, [data-testid='product-price']", timeout=5000)
             except Exception:
                 pass
-            await page.wait_for_timeout(3000)  # Shopsはロードが遅いことがあるため待機
-            body_text = await page.evaluate("document.body.innerText")
+            # Shopsは説明文・バリエーションの描画が遅いことがあるため、説明文の出現を待つ（最大3秒）
+            try:
+                await page.wait_for_selector("[data-testid='product-description']", timeout=3000)
+            except Exception:
+                pass
+            title_selectors = get_selectors('mercari', 'shops', 'title') or ["[data-testid='product-name']", "h1"]
+            desc_selectors = get_selectors('mercari', 'shops', 'description') or ["[data-testid='product-description']"]
+            text_snapshot = await _read_shops_text_snapshot_async(page, title_selectors, desc_selectors)
+            body_text = text_snapshot["body_text"]
+            # 価格・画像・バリエーションは描画済み HTML を一度だけ取得してプロセス内でパース
+            soup = BeautifulSoup(await page.content(), "html.parser")
             
             # ---- タイトル ----
-            title_selectors = get_selectors('mercari', 'shops', 'title') or ["[data-testid='product-name']", "h1"]
-            title = await _extract_first_non_empty_text_async(page, title_selectors)
+            title = text_snapshot["title"]
             if not title:
-                title = _normalize_mercari_shops_title(await page.title())
+                title = _normalize_mercari_shops_title(text_snapshot["document_title"])
             if not title:
                 title = _extract_mercari_shops_title_from_body(body_text)
 
@@ -754,12 +776,11 @@ async def _scrape_shops_product_async(url: str) -> dict:
             price_selectors = get_selectors('mercari', 'shops', 'price') or ["[data-testid='product-price']"]
             for selector in price_selectors:
                 try:
-                    elements = await page.query_selector_all(selector)
+                    elements = soup.select(selector)
                 except Exception:
                     continue
                 if elements:
-                    price_text = await elements[0].inner_text()
-                    price = _extract_price_from_text(price_text)
+                    price = _extract_price_from_text(elements[0].get_text(" ", strip=True))
                     if price is not None:
                         break
                         
@@ -768,18 +789,16 @@ async def _scrape_shops_product_async(url: str) -> dict:
                 price = _extract_price_from_text(body_text)
 
             # ---- 説明文 ----
-            desc_selectors = get_selectors('mercari', 'shops', 'description') or ["[data-testid='product-description']"]
-            description = await _extract_first_non_empty_text_async(page, desc_selectors)
+            description = text_snapshot["description"]
 
             # 説明文フォールバック: meta description
             if not description:
-                meta = await page.query_selector("meta[name='description']")
-                if meta:
-                    description = await meta.get_attribute("content") or ""
+                meta = soup.select_one("meta[name='description']")
+                if meta is not None:
+                    description = (meta.get("content") or "").strip()
 
-            # 説明文フォールバック: body text から抽出
+            # 説明文フォールバック: 取得済みの body text から抽出（再取得しない）
             if not description:
-                body_text = await page.evaluate("document.body.innerText")
                 if "商品の説明" in body_text:
                     after = body_text.split("商品の説明", 1)[1]
                     end_pos = len(after)
@@ -794,11 +813,11 @@ async def _scrape_shops_product_async(url: str) -> dict:
             image_selectors = get_selectors('mercari', 'shops', 'images') or ["img[src*='mercari'][src*='static']"]
             for selector in image_selectors:
                 try:
-                    imgs = await page.query_selector_all(selector)
+                    imgs = soup.select(selector)
                 except Exception:
                     continue
                 for img in imgs:
-                    src = await img.get_attribute("src")
+                    src = img.get("src")
                     if src and src not in image_urls:
                         image_urls.append(src)
 
@@ -806,8 +825,8 @@ async def _scrape_shops_product_async(url: str) -> dict:
             variants = []
             item_data_update = {}
             
-            colors = await _extract_shops_variants_async(page, ['カラー', 'Color'])
-            types = await _extract_shops_variants_async(page, ['種類', 'サイズ', 'Size'])
+            colors = _extract_shops_variants_from_soup(soup, ['カラー', 'Color'])
+            types = _extract_shops_variants_from_soup(soup, ['種類', 'サイズ', 'Size'])
             logger.debug("Mercari Shops variants: colors=%s types=%s", colors, types)
 
             # 色と種類を組み合わせてバリエーションを作成
@@ -1061,6 +1080,25 @@ def scrape_item_detail(url: str, driver=None):
     return item
 
 
+# 検索結果リンク数が前回値より増えたかを判定する（リンク収集と同じセレクタ優先順）。
+_MERCARI_SEARCH_LINKS_GREW_JS = """
+(previousCount) => {
+    const selectors = [
+        "a[data-testid='thumbnail-link']",
+        "a[href*='/item/']",
+        "li[data-testid='item-cell'] a",
+    ];
+    for (const selector of selectors) {
+        const count = document.querySelectorAll(selector).length;
+        if (count) {
+            return count > previousCount;
+        }
+    }
+    return false;
+}
+"""
+
+
 async def _scrape_search_async(
     search_url: str,
     max_items: int,
@@ -1075,7 +1113,6 @@ async def _scrape_search_async(
                 await page.wait_for_selector("a[data-testid='thumbnail-link'], a[href*='/item/']", timeout=10000)
             except Exception:
                 print("DEBUG: Timeout waiting for item links. The page might be blocked or empty.")
-            await page.wait_for_timeout(1000) # 追加待機
             
             item_urls = []
             seen_urls = set()
@@ -1102,9 +1139,16 @@ async def _scrape_search_async(
                     break
                 
                 # ページを下にスクロール
-                prev_count = len(item_urls)
                 await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-                await page.wait_for_timeout(2000)  # 2秒待機（新アイテム読み込み）
+                # 新アイテムが描画された時点で次へ進む（最大2秒待機）
+                try:
+                    await page.wait_for_function(
+                        _MERCARI_SEARCH_LINKS_GREW_JS,
+                        arg=len(links),
+                        timeout=2000,
+                    )
+                except Exception:
+                    pass
                 
                 # スクロール後に新しいリンクが増えていない場合は終了
                 links_after = await page.query_selector_all("a[data-testid='thumbnail-link']")
@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Index, Integer, String, Text, UniqueConstraint
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Index, Integer, String, Text, UniqueConstraint, text
 from sqlalchemy.orm import relationship
 from database import Base
 from flask_login import UserMixin
@@ -35,6 +35,23 @@ class Shop(Base):
 
 class Product(Base):
     __tablename__ = "products"
+    __table_args__ = (
+        # Archive list: WHERE user_id = ? AND archived = ? ORDER BY updated_at DESC
+        Index("ix_products_user_archived_updated", "user_id", "archived", "updated_at"),
+        # Export/list filters: WHERE user_id = ? AND shop_id = ?
+        Index("ix_products_user_shop", "user_id", "shop_id"),
+        # Import duplicate check: WHERE user_id = ? AND source_url IN (...)
+        Index("ix_products_user_source_url", "user_id", "source_url"),
+        # Trash list: WHERE user_id = ? AND deleted_at IS NOT NULL ORDER BY deleted_at DESC
+        Index("ix_products_user_deleted_at", "user_id", "deleted_at"),
+        # Trash auto-purge: WHERE deleted_at < ? (only trashed rows are indexed)
+        Index(
+            "ix_products_trashed_deleted_at",
+            "deleted_at",
+            postgresql_where=text("deleted_at IS NOT NULL"),
+            sqlite_where=text("deleted_at IS NOT NULL"),
+        ),
+    )
 
     id = Column(Integer, primary_key=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False) # 所有者
@@ -131,6 +148,10 @@ class Variant(Base):
 
 class ProductSnapshot(Base):
     __tablename__ = "product_snapshots"
+    __table_args__ = (
+        # Latest-snapshot ranking: PARTITION BY product_id ORDER BY scraped_at DESC
+        Index("ix_snapshots_product_scraped_at", "product_id", "scraped_at"),
+    )
 
     id = Column(Integer, primary_key=True)
     product_id = Column(Integer, ForeignKey("products.id"), nullable=False)
@@ -188,6 +209,11 @@ class ExclusionKeyword(Base):
     Products containing these keywords in their title will not be saved.
     """
     __tablename__ = "exclusion_keywords"
+    __table_args__ = (
+        UniqueConstraint("user_id", "keyword", name="uq_exclusion_keywords_user_keyword"),
+        # Settings list: WHERE user_id = ? ORDER BY created_at DESC
+        Index("ix_exclusion_keywords_user_created", "user_id", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -2,13 +2,18 @@
 Offmall (Hard Off) scraping module.
 Uses Scrapling HTTP fetches for product detail pages and search results.
 """
+import copy
 import json
 import logging
 import re
+import threading
+import time
+from collections import OrderedDict
 from urllib.parse import urljoin
 
 from services.extraction_policy import attach_extraction_trace, pick_first
 from services.scrape_alerts import report_detail_result
+from utils.env_helpers import env_float, env_int
 
 logger = logging.getLogger("offmall")
 
@@ -25,6 +30,17 @@ SELECTORS = {
     ],
 }
 
+_PRICE_DIGITS_RE = re.compile(r"([0-9][0-9,]{1,})")
+_TAX_INCLUDED_PRICE_RE = re.compile(r"([0-9][0-9,]{1,})\s*(?:円)?\s*\(税込\)")
+_WHITESPACE_RE = re.compile(r"\s+")
+_SCHEMA_ORG_PREFIX_RE = re.compile(r"https?://schema\.org/")
+
+# Successful detail results keyed by URL. Search retries and repeated
+# rescans of the same listing within the TTL reuse the parsed result
+# instead of re-fetching and re-parsing the page.
+_DETAIL_CACHE: "OrderedDict[str, tuple[float, dict]]" = OrderedDict()
+_DETAIL_CACHE_LOCK = threading.Lock()
+
 _DESCRIPTION_LABEL_MARKERS = ("特徴", "備考", "商品説明")
 _DESCRIPTION_SKIP_LABELS = {
     "保証期間",
@@ -96,7 +112,7 @@ def _get_page_text(page) -> str:
 def _extract_price_digits(text: str):
     if not text:
         return None
-    match = re.search(r"([0-9][0-9,]{1,})", text.replace("，", ","))
+    match = _PRICE_DIGITS_RE.search(text.replace("，", ","))
     if not match:
         return None
     try:
@@ -132,7 +148,7 @@ def _extract_visible_price(page, page_text: str = ""):
                 return price
 
     if page_text:
-        match = re.search(r"([0-9][0-9,]{1,})\s*(?:円)?\s*\(税込\)", page_text)
+        match = _TAX_INCLUDED_PRICE_RE.search(page_text)
         if match:
             try:
                 return int(match.group(1).replace(",", ""))
@@ -192,7 +208,7 @@ def _extract_detail_description(page) -> str:
     deduped_parts = []
     seen = set()
     for part in priority_parts or attribute_parts:
-        normalized = re.sub(r"\s+", " ", part).strip()
+        normalized = _WHITESPACE_RE.sub(" ", part).strip()
         if not normalized or normalized in seen:
             continue
         seen.add(normalized)
@@ -284,7 +300,7 @@ def scrape_item_detail_light(url: str) -> dict:
 
         condition = json_ld.get("itemCondition", "")
         if condition:
-            result["condition"] = re.sub(r"https?://schema\.org/", "", condition)
+            result["condition"] = _SCHEMA_ORG_PREFIX_RE.sub("", condition)
             field_sources["condition"] = "json_ld"
         else:
             cond_els = page.css(".item-condition, .condition, [class*='rank'], [class*='condition']")
@@ -309,20 +325,65 @@ def scrape_item_detail_light(url: str) -> dict:
         return {}
 
 
-def scrape_item_detail(url_or_driver, maybe_url=None, **_kwargs) -> dict:
+def _detail_cache_ttl() -> float:
+    return max(0.0, env_float("OFFMALL_DETAIL_CACHE_TTL", 300.0))
+
+
+def _get_cached_detail(url: str):
+    ttl = _detail_cache_ttl()
+    if ttl <= 0:
+        return None
+    with _DETAIL_CACHE_LOCK:
+        entry = _DETAIL_CACHE.get(url)
+        if entry is None:
+            return None
+        cached_at, result = entry
+        if time.monotonic() - cached_at > ttl:
+            del _DETAIL_CACHE[url]
+            return None
+        _DETAIL_CACHE.move_to_end(url)
+        # Callers mutate results (e.g. _scrape_meta), so never hand out the cached dict.
+        return copy.deepcopy(result)
+
+
+def _store_cached_detail(url: str, result: dict) -> None:
+    if _detail_cache_ttl() <= 0 or not result.get("title"):
+        return
+    max_entries = max(1, env_int("OFFMALL_DETAIL_CACHE_SIZE", 512))
+    with _DETAIL_CACHE_LOCK:
+        _DETAIL_CACHE[url] = (time.monotonic(), copy.deepcopy(result))
+        _DETAIL_CACHE.move_to_end(url)
+        while len(_DETAIL_CACHE) > max_entries:
+            _DETAIL_CACHE.popitem(last=False)
+
+
+def clear_detail_cache() -> None:
+    """Drop every cached Offmall detail result (explicit refresh)."""
+    with _DETAIL_CACHE_LOCK:
+        _DETAIL_CACHE.clear()
+
+
+def scrape_item_detail(url_or_driver, maybe_url=None, refresh: bool = False, **_kwargs) -> dict:
     """
     Offmall detail scrape.
     The legacy `(driver, url)` signature is accepted for backward compatibility.
+    Pass ``refresh=True`` to bypass the short-lived per-URL result cache.
     """
     url = _resolve_detail_url(url_or_driver, maybe_url)
+    if not refresh:
+        cached = _get_cached_detail(url)
+        if cached is not None:
+            return cached
+
     result = scrape_item_detail_light(url) or _empty_result(url)
     report_detail_result("offmall", url, result, result.get("_scrape_meta"), page_type="detail")
+    _store_cached_detail(url, result)
     return result
 
 
 def scrape_single_item(url: str, headless: bool = True) -> list:
     """Scrape a single Offmall product and return `list[dict]`."""
-    result = scrape_item_detail(url)
+    result = scrape_item_detail(url, refresh=True)
     return [result] if result.get("title") else []
 
 
@@ -370,7 +431,11 @@ def scrape_search_result(
     candidate_target = max(max_items, max_items * 2)
 
     try:
-        from services.scraping_client import fetch_static
+        from services.scraping_client import (
+            fetch_static,
+            get_async_fetch_settings,
+            scrape_details_concurrently,
+        )
 
         current_url = search_url
         seen_pages = set()
@@ -388,10 +453,20 @@ def scrape_search_result(
                 break
             current_url = _find_next_page_url(page, current_url)
 
-        for item_url in candidate_urls:
+        settings = get_async_fetch_settings("offmall")
+        detail_results = scrape_details_concurrently(
+            scrape_item_detail,
+            candidate_urls,
+            settings.concurrency,
+            thread_name_prefix="offmall-detail",
+        )
+
+        for item_url, result in zip(candidate_urls, detail_results):
             if len(results) >= max_items:
                 break
-            result = scrape_item_detail(item_url)
+            if isinstance(result, Exception):
+                logger.debug("Offmall detail scrape failed for %s: %s", item_url, result)
+                continue
             if result.get("title"):
                 results.append(result)
 
@@ -13,6 +13,7 @@ import asyncio
 import logging
 from selector_config import get_selectors, get_valid_domains
 from scrape_metrics import get_metrics, log_scrape_result, check_scrape_health
+from services.browser_pool import run_browser_page_task
 from services.rakuma_item_parser import parse_rakuma_item_page
 from services.scraping_client import (
     fetch_static,
@@ -105,70 +106,81 @@ def scrape_single_item(url: str, headless: bool = True):
         return []
 
 
-async def _scrape_search_async(search_url: str, max_items: int, max_scroll: int):
-    """Playwright async API を使用してラクマ検索結果をスクレイピングする。"""
-    from playwright.async_api import async_playwright
-
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(
-            headless=True,
-            args=[
-                "--no-sandbox",
-                "--disable-dev-shm-usage",
-                "--disable-gpu",
-            ]
-        )
-        context = await browser.new_context(
-            user_agent=(
-                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/120.0.0.0 Safari/537.36"
-            ),
-        )
-        pw_page = await context.new_page()
-
-        try:
-            await pw_page.goto(search_url, wait_until="networkidle", timeout=30000)
-        except Exception as e:
-            logging.warning(f"Navigation timeout/error for {search_url}: {e}")
-
-        print(f"DEBUG: Page Title = {await pw_page.title()}")
-
-        # 商品リンクを収集
-        hrefs = []
-        seen_hrefs = set()
-        scroll_attempts = 0
-        link_selectors = get_selectors('rakuma', 'search', 'item_links') or [
-            "a.link_search_image",
-            "a.link_search_title"
-        ]
-
-        while len(hrefs) < max_items * 2 and scroll_attempts < max_scroll * 2:
-            await pw_page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-            await pw_page.wait_for_timeout(2000)
-
-            new_links = []
-            for selector in link_selectors:
-                new_links = await pw_page.query_selector_all(selector)
-                if new_links:
-                    break
-
-            if not new_links:
-                break
+async def _collect_search_links(pw_page, search_url: str, max_items: int, max_scroll: int) -> list:
+    """検索ページをスクロールしながら商品リンクを収集する。"""
+    try:
+        await pw_page.goto(search_url, wait_until="networkidle", timeout=30000)
+    except Exception as e:
+        logging.warning(f"Navigation timeout/error for {search_url}: {e}")
 
-            for nl in new_links:
-                h = await nl.get_attribute("href")
-                if h:
-                    if h not in seen_hrefs:
-                        seen_hrefs.add(h)
-                        hrefs.append(h)
+    print(f"DEBUG: Page Title = {await pw_page.title()}")
+
+    # 商品リンクを収集
+    hrefs = []
+    seen_hrefs = set()
+    scroll_attempts = 0
+    link_selectors = get_selectors('rakuma', 'search', 'item_links') or [
+        "a.link_search_image",
+        "a.link_search_title"
+    ]
 
-            if len(hrefs) >= max_items * 1.5:
+    while len(hrefs) < max_items * 2 and scroll_attempts < max_scroll * 2:
+        await pw_page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+        await pw_page.wait_for_timeout(2000)
+
+        new_links = []
+        for selector in link_selectors:
+            new_links = await pw_page.query_selector_all(selector)
+            if new_links:
                 break
 
-            scroll_attempts += 1
+        if not new_links:
+            break
+
+        for nl in new_links:
+            h = await nl.get_attribute("href")
+            if h:
+                if h not in seen_hrefs:
+                    seen_hrefs.add(h)
+                    hrefs.append(h)
 
-        await browser.close()
+        if len(hrefs) >= max_items * 1.5:
+            break
+
+        scroll_attempts += 1
+
+    return hrefs
+
+
+async def _scrape_search_async(search_url: str, max_items: int, max_scroll: int):
+    """
+    Playwright async API を使用してラクマ検索結果をスクレイピングする。
+
+    検索ページは browser_pool の page task として実行するため、shared runtime が
+    有効な場合はブラウザを使い回し、BROWSER_POOL_MAX_TASKS_BEFORE_RESTART 等の
+    recycle 設定もそのまま適用される。
+    """
+
+    async def _task(pw_page, _context):
+        return await _collect_search_links(pw_page, search_url, max_items, max_scroll)
+
+    hrefs = await run_browser_page_task(
+        "rakuma",
+        _task,
+        headless=True,
+        launch_args=[
+            "--no-sandbox",
+            "--disable-dev-shm-usage",
+            "--disable-gpu",
+        ],
+        context_options={
+            "user_agent": (
+                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+                "AppleWebKit/537.36 (KHTML, like Gecko) "
+                "Chrome/120.0.0.0 Safari/537.36"
+            ),
+        },
+    )
 
     print(f"DEBUG: Found {len(hrefs)} unique links on search page.")
 
@@ -3,11 +3,22 @@ Archive routes - SOLD Stacking / Product archiving.
 """
 from flask import Blueprint, render_template, request, redirect, url_for, flash, session
 from flask_login import login_required, current_user
+from sqlalchemy.orm import load_only
 from database import SessionLocal
 from models import Product, Shop
 
 archive_bp = Blueprint('archive', __name__)
 
+ARCHIVE_PAGE_SIZE = 50
+
+
+def _parse_product_ids(raw_ids):
+    """Return the submitted product ids as a de-duplicated set, or None if any is malformed."""
+    try:
+        return {int(raw_id) for raw_id in raw_ids}
+    except (TypeError, ValueError):
+        return None
+
 
 @archive_bp.route('/archive')
 @login_required
@@ -15,17 +26,45 @@ def archive_list():
     """Display archived products."""
     session_db = SessionLocal()
     try:
-        products = session_db.query(Product).filter(
+        raw_page = request.args.get("page", "1")
+        page = int(raw_page) if str(raw_page).isdigit() else 1
+        page = max(page, 1)
+
+        # Only the columns archive.html renders; skips descriptions, image JSON, etc.
+        query = session_db.query(Product).options(
+            load_only(
+                Product.id,
+                Product.custom_title,
+                Product.last_title,
+                Product.last_price,
+                Product.site,
+                Product.updated_at,
+            )
+        ).filter(
             Product.user_id == current_user.id,
             Product.archived == True
-        ).order_by(Product.updated_at.desc()).all()
+        ).order_by(Product.updated_at.desc(), Product.id.desc())
+
+        total_items = query.order_by(None).count()
+        total_pages = max(1, (total_items + ARCHIVE_PAGE_SIZE - 1) // ARCHIVE_PAGE_SIZE)
+        if page > total_pages:
+            page = total_pages
+        offset = (page - 1) * ARCHIVE_PAGE_SIZE
+        products = query.offset(offset).limit(ARCHIVE_PAGE_SIZE).all()
         
-        all_shops = session_db.query(Shop).filter_by(user_id=current_user.id).all()
+        all_shops = session_db.query(Shop).options(
+            load_only(Shop.id, Shop.name)
+        ).filter_by(user_id=current_user.id).all()
         current_shop_id = session.get('current_shop_id')
         
         return render_template(
             'archive.html',
             products=products,
+            page=page,
+            total_pages=total_pages,
+            total_items=total_items,
+            has_prev=page > 1,
+            has_next=page < total_pages,
             all_shops=all_shops,
             current_shop_id=current_shop_id
         )
@@ -40,22 +79,23 @@ def archive_list():
 @login_required
 def archive_products():
     """Archive selected products."""
+    raw_ids = request.form.getlist('ids')
+    if not raw_ids:
+        return redirect(url_for('main.index'))
+    product_ids = _parse_product_ids(raw_ids)
+    if product_ids is None:
+        flash('不正な商品IDが含まれています', 'error')
+        return redirect(url_for('main.index'))
+
     session_db = SessionLocal()
     try:
-        product_ids = request.form.getlist('ids')
-        if not product_ids:
-            return redirect(url_for('main.index'))
-        
-        products = session_db.query(Product).filter(
-            Product.id.in_([int(pid) for pid in product_ids]),
+        updated_count = session_db.query(Product).filter(
+            Product.id.in_(product_ids),
             Product.user_id == current_user.id
-        ).all()
-        
-        for product in products:
-            product.archived = True
+        ).update({Product.archived: True}, synchronize_session=False)
         
         session_db.commit()
-        flash(f'{len(products)}件をアーカイブしました', 'success')
+        flash(f'{updated_count}件をアーカイブしました', 'success')
         return redirect(url_for('main.index'))
     except Exception as e:
         session_db.rollback()
@@ -69,22 +109,23 @@ def archive_products():
 @login_required
 def restore_products():
     """Restore archived products."""
+    raw_ids = request.form.getlist('ids')
+    if not raw_ids:
+        return redirect(url_for('archive.archive_list'))
+    product_ids = _parse_product_ids(raw_ids)
+    if product_ids is None:
+        flash('不正な商品IDが含まれています', 'error')
+        return redirect(url_for('archive.archive_list'))
+
     session_db = SessionLocal()
     try:
-        product_ids = request.form.getlist('ids')
-        if not product_ids:
-            return redirect(url_for('archive.archive_list'))
-        
-        products = session_db.query(Product).filter(
-            Product.id.in_([int(pid) for pid in product_ids]),
+        updated_count = session_db.query(Product).filter(
+            Product.id.in_(product_ids),
             Product.user_id == current_user.id
-        ).all()
-        
-        for product in products:
-            product.archived = False
+        ).update({Product.archived: False}, synchronize_session=False)
         
         session_db.commit()
-        flash(f'{len(products)}件を復元しました', 'success')
+        flash(f'{updated_count}件を復元しました', 'success')
         return redirect(url_for('archive.archive_list'))
     except Exception as e:
         session_db.rollback()
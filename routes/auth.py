@@ -2,9 +2,11 @@
 Authentication routes: login, register, logout, account.
 """
 import logging
+from functools import lru_cache
 
 from flask import Blueprint, current_app, flash, redirect, render_template, request, session, url_for
 from flask_login import current_user, login_required, login_user, logout_user
+from werkzeug.security import check_password_hash, generate_password_hash
 
 from database import SessionLocal
 from models import Shop, User
@@ -27,6 +29,19 @@ def _build_account_context(session_db):
     }
 
 
+@lru_cache(maxsize=1)
+def _dummy_password_hash():
+    """Hash compared against when the username does not exist, so misses cost the same as wrong passwords."""
+    return generate_password_hash("esp-login-timing-placeholder")
+
+
+def _verify_login(user, password):
+    if user is None:
+        check_password_hash(_dummy_password_hash(), password)
+        return False
+    return user.check_password(password)
+
+
 def _login_identifiers(username):
     client_ip = get_client_ip(request)
     normalized_username = (username or "").strip().lower() or "unknown"
@@ -56,7 +71,7 @@ def login():
         session_db = SessionLocal()
         try:
             user = session_db.query(User).filter_by(username=username).first()
-            if user and user.check_password(password):
+            if _verify_login(user, password):
                 login_user(user)
                 reset_attempts("login-ip", client_ip)
                 reset_attempts("login-user", normalized_username)
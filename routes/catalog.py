@@ -9,13 +9,13 @@ from urllib.parse import urlparse
 
 from flask import Blueprint, render_template, abort, jsonify, request, session
 from flask_login import login_required, current_user
-from sqlalchemy import func, select
 from sqlalchemy.orm import joinedload, subqueryload
 
 from database import SessionLocal, _session_factory
-from models import Shop, PriceList, PriceListItem, Product, ProductSnapshot, CatalogPageView
+from models import Shop, PriceList, PriceListItem, Product, CatalogPageView
 from services.image_service import split_image_url_string
 from services.rich_text import build_rich_text_excerpt, normalize_rich_text, rich_text_to_plain_text
+from services.snapshot_service import attach_latest_snapshots
 from time_utils import utc_now
 
 catalog_bp = Blueprint('catalog', __name__)
@@ -32,37 +32,6 @@ def _latest_snapshot(product):
     return sorted(product.snapshots, key=lambda s: s.scraped_at, reverse=True)[0]
 
 
-def _attach_latest_snapshots(session_db, products):
-    product_ids = [product.id for product in products if product is not None]
-    if not product_ids:
-        return
-
-    ranked_snapshots = (
-        select(
-            ProductSnapshot.id.label("snapshot_id"),
-            ProductSnapshot.product_id.label("product_id"),
-            func.row_number()
-            .over(
-                partition_by=ProductSnapshot.product_id,
-                order_by=(ProductSnapshot.scraped_at.desc(), ProductSnapshot.id.desc()),
-            )
-            .label("snapshot_rank"),
-        )
-        .where(ProductSnapshot.product_id.in_(product_ids))
-        .subquery()
-    )
-    snapshots = (
-        session_db.query(ProductSnapshot)
-        .join(ranked_snapshots, ProductSnapshot.id == ranked_snapshots.c.snapshot_id)
-        .filter(ranked_snapshots.c.snapshot_rank == 1)
-        .all()
-    )
-    snapshots_by_product = {snapshot.product_id: snapshot for snapshot in snapshots}
-    for product in products:
-        if product is not None:
-            product.latest_snapshot = snapshots_by_product.get(product.id)
-
-
 def _pricelist_by_token(session_db, token):
     return (
         session_db.query(PriceList)
@@ -226,7 +195,7 @@ def catalog_view(token):
             .order_by(PriceListItem.sort_order)
             .all()
         )
-        _attach_latest_snapshots(session_db, [item.product for item in items])
+        attach_latest_snapshots(session_db, [item.product for item in items])
 
         # Process items for display
         catalog_items = []
@@ -279,7 +248,7 @@ def catalog_product_detail(token, product_id):
         if not item:
             return jsonify({"error": "Not found"}), 404
 
-        _attach_latest_snapshots(session_db, [item.product])
+        attach_latest_snapshots(session_db, [item.product])
         catalog_item = _build_catalog_item(item)
         if catalog_item is None:
             return jsonify({"error": "Not found"}), 404
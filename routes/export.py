@@ -2,22 +2,95 @@
 CSV Export routes: Shopify, eBay exports.
 """
 import csv
-import io
-from flask import Blueprint, request, make_response, session
+import os
+import zipfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+from fractions import Fraction
+
+from flask import Blueprint, Response, request, session, stream_with_context
 from flask_login import login_required, current_user
+from sqlalchemy.orm import load_only, selectinload
 
 from database import SessionLocal
-from models import Product, Variant, ProductSnapshot
-from services.image_service import cache_mercari_image, download_external_image, split_image_url_string
+from models import Product, ProductSnapshot, Variant
+from services.image_service import (
+    IMAGE_STORAGE_PATH,
+    cache_mercari_image,
+    download_external_image,
+    find_cached_image,
+    split_image_url_string,
+)
 from services.rich_text import normalize_rich_text
+from services.snapshot_service import attach_latest_snapshots
+from utils.env_helpers import env_int
 
 export_bp = Blueprint('export', __name__)
 
+SHOPIFY_FIELDNAMES = [
+    "Handle", "Title", "Body (HTML)", "Vendor", "Type", "Tags", "Published",
+    "Option1 Name", "Option1 Value",
+    "Option2 Name", "Option2 Value",
+    "Option3 Name", "Option3 Value",
+    "Variant SKU", "Variant Grams", "Variant Inventory Tracker",
+    "Variant Inventory Qty", "Variant Inventory Policy", "Variant Fulfillment Service",
+    "Variant Price", "Variant Compare At Price", "Variant Requires Shipping", "Variant Taxable",
+    "Variant Barcode", "Image Src", "Image Position", "Image Alt Text",
+    "Gift Card", "SEO Title", "SEO Description",
+    "Google Shopping / Google Product Category", "Google Shopping / Gender", "Google Shopping / Age Group",
+    "Google Shopping / MPN", "Google Shopping / AdWords Grouping", "Google Shopping / AdWords Labels",
+    "Google Shopping / Condition", "Google Shopping / Custom Product", "Google Shopping / Custom Label 0",
+    "Google Shopping / Custom Label 1", "Google Shopping / Custom Label 2", "Google Shopping / Custom Label 3",
+    "Google Shopping / Custom Label 4", "Variant Image", "Variant Weight Unit", "Variant Tax Code",
+    "Cost per item", "Status"
+]
+_SHOPIFY_COLUMN = {name: index for index, name in enumerate(SHOPIFY_FIELDNAMES)}
+_NO_PRODUCTS_MESSAGE = "対象の商品がありません。"
+# Variant columns read by the Shopify stock/price update exports.
+_UPDATE_VARIANT_COLUMNS = (
+    Variant.position,
+    Variant.option1_value,
+    Variant.option2_value,
+    Variant.option3_value,
+)
+
+
+def _markup_ratio(markup):
+    """
+    Return ``markup`` as an integer ``(numerator, denominator)`` pair so yen
+    prices can be scaled with ``price * num // den`` instead of float
+    multiplication (``int(100 * 1.15)`` is 114, not 115).
+    """
+    return Fraction(str(markup)).limit_denominator(10000).as_integer_ratio()
+
 
-def _parse_ids_and_params(session_db):
+def _usd_start_price(price_yen, exchange_rate, markup):
+    """Convert a yen price to an eBay USD StartPrice string rounded half-up to cents."""
+    try:
+        usd = Decimal(price_yen) / Decimal(str(exchange_rate)) * Decimal(str(markup))
+    except (InvalidOperation, ZeroDivisionError):
+        return ""
+    return str(usd.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP))
+
+
+def _parse_ids_and_params(
+    session_db,
+    columns=None,
+    variant_columns=None,
+    load_variants=True,
+    load_snapshots=True,
+    snapshot_columns=None,
+):
     """
     Export共通のパラメータ解析とProducts取得
     Always filter by current_user.id
+
+    ``columns`` / ``variant_columns`` / ``snapshot_columns`` restrict the
+    loaded columns to what an export actually reads. Rows are consumed after
+    the session is closed, so every attribute the export touches must be
+    listed.
     """
     product_ids = request.args.getlist("id", type=int)
     markup = request.args.get("markup", type=float) or 1.0
@@ -35,134 +108,189 @@ def _parse_ids_and_params(session_db):
     if product_ids:
         query = query.filter(Product.id.in_(product_ids))
         
+    if columns:
+        query = query.options(load_only(*columns))
+    if load_variants:
+        variant_loader = selectinload(Product.variants)
+        if variant_columns:
+            variant_loader = variant_loader.load_only(*variant_columns)
+        query = query.options(variant_loader)
+
     products = query.all()
+    if load_snapshots:
+        attach_latest_snapshots(session_db, products, columns=snapshot_columns)
     return products, markup, qty
 
 
+# Rows formatted per writerows() call, i.e. per streamed chunk.
+_CSV_STREAM_BATCH_ROWS = 200
+
+
+class _CsvChunkBuffer:
+    """File-like sink that collects formatted CSV lines until the stream drains them."""
+
+    def __init__(self):
+        self._parts = []
+
+    def write(self, value):
+        self._parts.append(value)
+        return len(value)
+
+    def drain(self):
+        data = "".join(self._parts)
+        self._parts.clear()
+        return data
+
+
+def _iter_csv_chunks(header, rows, prefix=""):
+    """
+    Format ``header`` and ``rows`` into CSV text chunks.
+
+    Rows are handed to ``writer.writerows`` in batches so the per-row loop
+    runs inside the csv module, while the response still streams.
+    """
+    buffer = _CsvChunkBuffer()
+    buffer.write(prefix)
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+    rows = iter(rows)
+    while batch := list(islice(rows, _CSV_STREAM_BATCH_ROWS)):
+        writer.writerows(batch)
+        yield buffer.drain()
+    chunk = buffer.drain()
+    if chunk:
+        yield chunk
+
+
+def _csv_response(header, rows, content_disposition, content_type="text/csv", prefix=""):
+    """Stream CSV rows to the client as they are produced instead of buffering the whole file."""
+    response = Response(stream_with_context(_iter_csv_chunks(header, rows, prefix)), content_type=content_type)
+    response.headers["Content-Disposition"] = content_disposition
+    return response
+
+
+def _ordered_variants(product):
+    return sorted(product.variants, key=lambda variant: (variant.position or 0, variant.id))
+
+
 @export_bp.route("/export/shopify")
 @login_required
 def export_shopify():
     session_db = SessionLocal()
     try:
-        products, markup, default_qty = _parse_ids_and_params(session_db)
+        products, markup, default_qty = _parse_ids_and_params(
+            session_db,
+            snapshot_columns=(ProductSnapshot.description, ProductSnapshot.image_urls),
+        )
         if not products:
-             return "対象の商品がありません。", 400
-        
-        output = io.StringIO()
-        fieldnames = [
-            "Handle", "Title", "Body (HTML)", "Vendor", "Type", "Tags", "Published", 
-            "Option1 Name", "Option1 Value",
-            "Option2 Name", "Option2 Value",
-            "Option3 Name", "Option3 Value",
-            "Variant SKU", "Variant Grams", "Variant Inventory Tracker",
-            "Variant Inventory Qty", "Variant Inventory Policy", "Variant Fulfillment Service",
-            "Variant Price", "Variant Compare At Price", "Variant Requires Shipping", "Variant Taxable",
-            "Variant Barcode", "Image Src", "Image Position", "Image Alt Text",
-            "Gift Card", "SEO Title", "SEO Description",
-            "Google Shopping / Google Product Category", "Google Shopping / Gender", "Google Shopping / Age Group",
-            "Google Shopping / MPN", "Google Shopping / AdWords Grouping", "Google Shopping / AdWords Labels",
-            "Google Shopping / Condition", "Google Shopping / Custom Product", "Google Shopping / Custom Label 0",
-            "Google Shopping / Custom Label 1", "Google Shopping / Custom Label 2", "Google Shopping / Custom Label 3",
-            "Google Shopping / Custom Label 4", "Variant Image", "Variant Weight Unit", "Variant Tax Code",
-            "Cost per item", "Status"
-        ]
-        writer = csv.DictWriter(output, fieldnames=fieldnames)
-        writer.writeheader()
+             return _NO_PRODUCTS_MESSAGE, 400
 
-        for product in products:
-            snapshot = (
-                session_db.query(ProductSnapshot)
-                .filter_by(product_id=product.id)
-                .order_by(ProductSnapshot.scraped_at.desc())
-                .first()
-            )
+        base_url = request.url_root.rstrip('/')
+        markup_num, markup_den = _markup_ratio(markup)
+
+        col = _SHOPIFY_COLUMN
+        width = len(SHOPIFY_FIELDNAMES)
+
+        def build_product_rows(product):
+            snapshot = product.latest_snapshot
 
             title = product.custom_title or product.last_title or ""
             description = product.custom_description or (snapshot.description if snapshot else "")
             vendor = product.custom_vendor or product.site.capitalize()
             handle = product.custom_handle or f"{product.site or 'product'}-{product.id}"
-            
+
             image_urls = []
             if snapshot and snapshot.image_urls:
-                base_url = request.url_root.rstrip('/')
                 original_urls = split_image_url_string(snapshot.image_urls)
                 for i, mercari_url in enumerate(original_urls):
                     local_filename = cache_mercari_image(mercari_url, product.id, i)
                     if local_filename:
                         full_url = f"{base_url}/media/{local_filename}"
                         image_urls.append(full_url)
-            
-            variants = session_db.query(Variant).filter_by(product_id=product.id).order_by(Variant.position).all()
+
+            variants = _ordered_variants(product)
             if not variants:
-                continue
+                return []
+
+            product_rows = []
 
             for i, variant in enumerate(variants):
-                row = {f: "" for f in fieldnames} # Initialize with empty strings
-                row["Handle"] = handle
-                
+                row = [""] * width # Initialize with empty strings
+                row[col["Handle"]] = handle
+
                 # Common fields (Status needed for all rows per feedback, though standard is 1st row. We will put in all if safe, or follow standard strictly. Feedback says "most rows empty" is bad. Let's put Status in all rows to be safe as per feedback.)
-                row["Status"] = product.status
+                row[col["Status"]] = product.status
 
                 if i == 0:
-                    row["Title"] = title
-                    row["Body (HTML)"] = normalize_rich_text(description)
-                    row["Vendor"] = vendor
-                    row["Type"] = "Mercari Item" # Default Type
-                    row["Published"] = "true" if product.status == 'active' else 'false'
-                    row["Tags"] = product.tags or ""
-                    row["SEO Title"] = product.seo_title or ""
-                    row["SEO Description"] = product.seo_description or ""
+                    row[col["Title"]] = title
+                    row[col["Body (HTML)"]] = normalize_rich_text(description)
+                    row[col["Vendor"]] = vendor
+                    row[col["Type"]] = "Mercari Item" # Default Type
+                    row[col["Published"]] = "true" if product.status == 'active' else 'false'
+                    row[col["Tags"]] = product.tags or ""
+                    row[col["SEO Title"]] = product.seo_title or ""
+                    row[col["SEO Description"]] = product.seo_description or ""
                     if image_urls:
-                        row["Image Src"] = image_urls[0]
-                        row["Image Position"] = 1
-                        row["Image Alt Text"] = title
-                
-                row["Option1 Name"] = product.option1_name or "Title"
-                row["Option2 Name"] = product.option2_name or ""
-                row["Option3 Name"] = product.option3_name or ""
-                
-                row["Option1 Value"] = variant.option1_value or ""
-                row["Option2 Value"] = variant.option2_value or ""
-                row["Option3 Value"] = variant.option3_value or ""
-                row["Variant SKU"] = variant.sku or ""
-                row["Variant Grams"] = variant.grams or ""
-                row["Variant Inventory Tracker"] = "shopify"
-                
+                        row[col["Image Src"]] = image_urls[0]
+                        row[col["Image Position"]] = 1
+                        row[col["Image Alt Text"]] = title
+
+                row[col["Option1 Name"]] = product.option1_name or "Title"
+                row[col["Option2 Name"]] = product.option2_name or ""
+                row[col["Option3 Name"]] = product.option3_name or ""
+
+                row[col["Option1 Value"]] = variant.option1_value or ""
+                row[col["Option2 Value"]] = variant.option2_value or ""
+                row[col["Option3 Value"]] = variant.option3_value or ""
+                row[col["Variant SKU"]] = variant.sku or ""
+                row[col["Variant Grams"]] = variant.grams or ""
+                row[col["Variant Inventory Tracker"]] = "shopify"
+
                 if product.last_status in {'sold', 'deleted'}:
                     final_qty = 0
                 else:
                     final_qty = variant.inventory_qty if variant.inventory_qty is not None else default_qty
-                    
-                row["Variant Inventory Qty"] = final_qty
-                row["Variant Inventory Policy"] = "deny"
-                row["Variant Fulfillment Service"] = "manual"
-                
+
+                row[col["Variant Inventory Qty"]] = final_qty
+                row[col["Variant Inventory Policy"]] = "deny"
+                row[col["Variant Fulfillment Service"]] = "manual"
+
                 base_price = variant.price
-                final_price = int(base_price * markup) if base_price is not None else 0
-                row["Variant Price"] = final_price
-                row["Variant Compare At Price"] = "" # Empty for now
-                
-                row["Variant Requires Shipping"] = "true"
-                row["Variant Taxable"] = "true" if variant.taxable else "false"
+                final_price = base_price * markup_num // markup_den if base_price is not None else 0
+                row[col["Variant Price"]] = final_price
+                row[col["Variant Compare At Price"]] = "" # Empty for now
+
+                row[col["Variant Requires Shipping"]] = "true"
+                row[col["Variant Taxable"]] = "true" if variant.taxable else "false"
                 # Removed Country of Origin and HS Code per feedback
-                row["Variant Barcode"] = "" # Empty
-                
-                writer.writerow(row)
+                row[col["Variant Barcode"]] = "" # Empty
+
+                product_rows.append(row)
 
             if len(image_urls) > 1:
                 for i, img_url in enumerate(image_urls[1:], start=2):
-                    img_row = {f: "" for f in fieldnames}
-                    img_row["Handle"] = handle
-                    img_row["Image Src"] = img_url
-                    img_row["Image Position"] = i
-                    img_row["Image Alt Text"] = title
-                    writer.writerow(img_row)
-
-        output.seek(0)
-        response = make_response(output.getvalue())
-        response.headers["Content-Disposition"] = "attachment; filename=shopify_products.csv"
-        response.headers["Content-type"] = "text/csv"
-        return response
+                    img_row = [""] * width
+                    img_row[col["Handle"]] = handle
+                    img_row[col["Image Src"]] = img_url
+                    img_row[col["Image Position"]] = i
+                    img_row[col["Image Alt Text"]] = title
+                    product_rows.append(img_row)
+
+            return product_rows
+
+        workers = max(1, env_int("EXPORT_SHOPIFY_ROW_WORKERS", 4))
+
+        def rows():
+            if workers == 1 or len(products) < 4:
+                product_rows = map(build_product_rows, products)
+            else:
+                # Image caching is network bound, so products are prepared
+                # concurrently and written in their original order.
+                product_rows = _map_in_order(build_product_rows, products, workers)
+            for rows_for_product in product_rows:
+                yield from rows_for_product
+
+        return _csv_response(SHOPIFY_FIELDNAMES, rows(), "attachment; filename=shopify_products.csv")
     except Exception:
         session_db.rollback()
         raise
@@ -175,7 +303,17 @@ def export_shopify():
 def export_ebay():
     session_db = SessionLocal()
     try:
-        products, markup, qty = _parse_ids_and_params(session_db)
+        products, markup, qty = _parse_ids_and_params(
+            session_db,
+            columns=(Product.last_title, Product.custom_description, Product.last_price),
+            load_variants=False,
+            snapshot_columns=(
+                ProductSnapshot.title,
+                ProductSnapshot.description,
+                ProductSnapshot.price,
+                ProductSnapshot.image_urls,
+            ),
+        )
         ebay_category_id = request.args.get("ebay_category_id", "").strip()
         ebay_condition_id = request.args.get("ebay_condition_id", "").strip() or "3000"
         paypal_email = request.args.get("ebay_paypal_email", "").strip()
@@ -191,9 +329,6 @@ def export_ebay():
         except ValueError:
             exchange_rate = 155.0
 
-        output = io.StringIO()
-        writer = csv.writer(output)
-
         header = [
             "Action(SiteID=US|Country=JP|Currency=USD|Version=1193|CC=UTF-8)",
             "CustomLabel",
@@ -212,53 +347,51 @@ def export_ebay():
             "C:Brand",
             "C:Card Condition",
         ]
-        writer.writerow(header)
-
-        BRAND_DEFAULT = "Unbranded"
-        CARD_CONDITION_DEFAULT = "Used"
-
-        for p in products:
-            snap = p.snapshots[-1] if p.snapshots else None
-            title_src = snap.title if snap and snap.title else (p.last_title or "")
-            title = (title_src or "")[:80]
-            description_src = p.custom_description or (snap.description if snap and snap.description else "")
-            if not description_src:
-                description_src = title_src
-            description_html = normalize_rich_text(description_src)
-
-            base_price_yen = None
-            if snap and snap.price is not None:
-                base_price_yen = snap.price
-            elif p.last_price is not None:
-                base_price_yen = p.last_price
-
-            start_price = ""
-            if base_price_yen:
-                try:
-                    usd_val = (base_price_yen / exchange_rate) * markup
-                    start_price = "{:.2f}".format(usd_val)
-                except Exception:
-                    start_price = ""
 
-            image_urls = []
-            if snap and snap.image_urls:
-                image_urls = split_image_url_string(snap.image_urls)
-            pic_url = "|".join(image_urls) if image_urls else ""
-
-            custom_label = f"MERCARI-{p.id}"
-
-            row = [
-                "Add", custom_label, start_price, ebay_condition_id, title, description_html, pic_url,
-                ebay_category_id, "FixedPriceItem", "GTC", "Japan", shipping_profile, return_profile,
-                payment_profile, BRAND_DEFAULT, CARD_CONDITION_DEFAULT
-            ]
-            writer.writerow(row)
-
-        data = "\ufeff" + output.getvalue()
-        resp = make_response(data)
-        resp.headers["Content-Type"] = "text/csv; charset=utf-8"
-        resp.headers["Content-Disposition"] = 'attachment; filename="ebay_export.csv"'
-        return resp
+        def rows():
+            BRAND_DEFAULT = "Unbranded"
+            CARD_CONDITION_DEFAULT = "Used"
+
+            for p in products:
+                snap = p.latest_snapshot
+                title_src = snap.title if snap and snap.title else (p.last_title or "")
+                title = (title_src or "")[:80]
+                description_src = p.custom_description or (snap.description if snap and snap.description else "")
+                if not description_src:
+                    description_src = title_src
+                description_html = normalize_rich_text(description_src)
+
+                base_price_yen = None
+                if snap and snap.price is not None:
+                    base_price_yen = snap.price
+                elif p.last_price is not None:
+                    base_price_yen = p.last_price
+
+                start_price = ""
+                if base_price_yen:
+                    start_price = _usd_start_price(base_price_yen, exchange_rate, markup)
+
+                image_urls = []
+                if snap and snap.image_urls:
+                    image_urls = split_image_url_string(snap.image_urls)
+                pic_url = "|".join(image_urls) if image_urls else ""
+
+                custom_label = f"MERCARI-{p.id}"
+
+                row = [
+                    "Add", custom_label, start_price, ebay_condition_id, title, description_html, pic_url,
+                    ebay_category_id, "FixedPriceItem", "GTC", "Japan", shipping_profile, return_profile,
+                    payment_profile, BRAND_DEFAULT, CARD_CONDITION_DEFAULT
+                ]
+                yield row
+
+        return _csv_response(
+            header,
+            rows(),
+            'attachment; filename="ebay_export.csv"',
+            content_type="text/csv; charset=utf-8",
+            prefix="\ufeff",
+        )
     except Exception:
         session_db.rollback()
         raise
@@ -271,38 +404,39 @@ def export_ebay():
 def export_stock_update():
     session_db = SessionLocal()
     try:
-        products, markup, default_qty = _parse_ids_and_params(session_db)
+        products, markup, default_qty = _parse_ids_and_params(
+            session_db,
+            columns=(Product.custom_handle, Product.last_status),
+            variant_columns=_UPDATE_VARIANT_COLUMNS + (Variant.inventory_qty,),
+            load_snapshots=False,
+        )
         if not products:
-             return "対象の商品がありません。", 400
-
-        output = io.StringIO()
-        fieldnames = ["Handle", "Option1 Value", "Option2 Value", "Option3 Value", "Variant Inventory Qty"]
-        writer = csv.DictWriter(output, fieldnames=fieldnames)
-        writer.writeheader()
+             return _NO_PRODUCTS_MESSAGE, 400
 
-        for product in products:
-            handle = product.custom_handle or f"mercari-{product.id}"
-            variants = session_db.query(Variant).filter_by(product_id=product.id).order_by(Variant.position).all()
-            
-            for variant in variants:
-                if product.last_status in {'sold', 'deleted'}:
-                    final_qty = 0
-                else:
-                    final_qty = variant.inventory_qty if variant.inventory_qty is not None else default_qty
-                
-                writer.writerow({
-                    "Handle": handle,
-                    "Option1 Value": variant.option1_value,
-                    "Option2 Value": variant.option2_value,
-                    "Option3 Value": variant.option3_value,
-                    "Variant Inventory Qty": final_qty,
-                })
-
-        output.seek(0)
-        response = make_response(output.getvalue())
-        response.headers["Content-Disposition"] = "attachment; filename=shopify_stock_update.csv"
-        response.headers["Content-type"] = "text/csv"
-        return response
+        def rows():
+            for product in products:
+                handle = product.custom_handle or f"mercari-{product.id}"
+                variants = _ordered_variants(product)
+
+                for variant in variants:
+                    if product.last_status in {'sold', 'deleted'}:
+                        final_qty = 0
+                    else:
+                        final_qty = variant.inventory_qty if variant.inventory_qty is not None else default_qty
+
+                    yield (
+                        handle,
+                        variant.option1_value,
+                        variant.option2_value,
+                        variant.option3_value,
+                        final_qty,
+                    )
+
+        return _csv_response(
+            ("Handle", "Option1 Value", "Option2 Value", "Option3 Value", "Variant Inventory Qty"),
+            rows(),
+            "attachment; filename=shopify_stock_update.csv",
+        )
     except Exception:
         session_db.rollback()
         raise
@@ -315,36 +449,39 @@ def export_stock_update():
 def export_price_update():
     session_db = SessionLocal()
     try:
-        products, markup, default_qty = _parse_ids_and_params(session_db)
+        products, markup, default_qty = _parse_ids_and_params(
+            session_db,
+            columns=(Product.custom_handle,),
+            variant_columns=_UPDATE_VARIANT_COLUMNS + (Variant.price,),
+            load_snapshots=False,
+        )
         if not products:
-             return "対象の商品がありません。", 400
+             return _NO_PRODUCTS_MESSAGE, 400
 
-        output = io.StringIO()
-        fieldnames = ["Handle", "Option1 Value", "Option2 Value", "Option3 Value", "Variant Price"]
-        writer = csv.DictWriter(output, fieldnames=fieldnames)
-        writer.writeheader()
+        markup_num, markup_den = _markup_ratio(markup)
 
-        for product in products:
-            handle = product.custom_handle or f"mercari-{product.id}"
-            variants = session_db.query(Variant).filter_by(product_id=product.id).order_by(Variant.position).all()
-            
-            for variant in variants:
-                price = variant.price
-                final_price = int(price * markup) if price is not None else 0
-
-                writer.writerow({
-                    "Handle": handle,
-                    "Option1 Value": variant.option1_value,
-                    "Option2 Value": variant.option2_value,
-                    "Option3 Value": variant.option3_value,
-                    "Variant Price": final_price,
-                })
-
-        output.seek(0)
-        response = make_response(output.getvalue())
-        response.headers["Content-Disposition"] = "attachment; filename=shopify_price_update.csv"
-        response.headers["Content-type"] = "text/csv"
-        return response
+        def rows():
+            for product in products:
+                handle = product.custom_handle or f"mercari-{product.id}"
+                variants = _ordered_variants(product)
+
+                for variant in variants:
+                    price = variant.price
+                    final_price = price * markup_num // markup_den if price is not None else 0
+
+                    yield (
+                        handle,
+                        variant.option1_value,
+                        variant.option2_value,
+                        variant.option3_value,
+                        final_price,
+                    )
+
+        return _csv_response(
+            ("Handle", "Option1 Value", "Option2 Value", "Option3 Value", "Variant Price"),
+            rows(),
+            "attachment; filename=shopify_price_update.csv",
+        )
     except Exception:
         session_db.rollback()
         raise
@@ -352,49 +489,116 @@ def export_price_update():
         session_db.close()
 
 
+def _download_image_or_none(img_url, cached_filename=None):
+    try:
+        if cached_filename:
+            with open(os.path.join(IMAGE_STORAGE_PATH, cached_filename), 'rb') as cached_file:
+                return cached_file.read(), os.path.splitext(cached_filename)[1]
+        return download_external_image(img_url)
+    except Exception as e:
+        print(f"Error downloading image: {e}")
+        return None
+
+
+def _map_in_order(func, items, workers):
+    """Yield ``func(item)`` in input order while keeping at most ``2 * workers`` calls in flight."""
+    window = workers * 2
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for item in items:
+            pending.append(executor.submit(func, item))
+            if len(pending) >= window:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def _download_entry(download):
+    _name, url, cached_filename = download
+    return _download_image_or_none(url, cached_filename)
+
+
+def _iter_downloaded_images(downloads, workers):
+    """Yield ``(name, result)`` in input order while keeping at most ``2 * workers`` downloads in flight."""
+    results = _map_in_order(_download_entry, downloads, workers)
+    for (name, _url, _cached_filename), result in zip(downloads, results):
+        yield name, result
+
+
+class _ZipChunkSink:
+    """Write-only stream that collects ZipFile output until the generator drains it."""
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _stream_image_zip(downloads, workers):
+    sink = _ZipChunkSink()
+    # ZipFile falls back to data descriptors on an unseekable sink, so each
+    # entry can be emitted as soon as it is written.
+    with zipfile.ZipFile(sink, 'w', zipfile.ZIP_DEFLATED) as zip_file:
+        for name, result in _iter_downloaded_images(downloads, workers):
+            if result is None:
+                continue
+            image_bytes, ext = result
+            zip_file.writestr(f"{name}{ext}", image_bytes)
+            chunk = sink.drain()
+            if chunk:
+                yield chunk
+    chunk = sink.drain()
+    if chunk:
+        yield chunk
+
+
 @export_bp.route("/export_images")
 @login_required
 def export_images():
     """Export product images as a ZIP file."""
-    import zipfile
-    from io import BytesIO
-    
     session_db = SessionLocal()
     try:
-        products, _, _ = _parse_ids_and_params(session_db)
+        products, _, _ = _parse_ids_and_params(
+            session_db,
+            columns=(Product.id,),
+            load_variants=False,
+            snapshot_columns=(ProductSnapshot.image_urls,),
+        )
         if not products:
-            return "対象の商品がありません。", 400
+            return _NO_PRODUCTS_MESSAGE, 400
 
-        # Create ZIP in memory
-        zip_buffer = BytesIO()
-        with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-            for product in products:
-                snapshot = (
-                    session_db.query(ProductSnapshot)
-                    .filter_by(product_id=product.id)
-                    .order_by(ProductSnapshot.scraped_at.desc())
-                    .first()
-                )
-                
-                if not snapshot or not snapshot.image_urls:
-                    continue
-                
-                image_urls = split_image_url_string(snapshot.image_urls)
-                product_folder = f"product_{product.id}"
-                
-                for i, img_url in enumerate(image_urls):
-                    try:
-                        image_bytes, ext = download_external_image(img_url)
-                        filename = f"{product_folder}/image_{i+1}{ext}"
-                        zip_file.writestr(filename, image_bytes)
-                    except Exception as e:
-                        print(f"Error downloading image: {e}")
-                        continue
-
-        zip_buffer.seek(0)
-        response = make_response(zip_buffer.read())
+        downloads = []
+        for product in products:
+            snapshot = product.latest_snapshot
+            
+            if not snapshot or not snapshot.image_urls:
+                continue
+            
+            product_folder = f"product_{product.id}"
+            for i, img_url in enumerate(split_image_url_string(snapshot.image_urls)):
+                # Images the Shopify export already cached are read from disk
+                # instead of being fetched again.
+                downloads.append((f"{product_folder}/image_{i+1}", img_url, find_cached_image(product.id, i)))
+
+        # Downloads are I/O bound, so fetch them concurrently; ZipFile is not
+        # thread-safe, so entries are written from the streaming generator in
+        # input order.
+        workers = max(1, env_int("EXPORT_IMAGE_DOWNLOAD_WORKERS", 8))
+        response = Response(
+            stream_with_context(_stream_image_zip(downloads, workers)),
+            content_type="application/zip",
+        )
         response.headers["Content-Disposition"] = "attachment; filename=product_images.zip"
-        response.headers["Content-type"] = "application/zip"
         return response
     except Exception:
         session_db.rollback()
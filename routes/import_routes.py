@@ -6,12 +6,15 @@ import io
 import json
 import os
 import secrets
+import shutil
 import time
+from itertools import islice
 from pathlib import Path
 from flask import Blueprint, current_app, render_template, request, redirect, url_for, flash, session as flask_session
 from flask_login import login_required, current_user
+from sqlalchemy import insert
 from database import SessionLocal
-from models import Product, Variant, Shop
+from models import Product, ProductSnapshot, Variant, Shop
 from services.rich_text import normalize_rich_text
 from time_utils import utc_now
 
@@ -86,25 +89,25 @@ def _cleanup_import_preview_files():
             continue
 
 
-def _store_import_preview_content(content):
+def _store_import_preview_upload(stream):
+    """Copy the raw upload to the preview directory in chunks and return its token."""
     _cleanup_import_preview_files()
     token = secrets.token_urlsafe(32)
     path = _import_preview_storage_dir() / f'{token}.csv'
-    path.write_bytes(content.encode('utf-8'))
+    with path.open('wb') as preview_file:
+        shutil.copyfileobj(stream, preview_file)
     return token
 
 
-def _load_import_preview_content(token):
-    path = _import_preview_path(token)
-    if not path or not path.is_file():
-        return None
-    try:
-        return path.read_bytes().decode('utf-8')
-    finally:
-        try:
-            path.unlink(missing_ok=True)
-        except OSError:
-            pass
+def _open_csv_text(binary_stream):
+    return io.TextIOWrapper(binary_stream, encoding='utf-8-sig', newline='')
+
+
+def _read_csv_rows(csv_text):
+    """Return ``(header, rows)``; blank lines are skipped as csv.DictReader would."""
+    reader = csv.reader(csv_text)
+    header = next(reader, None) or []
+    return header, (row for row in reader if row)
 
 
 def _clear_import_preview_session(delete_content=True):
@@ -116,33 +119,87 @@ def _clear_import_preview_session(delete_content=True):
         _discard_import_preview_content(token)
 
 
-def _map_csv_row(row: dict, is_shopify: bool = False) -> dict:
+def _detect_shopify(fieldnames) -> bool:
+    """Return True when the CSV header looks like a Shopify product export."""
+    fields = set(fieldnames or ())
+    return 'Handle' in fields or ('Title' in fields and 'Variant SKU' in fields)
+
+
+# field -> (candidate CSV columns in priority order, default)
+_SHOPIFY_COLUMN_ALIASES = {
+    'title': (('Title',), ''),
+    'price': (('Variant Price', 'Price'), '0'),
+    'url': ((), ''),  # Shopify doesn't have source URL
+    'sku': (('Variant SKU',), ''),
+    'description': (('Body (HTML)',), ''),
+    'image_urls': (('Image Src',), ''),
+    'inventory': (('Variant Inventory Qty',), '1'),
+}
+_STANDARD_COLUMN_ALIASES = {
+    'title': (('title', 'Title', 'タイトル'), ''),
+    'price': (('price', 'Price', '価格'), '0'),
+    'url': (('url', 'URL', '商品URL'), ''),
+    'sku': (('sku', 'SKU'), ''),
+    'description': (('description', 'Description', '説明'), ''),
+    'image_urls': (('image_urls', 'Image URLs', '画像URL'), ''),
+    'inventory': (('inventory', 'Inventory', '在庫'), '1'),
+}
+
+
+def _build_csv_row_mapper(fieldnames, is_shopify: bool = False):
     """
-    Map CSV row to standard format.
+    Build a row mapper for one CSV header, mapping to the standard format.
     Supports both standard and Shopify CSV formats.
+    Aliases are resolved to column positions once, so each row (a plain
+    ``csv.reader`` list) is read by index; aliases missing from the header
+    are dropped. A repeated header name maps to its last column, as with
+    csv.DictReader.
     """
-    if is_shopify:
-        # Shopify format mapping
-        return {
-            'title': row.get('Title', ''),
-            'price': row.get('Variant Price', '') or row.get('Price', '0'),
-            'url': '',  # Shopify doesn't have source URL
-            'sku': row.get('Variant SKU', ''),
-            'description': row.get('Body (HTML)', ''),
-            'image_urls': row.get('Image Src', ''),
-            'inventory': row.get('Variant Inventory Qty', '1')
-        }
-    else:
-        # Standard format
-        return {
-            'title': row.get('title') or row.get('Title') or row.get('タイトル') or '',
-            'price': row.get('price') or row.get('Price') or row.get('価格') or '0',
-            'url': row.get('url') or row.get('URL') or row.get('商品URL') or '',
-            'sku': row.get('sku') or row.get('SKU') or '',
-            'description': row.get('description') or row.get('Description') or row.get('説明') or '',
-            'image_urls': row.get('image_urls') or row.get('Image URLs') or row.get('画像URL') or '',
-            'inventory': row.get('inventory') or row.get('Inventory') or row.get('在庫') or '1'
-        }
+    aliases = _SHOPIFY_COLUMN_ALIASES if is_shopify else _STANDARD_COLUMN_ALIASES
+    positions = {name: index for index, name in enumerate(fieldnames or ())}
+    resolved = [
+        (field, tuple(positions[key] for key in keys if key in positions), default)
+        for field, (keys, default) in aliases.items()
+    ]
+
+    def _map(row: list) -> dict:
+        mapped = {}
+        width = len(row)
+        for field, indexes, default in resolved:
+            value = default
+            for index in indexes:
+                if index < width and row[index]:
+                    value = row[index]
+                    break
+            mapped[field] = value
+        return mapped
+
+    return _map
+
+
+_SOURCE_URL_LOOKUP_CHUNK = 500
+_IMPORT_BATCH_SIZE = 500
+
+
+def _iter_batches(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def _existing_product_ids_by_url(session_db, urls):
+    """Map already-imported source URLs of the current user to product ids, one IN query per chunk."""
+    urls = [url for url in dict.fromkeys(urls) if url]
+    existing = {}
+    for start in range(0, len(urls), _SOURCE_URL_LOOKUP_CHUNK):
+        chunk = urls[start:start + _SOURCE_URL_LOOKUP_CHUNK]
+        existing.update(
+            session_db.query(Product.source_url, Product.id).filter(
+                Product.user_id == current_user.id,
+                Product.source_url.in_(chunk),
+            ).all()
+        )
+    return existing
 
 
 @import_bp.route('/import')
@@ -178,15 +235,34 @@ def import_preview():
             flash('ファイルを選択してください', 'error')
             return redirect(url_for('import.import_form'))
         
-        # Parse CSV
-        content = file.stream.read().decode('utf-8-sig')
-        reader = csv.DictReader(io.StringIO(content))
-        
-        # Detect Shopify format
-        is_shopify = False
-        fieldnames = reader.fieldnames or []
-        if 'Handle' in fieldnames or 'Title' in fieldnames and 'Variant SKU' in fieldnames:
-            is_shopify = True
+        # Store the upload server-side; keep only the opaque token in the cookie session.
+        _clear_import_preview_session()
+        try:
+            preview_token = _store_import_preview_upload(file.stream)
+        except OSError:
+            flash('プレビューデータの保存に失敗しました。再度アップロードしてください。', 'error')
+            return redirect(url_for('import.import_form'))
+
+        # Parse only the previewed rows back from disk
+        try:
+            with _import_preview_path(preview_token).open('rb') as preview_file:
+                csv_text = _open_csv_text(preview_file)
+                header, reader = _read_csv_rows(csv_text)
+                
+                is_shopify = _detect_shopify(header)
+                map_row = _build_csv_row_mapper(header, is_shopify)
+                
+                mapped_rows = [
+                    (row_num, map_row(row))
+                    for row_num, row in zip(range(2, 52), reader)
+                ]
+                # Decode the rest too, so an encoding error surfaces now rather than on execute
+                while csv_text.read(64 * 1024):
+                    pass
+        except (UnicodeDecodeError, csv.Error):
+            _discard_import_preview_content(preview_token)
+            flash('CSVファイルを読み込めませんでした。UTF-8 形式のCSVを選択してください。', 'error')
+            return redirect(url_for('import.import_form'))
         
         preview_rows = []
         warnings = []
@@ -194,9 +270,11 @@ def import_preview():
         if is_shopify:
             warnings.append('Shopify CSVフォーマットを検出しました')
         
-        for row_num, row in enumerate(reader, start=2):
-            # Map columns (support both standard and Shopify format)
-            mapped = _map_csv_row(row, is_shopify)
+        existing_ids = _existing_product_ids_by_url(
+            session_db, [mapped.get('url', '') for _, mapped in mapped_rows]
+        )
+
+        for row_num, mapped in mapped_rows:
             title = mapped.get('title', '')
             price_str = mapped.get('price', '0')
             url = mapped.get('url', '')
@@ -208,14 +286,9 @@ def import_preview():
             if not title:
                 status = 'error'
                 warning = 'タイトルなし'
-            elif url:
-                existing = session_db.query(Product).filter(
-                    Product.user_id == current_user.id,
-                    Product.source_url == url
-                ).first()
-                if existing:
-                    status = 'skip'
-                    warning = f'重複 (ID: {existing.id})'
+            elif url and url in existing_ids:
+                status = 'skip'
+                warning = f'重複 (ID: {existing_ids[url]})'
             
             preview_rows.append({
                 'row_num': row_num,
@@ -230,14 +303,6 @@ def import_preview():
                 warnings.append('プレビューは最初の50行のみ表示')
                 break
         
-        # Store preview content server-side; keep only the opaque token in the cookie session.
-        _clear_import_preview_session()
-        try:
-            preview_token = _store_import_preview_content(content)
-        except OSError:
-            flash('プレビューデータの保存に失敗しました。再度アップロードしてください。', 'error')
-            return redirect(url_for('import.import_form'))
-
         flask_session[_IMPORT_PREVIEW_TOKEN_KEY] = preview_token
         flask_session[_IMPORT_PREVIEW_SHOP_ID_KEY] = str(shop_id) if shop_id is not None else ''
         flask_session[_IMPORT_PREVIEW_SITE_KEY] = site
@@ -270,21 +335,29 @@ def import_preview():
 def import_execute():
     """Execute the actual import from previewed data."""
     preview_token = flask_session.get(_IMPORT_PREVIEW_TOKEN_KEY)
-    content = _load_import_preview_content(preview_token) if preview_token else None
-    if content is None:
-        content = flask_session.get(_LEGACY_IMPORT_PREVIEW_CONTENT_KEY)
+    preview_path = _import_preview_path(preview_token) if preview_token else None
+    legacy_content = flask_session.get(_LEGACY_IMPORT_PREVIEW_CONTENT_KEY)
     shop_id_str = flask_session.get(_IMPORT_PREVIEW_SHOP_ID_KEY)
     site = flask_session.get(_IMPORT_PREVIEW_SITE_KEY, 'import')
     
-    if not content:
+    if preview_path and preview_path.is_file():
+        _clear_import_preview_session(delete_content=False)
+        # Process import, re-streaming the stored upload
+        try:
+            with preview_path.open('rb') as preview_file:
+                return _process_import(_open_csv_text(preview_file), shop_id_str, site)
+        finally:
+            _discard_import_preview_content(preview_token)
+    
+    if not legacy_content:
         _clear_import_preview_session()
         flash('プレビューデータがありません。再度アップロードしてください。', 'error')
         return redirect(url_for('import.import_form'))
     
-    _clear_import_preview_session(delete_content=False)
+    _clear_import_preview_session()
     
     # Process import
-    return _process_import(content, shop_id_str, site)
+    return _process_import(io.StringIO(legacy_content), shop_id_str, site)
 
 
 @import_bp.route('/import/csv', methods=['POST'])
@@ -299,100 +372,130 @@ def import_csv():
         flash('ファイルを選択してください', 'error')
         return redirect(url_for('import.import_form'))
     
-    content = file.stream.read().decode('utf-8-sig')
-    return _process_import(content, shop_id_str, site)
+    return _process_import(_open_csv_text(file.stream), shop_id_str, site)
+
+
+def _insert_import_rows(session_db, pending_rows) -> int:
+    """Write validated (product, snapshot, variant) rows with one INSERT per table."""
+    if not pending_rows:
+        return 0
+
+    product_ids = session_db.execute(
+        insert(Product).returning(Product.id, sort_by_parameter_order=True),
+        [product_row for product_row, _, _ in pending_rows],
+    ).scalars().all()
+    
+    variant_rows = []
+    snapshot_rows = []
+    for product_id, (_, snapshot_row, variant_row) in zip(product_ids, pending_rows):
+        # Create default variant
+        variant_rows.append({
+            **variant_row,
+            "product_id": product_id,
+            "sku": variant_row["sku"] or f"IMP-{product_id}",
+        })
+        if snapshot_row is not None:
+            snapshot_rows.append({**snapshot_row, "product_id": product_id})
+    
+    session_db.execute(insert(Variant), variant_rows)
+    if snapshot_rows:
+        session_db.execute(insert(ProductSnapshot), snapshot_rows)
+    return len(pending_rows)
 
 
-def _process_import(content: str, shop_id_str: str, site: str):
+def _process_import(csv_stream, shop_id_str: str, site: str):
     """Shared import logic used by both direct and preview import."""
     session_db = SessionLocal()
+    imported = 0
     try:
-        reader = csv.DictReader(io.StringIO(content))
+        header, reader = _read_csv_rows(csv_stream)
         shop_id, shop_error = _resolve_owned_shop_id(session_db, shop_id_str)
         if shop_error:
             flash(shop_error, 'error')
             return redirect(url_for('import.import_form'))
 
-        imported = 0
         errors = []
+        now = utc_now()
         
-        # Detect Shopify format
-        fieldnames = reader.fieldnames or []
-        is_shopify = 'Handle' in fieldnames or ('Title' in fieldnames and 'Variant SKU' in fieldnames)
+        map_row = _build_csv_row_mapper(header, _detect_shopify(header))
         
-        for row_num, row in enumerate(reader, start=2):
-            try:
-                # Map columns (support both standard and Shopify format)
-                mapped = _map_csv_row(row, is_shopify)
-                title = mapped.get('title', '')
-                price_str = mapped.get('price', '0')
-                url = mapped.get('url', '')
-                description = mapped.get('description', '')
-                normalized_description = normalize_rich_text(description)
-                image_urls = mapped.get('image_urls', '')
-                sku = mapped.get('sku', '')
-                inventory = mapped.get('inventory', '1')
-                
-                if not title:
-                    errors.append(f"Row {row_num}: タイトルなし")
-                    continue
+        # Rows are read, validated and written one batch at a time, so memory
+        # stays bounded by the batch size rather than the file size.
+        for batch in _iter_batches(enumerate(reader, start=2), _IMPORT_BATCH_SIZE):
+            mapped_rows = [(row_num, map_row(row)) for row_num, row in batch]
+            # Earlier batches are already inserted, so this lookup also
+            # catches URLs repeated across batches.
+            existing_ids = _existing_product_ids_by_url(
+                session_db, [mapped.get('url', '') for _, mapped in mapped_rows]
+            )
+            pending_rows = []
+            seen_urls = set()
+            
+            for row_num, mapped in mapped_rows:
+                try:
+                    title = mapped.get('title', '')
+                    price_str = mapped.get('price', '0')
+                    url = mapped.get('url', '')
+                    description = mapped.get('description', '')
+                    normalized_description = normalize_rich_text(description)
+                    image_urls = mapped.get('image_urls', '')
+                    sku = mapped.get('sku', '')
+                    inventory = mapped.get('inventory', '1')
+                    
+                    if not title:
+                        errors.append(f"Row {row_num}: タイトルなし")
+                        continue
 
-                
-                # Check for duplicate URL
-                if url:
-                    existing = session_db.query(Product).filter(
-                        Product.user_id == current_user.id,
-                        Product.source_url == url
-                    ).first()
-                    if existing:
+                    
+                    # Check for duplicate URL (already stored, or earlier in this batch)
+                    if url and (url in existing_ids or url in seen_urls):
                         errors.append(f"Row {row_num}: URL重複")
                         continue
-                
-                # Create product
-                product = Product(
-                    user_id=current_user.id,
-                    shop_id=shop_id,
-                    site=site,
-                    source_url=url,
-                    last_title=title,
-                    custom_title=title,
-                    custom_description=normalized_description,
-                    last_price=int(float(price_str)) if price_str else 0,
-                    created_at=utc_now(),
-                    updated_at=utc_now()
-                )
-                session_db.add(product)
-                session_db.flush()
-                
-                # Create snapshot if images/description provided
-                if image_urls or description:
-                    from models import ProductSnapshot
-                    snapshot = ProductSnapshot(
-                        product_id=product.id,
-                        title=title,
-                        price=product.last_price,
-                        description=normalized_description,
-                        image_urls=image_urls,
-                        scraped_at=utc_now()
-                    )
-                    session_db.add(snapshot)
-                
-                # Create default variant
-                variant = Variant(
-                    product_id=product.id,
-                    option1_value="Default Title",
-                    sku=sku or f"IMP-{product.id}",
-                    price=product.last_price,
-                    inventory_qty=int(inventory) if inventory else 1,
-                    position=1
-                )
-                session_db.add(variant)
-                imported += 1
-                
-            except Exception as e:
-                errors.append(f"Row {row_num}: {str(e)}")
-        
-        session_db.commit()
+                    
+                    price = int(float(price_str)) if price_str else 0
+                    product_row = {
+                        "user_id": current_user.id,
+                        "shop_id": shop_id,
+                        "site": site,
+                        "source_url": url,
+                        "last_title": title,
+                        "custom_title": title,
+                        "custom_description": normalized_description,
+                        "last_price": price,
+                        "created_at": now,
+                        "updated_at": now,
+                    }
+                    
+                    # Create snapshot if images/description provided
+                    snapshot_row = None
+                    if image_urls or description:
+                        snapshot_row = {
+                            "title": title,
+                            "price": price,
+                            "description": normalized_description,
+                            "image_urls": image_urls,
+                            "scraped_at": now,
+                        }
+                    
+                    variant_row = {
+                        "option1_value": "Default Title",
+                        "sku": sku,
+                        "price": price,
+                        "inventory_qty": int(inventory) if inventory else 1,
+                        "position": 1,
+                    }
+                    pending_rows.append((product_row, snapshot_row, variant_row))
+                    if url:
+                        seen_urls.add(url)
+                    
+                except Exception as e:
+                    errors.append(f"Row {row_num}: {str(e)}")
+            
+            # Commit per batch so the transaction stays bounded and a
+            # failure later in the file keeps the rows already imported.
+            batch_imported = _insert_import_rows(session_db, pending_rows)
+            session_db.commit()
+            imported += batch_imported
         
         msg = f'{imported}件のインポートが完了しました。'
         if errors:
@@ -403,7 +506,10 @@ def _process_import(content: str, shop_id_str: str, site: str):
         
     except Exception as e:
         session_db.rollback()
-        flash(f'インポートエラー: {str(e)}', 'error')
+        msg = f'インポートエラー: {str(e)}'
+        if imported:
+            msg += f' ({imported}件はインポート済みです)'
+        flash(msg, 'error')
         return redirect(url_for('import.import_form'))
     finally:
         session_db.close()
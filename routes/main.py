@@ -6,13 +6,13 @@ from datetime import datetime
 
 from flask import Blueprint, render_template, request, session, redirect, url_for
 from flask_login import login_required, current_user
-from sqlalchemy.orm import subqueryload
-from sqlalchemy import func, or_, select
+from sqlalchemy import String, func, literal, or_, select, update
 
 from database import SessionLocal
 from models import Shop, Product, Variant, ProductSnapshot
 from services.image_service import split_image_url_string
 from services.rich_text import normalize_rich_text
+from services.snapshot_service import load_recent_snapshots_by_product, ranked_snapshot_select
 from services.validation_service import validate_product, get_issue_summary
 from time_utils import utc_now
 
@@ -145,41 +145,13 @@ def _normalize_source_status(raw_status):
     return "unknown"
 
 
-def _latest_snapshot_for_dashboard(product):
-    if not product.snapshots:
-        return None
-
-    return max(
-        product.snapshots,
-        key=lambda snapshot: (snapshot.scraped_at or datetime.min, snapshot.id or 0),
-    )
-
-
 def _split_snapshot_image_urls(snapshot):
     return split_image_url_string(snapshot.image_urls if snapshot else None)
 
 
-def _ranked_snapshot_select(product_ids_select):
-    return (
-        select(
-            ProductSnapshot.id.label("snapshot_id"),
-            ProductSnapshot.product_id.label("product_id"),
-            ProductSnapshot.price.label("price"),
-            ProductSnapshot.status.label("status"),
-            func.row_number()
-            .over(
-                partition_by=ProductSnapshot.product_id,
-                order_by=(ProductSnapshot.scraped_at.desc(), ProductSnapshot.id.desc()),
-            )
-            .label("snapshot_rank"),
-        )
-        .join(product_ids_select, ProductSnapshot.product_id == product_ids_select.c.product_id)
-    )
-
-
 def _changed_product_ids_select(product_query):
     product_ids = product_query.with_entities(Product.id.label("product_id")).order_by(None).subquery()
-    ranked_snapshots = _ranked_snapshot_select(product_ids).subquery()
+    ranked_snapshots = ranked_snapshot_select(product_ids_select=product_ids).subquery()
     latest = (
         select(
             ranked_snapshots.c.product_id,
@@ -211,34 +183,11 @@ def _changed_product_ids_select(product_query):
     )
 
 
-def _load_recent_snapshots_by_product(session_db, product_ids):
-    if not product_ids:
-        return {}
-
-    product_ids_select = (
-        select(Product.id.label("product_id"))
-        .where(Product.id.in_(product_ids))
-        .subquery()
-    )
-    ranked_snapshots = _ranked_snapshot_select(product_ids_select).subquery()
-    rows = (
-        session_db.query(ProductSnapshot, ranked_snapshots.c.snapshot_rank)
-        .join(ranked_snapshots, ProductSnapshot.id == ranked_snapshots.c.snapshot_id)
-        .filter(ranked_snapshots.c.snapshot_rank <= 2)
-        .order_by(ranked_snapshots.c.product_id, ranked_snapshots.c.snapshot_rank)
-        .all()
-    )
-
-    snapshots_by_product = {}
-    for snapshot, snapshot_rank in rows:
-        snapshots_by_product.setdefault(snapshot.product_id, {})[int(snapshot_rank)] = snapshot
-    return snapshots_by_product
-
-
 def _annotate_products_for_index(session_db, products):
-    snapshots_by_product = _load_recent_snapshots_by_product(
+    snapshots_by_product = load_recent_snapshots_by_product(
         session_db,
         [product.id for product in products],
+        depth=2,
     )
     for product in products:
         recent = snapshots_by_product.get(product.id, {})
@@ -255,8 +204,7 @@ def _annotate_products_for_index(session_db, products):
         )
 
 
-def _build_dashboard_product_row(product):
-    latest_snapshot = _latest_snapshot_for_dashboard(product)
+def _build_dashboard_product_row(product, latest_snapshot):
     image_urls = _split_snapshot_image_urls(latest_snapshot)
     issues = validate_product(product, latest_snapshot)
     error_count = sum(1 for issue in issues if issue["type"] == "error")
@@ -303,28 +251,29 @@ def dashboard():
         if current_shop_id:
             base_query = base_query.filter(Product.shop_id == current_shop_id)
 
-        products = base_query.options(subqueryload(Product.snapshots)).all()
-        dashboard_rows = [_build_dashboard_product_row(product) for product in products]
+        # The zero-stock variant count rides along as a correlated subquery,
+        # and only the latest snapshot per product is loaded.
+        zero_stock_variants = (
+            select(func.count(Variant.id))
+            .where(Variant.product_id == Product.id, Variant.inventory_qty == 0)
+            .correlate(Product)
+            .scalar_subquery()
+        )
+        product_rows = base_query.add_columns(zero_stock_variants).all()
+        snapshots_by_product = load_recent_snapshots_by_product(
+            session_db,
+            [product.id for product, _ in product_rows],
+        )
+        dashboard_rows = [
+            _build_dashboard_product_row(product, snapshots_by_product.get(product.id, {}).get(1))
+            for product, _ in product_rows
+        ]
         total_items = len(dashboard_rows)
 
         publication_counts = Counter(row["publication_status"] for row in dashboard_rows)
         source_counts = Counter(row["source_status"] for row in dashboard_rows)
 
-        zero_stock_variants_query = (
-            session_db.query(func.count(Variant.id))
-            .join(Product)
-            .filter(
-                Product.user_id == current_user.id,
-                Product.archived != True,
-                Product.deleted_at == None,
-                Product.is_listed.isnot(False),
-            )
-            .filter(Variant.inventory_qty == 0)
-        )
-        if current_shop_id:
-            zero_stock_variants_query = zero_stock_variants_query.filter(Product.shop_id == current_shop_id)
-
-        zero_stock_variant_count = zero_stock_variants_query.scalar() or 0
+        zero_stock_variant_count = sum(zero_stock or 0 for _, zero_stock in product_rows)
 
         products_with_issues = [
             (row["title"], row["issues"])
@@ -432,18 +381,21 @@ def index():
             Product.is_listed.isnot(False),  # Exclude pricelist-only products
         )
 
-        sites = [s[0] for s in base_query.with_entities(Product.site).distinct().all()]
-        statuses = [s[0] for s in base_query.with_entities(Product.last_status).distinct().all()]
-        all_shops = session_db.query(Shop).filter_by(user_id=current_user.id).all()
-        current_shop_id = session.get('current_shop_id')
-        
-        site_stats = dict(
+        # Filter dropdowns and per-site counts all come from one GROUP BY.
+        filter_counts = (
             base_query
-            .with_entities(Product.site, func.count(Product.id))
-            .group_by(Product.site)
+            .with_entities(Product.site, Product.last_status, func.count(Product.id))
+            .group_by(Product.site, Product.last_status)
             .all()
         )
-        total_count = base_query.order_by(None).count()
+        site_stats = {}
+        for site, _status, count in filter_counts:
+            site_stats[site] = site_stats.get(site, 0) + count
+        sites = list(site_stats)
+        statuses = list(dict.fromkeys(status for _site, status, _count in filter_counts))
+        total_count = sum(site_stats.values())
+        all_shops = session_db.query(Shop).filter_by(user_id=current_user.id).all()
+        current_shop_id = session.get('current_shop_id')
 
         query = base_query
         if current_shop_id:
@@ -686,35 +638,36 @@ def batch_edit():
     action = request.form.get("action")
     input_value = request.form.get("input", "")
     input2_value = request.form.get("input2", "")
-    product_ids = request.form.getlist("ids")
+    product_ids = {int(pid) for pid in request.form.getlist("ids") if pid.isdigit()}
     
     if not product_ids or not action:
         return redirect(url_for('main.index'))
     
+    # The displayed title: custom_title, falling back to last_title when blank.
+    original_title = func.coalesce(func.nullif(Product.custom_title, ""), Product.last_title, "")
+    if action == "prefix" and input_value:
+        new_title = literal(input_value, String) + original_title
+    elif action == "suffix" and input_value:
+        new_title = original_title + literal(input_value, String)
+    elif action == "replace" and input_value:
+        new_title = func.replace(original_title, input_value, input2_value)
+    else:
+        return redirect(url_for('main.index'))
+
     session_db = SessionLocal()
     try:
-        # Get products owned by current user
-        products = session_db.query(Product).filter(
-            Product.id.in_([int(pid) for pid in product_ids]),
-            Product.user_id == current_user.id
-        ).all()
-        
-        updated_count = 0
-        for product in products:
-            original_title = product.custom_title or product.last_title or ""
-            new_title = original_title
-            
-            if action == "prefix":
-                new_title = input_value + original_title
-            elif action == "suffix":
-                new_title = original_title + input_value
-            elif action == "replace":
-                new_title = original_title.replace(input_value, input2_value)
-            
-            if new_title != original_title:
-                product.custom_title = new_title
-                updated_count += 1
-        
+        # One set-based UPDATE for all selected products owned by the user;
+        # rows whose title would not change are left untouched.
+        session_db.execute(
+            update(Product)
+            .where(
+                Product.id.in_(product_ids),
+                Product.user_id == current_user.id,
+                new_title != original_title,
+            )
+            .values(custom_title=new_title)
+            .execution_options(synchronize_session=False)
+        )
         session_db.commit()
         
         # Flash message would be ideal, but redirect with success param works too
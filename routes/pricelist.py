@@ -4,12 +4,13 @@ Price List management routes: create, edit, delete, manage items.
 import uuid
 from flask import Blueprint, render_template, request, redirect, url_for, flash, session
 from flask_login import login_required, current_user
-from sqlalchemy.orm import subqueryload
+from sqlalchemy.orm import selectinload
 
 from database import SessionLocal
 from models import Shop, Product, ProductSnapshot, Variant, PriceList, PriceListItem
 from services.image_service import split_image_url_string
 from services.rich_text import normalize_rich_text
+from services.snapshot_service import attach_latest_snapshots
 from time_utils import utc_now
 
 pricelist_bp = Blueprint('pricelist', __name__)
@@ -255,19 +256,16 @@ def pricelist_items(pricelist_id):
             session_db.query(PriceListItem)
             .filter(PriceListItem.price_list_id == pl.id)
             .join(Product)
-            .options(subqueryload(PriceListItem.product).subqueryload(Product.snapshots))
-            .options(subqueryload(PriceListItem.product).subqueryload(Product.variants))
+            .options(selectinload(PriceListItem.product).selectinload(Product.variants))
             .order_by(PriceListItem.sort_order)
             .all()
         )
+        attach_latest_snapshots(session_db, [item.product for item in items])
 
         # Process items for display
         for item in items:
             p = item.product
-            snapshot = (
-                sorted(p.snapshots, key=lambda s: s.scraped_at, reverse=True)[0]
-                if p.snapshots else None
-            )
+            snapshot = p.latest_snapshot
             image_urls = split_image_url_string(snapshot.image_urls if snapshot else None)
             item.thumb_url = image_urls[0] if image_urls else ""
             item.display_title = p.custom_title or p.last_title or "(タイトルなし)"
@@ -388,7 +386,6 @@ def pricelist_add_products_page(pricelist_id):
                 Product.archived != True,
                 Product.deleted_at == None,
             )
-            .options(subqueryload(Product.snapshots))
         )
         if search:
             query = query.filter(
@@ -397,13 +394,11 @@ def pricelist_add_products_page(pricelist_id):
             )
 
         products = query.order_by(Product.updated_at.desc()).limit(100).all()
+        attach_latest_snapshots(session_db, products)
 
         # Attach thumbnail and mark already-added
         for p in products:
-            snapshot = (
-                sorted(p.snapshots, key=lambda s: s.scraped_at, reverse=True)[0]
-                if p.snapshots else None
-            )
+            snapshot = p.latest_snapshot
             image_urls = split_image_url_string(snapshot.image_urls if snapshot else None)
             p.thumb_url = image_urls[0] if image_urls else ""
             p.already_added = p.id in existing_ids
@@ -456,12 +456,19 @@ def product_detail(product_id):
                     session_db.add(next_snapshot)
                     snapshot = next_snapshot
             
+            # Load the product's variants once; deletes and updates below work
+            # on this map and are flushed together at commit.
+            variants_by_id = {
+                variant.id: variant
+                for variant in session_db.query(Variant).filter_by(product_id=product.id).order_by(Variant.id)
+            }
+
             # --- バリエーション削除 ---
             delete_ids_str = request.form.get("delete_v_ids", "")
             if delete_ids_str:
                 for del_id in delete_ids_str.split(","):
                     if del_id.isdigit():
-                        v_to_del = session_db.query(Variant).filter_by(id=int(del_id), product_id=product.id).first()
+                        v_to_del = variants_by_id.pop(int(del_id), None)
                         if v_to_del:
                             session_db.delete(v_to_del)
 
@@ -470,7 +477,7 @@ def product_detail(product_id):
             for v_id_str in v_ids:
                 try:
                     v_id = int(v_id_str)
-                    variant = session_db.query(Variant).filter_by(id=v_id, product_id=product.id).first()
+                    variant = variants_by_id.get(v_id)
                     if variant:
                         variant.option1_value = request.form.get(f"v_opt1_{v_id}")
                         variant.option2_value = request.form.get(f"v_opt2_{v_id}")
@@ -494,6 +501,7 @@ def product_detail(product_id):
 
             # --- バリエーション新規作成 ---
             new_indices = request.form.getlist("new_v_indices")
+            new_variants = []
             for idx in new_indices:
                 try:
                     new_variant = Variant(
@@ -522,6 +530,7 @@ def product_detail(product_id):
                         new_variant.grams = int(g_val)
                     
                     session_db.add(new_variant)
+                    new_variants.append(new_variant)
                 except Exception as e:
                     print(f"Error adding variant {idx}: {e}")
                     continue
@@ -529,7 +538,7 @@ def product_detail(product_id):
             # --- 販売価格の同期 ---
             # バリエーションの価格をProduct.selling_priceに反映
             # （商品一覧やカタログで表示される価格）
-            all_variants = session_db.query(Variant).filter_by(product_id=product.id).all()
+            all_variants = list(variants_by_id.values()) + new_variants
             if all_variants:
                 # 最初のバリエーションの価格を代表として使用
                 primary_variant = all_variants[0]
@@ -20,6 +20,7 @@ from services.media_queue import (
 from services.pricing_service import update_product_selling_price
 from services.product_service import save_scraped_items_to_db
 from services.queue_backend import get_queue_backend
+from services.scrape_job_store import SCRAPE_JOB_TERMINAL_STATUSES, find_active_job_id_for_request
 from services.scrape_request import (
     build_scrape_job_context,
     build_scrape_task_request,
@@ -56,6 +57,23 @@ def _build_scrape_task(site, target_url, keyword, price_min, price_max, sort, ca
     return lambda: execute_scrape_job(request_payload)
 
 
+def _find_reusable_job_id(queue, task_request, user_id):
+    """
+    Return the id of an identical scrape this user already has in flight.
+
+    Double submits and back-to-back resubmits then poll the existing job
+    instead of scraping the same pages twice.
+    """
+    job_id = find_active_job_id_for_request(user_id, task_request)
+    if not job_id:
+        return None
+    # get_status runs the stall/orphan checks, so a dead job is not reused.
+    status = queue.get_status(job_id, user_id=user_id) or {}
+    if not status or status.get("status") in SCRAPE_JOB_TERMINAL_STATUSES:
+        return None
+    return job_id
+
+
 @scrape_bp.route("/scrape", methods=["GET", "POST"])
 @login_required
 def scrape_form():
@@ -141,14 +159,16 @@ def scrape_run():
     )
 
     queue = get_queue()
-    job_id = queue.enqueue(
-        site=site,
-        task_fn=task_fn,
-        user_id=current_user.id,
-        context=job_context,
-        request_payload=task_request,
-        mode="preview" if preview_mode else "persist",
-    )
+    job_id = _find_reusable_job_id(queue, task_request, current_user.id)
+    if job_id is None:
+        job_id = queue.enqueue(
+            site=site,
+            task_fn=task_fn,
+            user_id=current_user.id,
+            context=job_context,
+            request_payload=task_request,
+            mode="preview" if preview_mode else "persist",
+        )
 
     if preview_mode:
         return jsonify(
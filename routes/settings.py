@@ -3,6 +3,7 @@ Settings routes - Exclusion keyword management.
 """
 from flask import Blueprint, flash, redirect, render_template, request, session, url_for
 from flask_login import login_required, current_user
+from sqlalchemy.exc import IntegrityError
 from database import SessionLocal
 from models import ExclusionKeyword, PricingRule, Shop, User
 
@@ -49,25 +50,20 @@ def add_keyword():
             flash('言葉を入力してください。', 'error')
             return redirect(url_for('settings.settings_list'))
         
-        # Check for duplicate
-        existing = session_db.query(ExclusionKeyword).filter_by(
-            user_id=current_user.id, 
-            keyword=keyword
-        ).first()
-        
-        if existing:
-            flash('同じ言葉が登録されています。', 'error')
-            return redirect(url_for('settings.settings_list'))
-        
         new_keyword = ExclusionKeyword(
             user_id=current_user.id,
             keyword=keyword,
             match_type=match_type
         )
         session_db.add(new_keyword)
+        # uq_exclusion_keywords_user_keyword rejects duplicates in the same INSERT.
         session_db.commit()
         flash('追加しました。', 'success')
         return redirect(url_for('settings.settings_list'))
+    except IntegrityError:
+        session_db.rollback()
+        flash('同じ言葉が登録されています。', 'error')
+        return redirect(url_for('settings.settings_list'))
     except Exception:
         session_db.rollback()
         flash('保存できませんでした。', 'error')
@@ -6,7 +6,7 @@ import uuid
 
 from flask import Blueprint, render_template, request, redirect, url_for, session
 from flask_login import login_required, current_user
-from sqlalchemy import or_
+from sqlalchemy import func, or_
 from werkzeug.utils import secure_filename
 
 from database import SessionLocal
@@ -27,10 +27,25 @@ def _logo_upload_dir():
     return path
 
 
+def _shop_exists(session_db, *criteria) -> bool:
+    """EXISTS check for the current user's shops; no row is loaded."""
+    return session_db.query(
+        session_db.query(Shop).filter(Shop.user_id == current_user.id, *criteria).exists()
+    ).scalar()
+
+
 def _build_manage_shops_context(session_db, error=None, edit_error_shop_id=None):
     shops = session_db.query(Shop).filter_by(user_id=current_user.id).all()
+    product_counts = {}
+    if shops:
+        product_counts = dict(
+            session_db.query(Product.shop_id, func.count(Product.id))
+            .filter(Product.shop_id.in_([shop.id for shop in shops]))
+            .group_by(Product.shop_id)
+            .all()
+        )
     for shop in shops:
-        shop.product_count = session_db.query(Product).filter_by(shop_id=shop.id).count()
+        shop.product_count = product_counts.get(shop.id, 0)
 
     current_shop_id = session.get('current_shop_id')
     return {
@@ -111,8 +126,7 @@ def manage_shops():
             if not name:
                 return _render_manage_shops(session_db, error="ショップ名を入力してください")
 
-            existing = session_db.query(Shop).filter_by(user_id=current_user.id, name=name).first()
-            if existing:
+            if _shop_exists(session_db, Shop.name == name):
                 return _render_manage_shops(session_db, error="同じショップ名が既に登録されています")
 
             uploaded_logo_url, upload_error = _save_uploaded_logo(logo_file)
@@ -148,11 +162,11 @@ def delete_shop(shop_id):
             logo_url_to_remove = shop.logo_url
             has_shared_logo = False
             if logo_url_to_remove:
-                has_shared_logo = session_db.query(Shop).filter(
-                    Shop.user_id == current_user.id,
+                has_shared_logo = _shop_exists(
+                    session_db,
                     Shop.logo_url == logo_url_to_remove,
                     Shop.id != shop.id,
-                ).count() > 0
+                )
             products = session_db.query(Product).filter_by(shop_id=shop_id).all()
             for p in products:
                 p.shop_id = None
@@ -188,12 +202,7 @@ def edit_shop(shop_id):
                     edit_error_shop_id=shop.id,
                 )
 
-            duplicate = session_db.query(Shop).filter(
-                Shop.user_id == current_user.id,
-                Shop.name == name,
-                Shop.id != shop.id,
-            ).first()
-            if duplicate:
+            if _shop_exists(session_db, Shop.name == name, Shop.id != shop.id):
                 return _render_manage_shops(
                     session_db,
                     error="同じショップ名が既に登録されています",
@@ -213,11 +222,11 @@ def edit_shop(shop_id):
             remove_previous_logo = (
                 previous_logo_url
                 and previous_logo_url != next_logo_url
-                and session_db.query(Shop).filter(
-                    Shop.user_id == current_user.id,
+                and not _shop_exists(
+                    session_db,
                     Shop.logo_url == previous_logo_url,
                     Shop.id != shop.id,
-                ).count() == 0
+                )
             )
 
             shop.name = name
@@ -253,8 +262,7 @@ def set_current_shop():
     if shop_id:
         session_db = SessionLocal()
         try:
-            shop = session_db.query(Shop).filter_by(id=shop_id, user_id=current_user.id).first()
-            if shop:
+            if shop_id.isdigit() and _shop_exists(session_db, Shop.id == int(shop_id)):
                 session['current_shop_id'] = int(shop_id)
         except Exception:
             session_db.rollback()
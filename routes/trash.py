@@ -4,6 +4,7 @@ Trash routes - Soft delete with recovery and purge.
 from datetime import timedelta
 from flask import Blueprint, render_template, request, redirect, url_for, flash
 from flask_login import login_required, current_user
+from sqlalchemy import delete, select, update
 from database import SessionLocal
 from models import Product, Variant, ProductSnapshot
 from time_utils import utc_now
@@ -11,6 +12,25 @@ from time_utils import utc_now
 trash_bp = Blueprint('trash', __name__)
 
 
+def _selected_product_ids(raw_ids):
+    return {int(raw_id) for raw_id in raw_ids if str(raw_id).isdigit()}
+
+
+def _purge_products(session_db, product_ids) -> int:
+    """Hard-delete products and their variants/snapshots with one statement per table."""
+    product_ids = list(product_ids)
+    if not product_ids:
+        return 0
+    session_db.execute(delete(Variant).where(Variant.product_id.in_(product_ids)))
+    session_db.execute(delete(ProductSnapshot).where(ProductSnapshot.product_id.in_(product_ids)))
+    result = session_db.execute(
+        delete(Product)
+        .where(Product.id.in_(product_ids))
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount
+
+
 @trash_bp.route('/trash')
 @login_required
 def trash_list():
@@ -47,15 +67,16 @@ def trash_delete():
             flash('商品を選択してください', 'warning')
             return redirect(request.referrer or url_for('main.index'))
         
-        count = 0
-        for product_id in ids:
-            product = session_db.query(Product).filter(
-                Product.id == int(product_id),
-                Product.user_id == current_user.id
-            ).first()
-            if product:
-                product.deleted_at = utc_now()
-                count += 1
+        result = session_db.execute(
+            update(Product)
+            .where(
+                Product.id.in_(_selected_product_ids(ids)),
+                Product.user_id == current_user.id,
+            )
+            .values(deleted_at=utc_now())
+            .execution_options(synchronize_session=False)
+        )
+        count = result.rowcount
         
         session_db.commit()
         flash(f'{count}件をゴミ箱に移動しました', 'success')
@@ -78,16 +99,17 @@ def trash_restore():
             flash('商品を選択してください', 'warning')
             return redirect(url_for('trash.trash_list'))
         
-        count = 0
-        for product_id in ids:
-            product = session_db.query(Product).filter(
-                Product.id == int(product_id),
+        result = session_db.execute(
+            update(Product)
+            .where(
+                Product.id.in_(_selected_product_ids(ids)),
                 Product.user_id == current_user.id,
                 Product.deleted_at != None
-            ).first()
-            if product:
-                product.deleted_at = None
-                count += 1
+            )
+            .values(deleted_at=None)
+            .execution_options(synchronize_session=False)
+        )
+        count = result.rowcount
         
         session_db.commit()
         flash(f'{count}件を復元しました', 'success')
@@ -110,19 +132,14 @@ def trash_purge():
             flash('商品を選択してください', 'warning')
             return redirect(url_for('trash.trash_list'))
         
-        count = 0
-        for product_id in ids:
-            product = session_db.query(Product).filter(
-                Product.id == int(product_id),
+        purge_ids = session_db.execute(
+            select(Product.id).where(
+                Product.id.in_(_selected_product_ids(ids)),
                 Product.user_id == current_user.id,
                 Product.deleted_at != None
-            ).first()
-            if product:
-                # Delete related data
-                session_db.query(Variant).filter_by(product_id=product.id).delete()
-                session_db.query(ProductSnapshot).filter_by(product_id=product.id).delete()
-                session_db.delete(product)
-                count += 1
+            )
+        ).scalars().all()
+        count = _purge_products(session_db, purge_ids)
         
         session_db.commit()
         flash(f'{count}件を完全に削除しました', 'success')
@@ -139,17 +156,13 @@ def purge_old_trash():
     session_db = SessionLocal()
     try:
         cutoff = utc_now() - timedelta(days=30)
-        old_items = session_db.query(Product).filter(
-            Product.deleted_at != None,
-            Product.deleted_at < cutoff
-        ).all()
-        
-        count = 0
-        for product in old_items:
-            session_db.query(Variant).filter_by(product_id=product.id).delete()
-            session_db.query(ProductSnapshot).filter_by(product_id=product.id).delete()
-            session_db.delete(product)
-            count += 1
+        old_ids = session_db.execute(
+            select(Product.id).where(
+                Product.deleted_at != None,
+                Product.deleted_at < cutoff
+            )
+        ).scalars().all()
+        count = _purge_products(session_db, old_ids)
         
         session_db.commit()
         return count
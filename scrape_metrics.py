@@ -2,23 +2,66 @@
 Scraping metrics and logging utilities.
 Provides centralized logging and metrics collection for scraping operations.
 """
+import atexit
 import logging
+import logging.handlers
+import queue
+import threading
 import time
 from datetime import datetime
 from functools import wraps
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any
 
 # Configure scraping-specific logger
 scrape_logger = logging.getLogger('scraping')
 scrape_logger.setLevel(logging.DEBUG)
 
-# Create handler if not already present
+_log_queue = queue.SimpleQueue()
+_log_listener = None
+_log_listener_lock = threading.Lock()
+
+
+def _start_log_listener() -> None:
+    """Start the thread that writes queued scrape records to stderr (once)."""
+    global _log_listener
+    with _log_listener_lock:
+        if _log_listener is not None:
+            return
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter(
+            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+        ))
+        _log_listener = logging.handlers.QueueListener(_log_queue, handler)
+        _log_listener.start()
+
+
+def _stop_log_listener() -> None:
+    """Flush queued scrape records and stop the listener thread, if running."""
+    global _log_listener
+    with _log_listener_lock:
+        listener, _log_listener = _log_listener, None
+    if listener is not None:
+        listener.stop()
+
+
+class _LazyQueueHandler(logging.handlers.QueueHandler):
+    """Queue records for the listener thread, starting it on first use."""
+
+    def emit(self, record):
+        if _log_listener is None:
+            _start_log_listener()
+        super().emit(record)
+
+
+# Scrape threads only enqueue records; the stderr write happens on the
+# listener thread.
 if not scrape_logger.handlers:
-    handler = logging.StreamHandler()
-    handler.setFormatter(logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-    ))
-    scrape_logger.addHandler(handler)
+    scrape_logger.addHandler(_LazyQueueHandler(_log_queue))
+atexit.register(_stop_log_listener)
+
+
+# Only the first few failures are reported, so only those are kept.
+MAX_RECORDED_ERRORS = 5
 
 
 class ScrapeMetrics:
@@ -44,18 +87,20 @@ class ScrapeMetrics:
         self.site = site
         self.scrape_type = scrape_type
         self.start_time = time.time()
-        scrape_logger.info(f"[{site}] Starting {scrape_type} scrape session")
+        scrape_logger.info("[%s] Starting %s scrape session", site, scrape_type)
     
     def record_attempt(self, success: bool, url: str = "", error: str = ""):
         """Record a single scrape attempt."""
         self.total_attempts += 1
         if success:
             self.successful += 1
-            scrape_logger.debug(f"[{self.site}] Success: {url[:50]}...")
+            if scrape_logger.isEnabledFor(logging.DEBUG):
+                scrape_logger.debug("[%s] Success: %s...", self.site, url[:50])
         else:
             self.failed += 1
-            self.errors.append(f"{url}: {error}")
-            scrape_logger.warning(f"[{self.site}] Failed: {url} - {error}")
+            if len(self.errors) < MAX_RECORDED_ERRORS:
+                self.errors.append(f"{url}: {error}")
+            scrape_logger.warning("[%s] Failed: %s - %s", self.site, url, error)
     
     def finish(self) -> Dict[str, Any]:
         """Finish session and return summary."""
@@ -72,34 +117,36 @@ class ScrapeMetrics:
             "successful": self.successful,
             "failed": self.failed,
             "success_rate": round(success_rate, 1),
-            "errors": self.errors[:5]  # Keep only first 5 errors
+            "errors": list(self.errors)
         }
         
         # Log summary
         if success_rate < 50 and self.total_attempts > 0:
             scrape_logger.error(
-                f"[{self.site}] LOW SUCCESS RATE: {success_rate}% "
-                f"({self.successful}/{self.total_attempts}) in {duration:.1f}s"
+                "[%s] LOW SUCCESS RATE: %s%% (%s/%s) in %.1fs",
+                self.site, success_rate, self.successful, self.total_attempts, duration,
             )
         else:
             scrape_logger.info(
-                f"[{self.site}] Completed: {self.successful}/{self.total_attempts} "
-                f"({success_rate}%) in {duration:.1f}s"
+                "[%s] Completed: %s/%s (%s%%) in %.1fs",
+                self.site, self.successful, self.total_attempts, success_rate, duration,
             )
         
         return summary
 
 
-# Global metrics instance for simple use cases
-_current_metrics: Optional[ScrapeMetrics] = None
+# One metrics instance per thread: scrape jobs run on queue worker threads,
+# and a shared instance would let one job's start() reset another's counters.
+_thread_metrics = threading.local()
 
 
 def get_metrics() -> ScrapeMetrics:
-    """Get or create the current metrics instance."""
-    global _current_metrics
-    if _current_metrics is None:
-        _current_metrics = ScrapeMetrics()
-    return _current_metrics
+    """Get or create the calling thread's metrics instance."""
+    metrics = getattr(_thread_metrics, "metrics", None)
+    if metrics is None:
+        metrics = ScrapeMetrics()
+        _thread_metrics.metrics = metrics
+    return metrics
 
 
 def log_scrape_result(site: str, url: str, data: Dict[str, Any]) -> bool:
@@ -122,7 +169,7 @@ def log_scrape_result(site: str, url: str, data: Dict[str, Any]) -> bool:
     
     if success:
         metrics.record_attempt(True, url)
-        scrape_logger.info(f"[{site}] Scraped: {data.get('title', 'N/A')[:50]}")
+        scrape_logger.info("[%s] Scraped: %s", site, (data.get('title') or 'N/A')[:50])
     else:
         error = "No title found"
         if data.get('status') == 'error':
@@ -149,10 +196,15 @@ def check_scrape_health(items: List[Dict]) -> Dict[str, Any]:
             "action_required": True
         }
     
-    # Check for missing fields
-    missing_titles = sum(1 for i in items if not i.get('title'))
-    missing_prices = sum(1 for i in items if i.get('price') is None)
-    missing_images = sum(1 for i in items if not i.get('image_urls'))
+    # Check for missing fields (single pass over the batch)
+    missing_titles = missing_prices = missing_images = 0
+    for item in items:
+        if not item.get('title'):
+            missing_titles += 1
+        if item.get('price') is None:
+            missing_prices += 1
+        if not item.get('image_urls'):
+            missing_images += 1
     
     total = len(items)
     issues = []
@@ -165,7 +217,7 @@ def check_scrape_health(items: List[Dict]) -> Dict[str, Any]:
         issues.append(f"Image extraction failing ({missing_images}/{total})")
     
     if issues:
-        scrape_logger.warning(f"Scrape health issues detected: {', '.join(issues)}")
+        scrape_logger.warning("Scrape health issues detected: %s", ", ".join(issues))
         return {
             "status": "degraded",
             "message": "; ".join(issues),
@@ -95,15 +95,77 @@ def _get_max_runtime_seconds(site: str) -> float:
         return 0.0
 
 
+_IMAGES_DISABLED_ARG = "--blink-settings=imagesEnabled=false"
+
+
+def _browser_images_disabled(site: str) -> bool:
+    site_specific = os.environ.get(_site_env_name(site, "BROWSER_DISABLE_IMAGES"))
+    if site_specific is not None:
+        return _env_flag(_site_env_name(site, "BROWSER_DISABLE_IMAGES"), default=True)
+    return _env_flag("BROWSER_DISABLE_IMAGES", default=True)
+
+
+def _apply_image_switch(site: str, launch_args: list[str] | tuple[str, ...]) -> tuple[str, ...]:
+    """Turn image loading off at browser launch unless the caller already set blink settings.
+
+    Unlike request interception this keeps the HTTP cache and costs nothing
+    per request; ``<img src>`` attributes stay in the DOM.
+    """
+    args = tuple(launch_args)
+    if not _browser_images_disabled(site) or any(arg.startswith("--blink-settings") for arg in args):
+        return args
+    return args + (_IMAGES_DISABLED_ARG,)
+
+
+def _resolve_blocked_resource_types(
+    site: str,
+    blocked_resource_types: list[str] | tuple[str, ...] | None = None,
+) -> tuple[str, ...]:
+    """Resource types to abort via request interception (opt-in).
+
+    Routing every request through a Python handler also turns off Playwright's
+    HTTP cache, so nothing is intercepted unless configured.
+    """
+    if blocked_resource_types is not None:
+        return tuple(blocked_resource_types)
+
+    env_raw = os.environ.get(_site_env_name(site, "BROWSER_BLOCK_RESOURCE_TYPES"))
+    if env_raw is None:
+        env_raw = os.environ.get("BROWSER_BLOCK_RESOURCE_TYPES")
+    if env_raw is not None:
+        return tuple(kind.strip().lower() for kind in str(env_raw).split(",") if kind.strip())
+
+    return ()
+
+
+async def _install_resource_blocking(context, blocked_resource_types: tuple[str, ...]) -> None:
+    """Abort requests for resource types the scrapers never render (images, fonts, ...).
+
+    ``<img src>`` attributes stay in the DOM, so image URLs are still collected.
+    """
+    if not blocked_resource_types:
+        return
+
+    blocked = frozenset(blocked_resource_types)
+
+    async def _handle_route(route):
+        if route.request.resource_type in blocked:
+            await route.abort()
+        else:
+            await route.continue_()
+
+    await context.route("**/*", _handle_route)
+
+
 def _resolve_launch_args(site: str, launch_args: list[str] | tuple[str, ...] | None = None) -> tuple[str, ...]:
     if launch_args:
-        return tuple(launch_args)
+        return _apply_image_switch(site, launch_args)
 
     env_raw = os.environ.get(_site_env_name(site, "BROWSER_POOL_ARGS")) or os.environ.get("BROWSER_POOL_ARGS")
     if env_raw:
-        return tuple(arg.strip() for arg in str(env_raw).split(",") if arg.strip())
+        return _apply_image_switch(site, [arg.strip() for arg in str(env_raw).split(",") if arg.strip()])
 
-    return _DEFAULT_LAUNCH_ARGS
+    return _apply_image_switch(site, _DEFAULT_LAUNCH_ARGS)
 
 
 def get_browser_runtime(
@@ -184,9 +246,11 @@ async def _execute_page_task(
     *,
     context_options: dict[str, Any] | None = None,
     init_scripts: list[str] | tuple[str, ...] | None = None,
+    blocked_resource_types: tuple[str, ...] = (),
 ):
     context = await browser.new_context(**(context_options or {}))
     try:
+        await _install_resource_blocking(context, blocked_resource_types)
         page = await context.new_page()
         for script in init_scripts or ():
             await page.add_init_script(script)
@@ -202,6 +266,7 @@ async def _run_with_temporary_browser(
     headless: bool = True,
     context_options: dict[str, Any] | None = None,
     init_scripts: list[str] | tuple[str, ...] | None = None,
+    blocked_resource_types: tuple[str, ...] = (),
 ):
     async with async_playwright() as playwright:
         browser = await playwright.chromium.launch(
@@ -214,6 +279,7 @@ async def _run_with_temporary_browser(
                 task_coro_factory,
                 context_options=context_options,
                 init_scripts=init_scripts,
+                blocked_resource_types=blocked_resource_types,
             )
         finally:
             await browser.close()
@@ -227,15 +293,18 @@ async def run_browser_page_task(
     headless: bool = True,
     context_options: dict[str, Any] | None = None,
     init_scripts: list[str] | tuple[str, ...] | None = None,
+    blocked_resource_types: list[str] | tuple[str, ...] | None = None,
 ):
+    resolved_blocked_types = _resolve_blocked_resource_types(site, blocked_resource_types)
     runtime = get_browser_runtime(site, launch_args=launch_args, headless=headless)
     if runtime is None:
         return await _run_with_temporary_browser(
             task_coro_factory,
-            launch_args=launch_args,
+            launch_args=_apply_image_switch(site, launch_args or _DEFAULT_LAUNCH_ARGS),
             headless=headless,
             context_options=context_options,
             init_scripts=init_scripts,
+            blocked_resource_types=resolved_blocked_types,
         )
 
     future = runtime.submit(
@@ -244,6 +313,7 @@ async def run_browser_page_task(
             task_coro_factory,
             context_options=context_options,
             init_scripts=init_scripts,
+            blocked_resource_types=resolved_blocked_types,
         )
     )
     return await asyncio.wrap_future(future)
@@ -5,6 +5,9 @@ Filters out unwanted products based on user-defined exclusion keywords
 and numeric price ranges.
 """
 import logging
+import re
+from functools import lru_cache
+
 from database import SessionLocal
 from models import ExclusionKeyword
 
@@ -57,8 +60,8 @@ def get_user_exclusion_keywords(user_id: int) -> list:
     """
     session = SessionLocal()
     try:
-        keywords = session.query(ExclusionKeyword).filter_by(user_id=user_id).all()
-        return [(k.keyword.lower(), k.match_type) for k in keywords]
+        keywords = session.query(ExclusionKeyword.keyword, ExclusionKeyword.match_type).filter_by(user_id=user_id).all()
+        return [(keyword.lower(), match_type) for keyword, match_type in keywords]
     finally:
         session.close()
 
@@ -92,6 +95,39 @@ def is_excluded(title: str, keywords: list) -> bool:
     return False
 
 
+def compile_exclusion_matcher(keywords: list):
+    """
+    Build a title predicate equivalent to ``is_excluded(title, keywords)``.
+
+    Exact keywords become a set lookup and partial keywords one regex
+    alternation, so each title is scanned once instead of once per keyword.
+    Matchers are cached by keyword set, so repeated batches for a user whose
+    keywords have not changed reuse the compiled pattern.
+    """
+    return _compile_exclusion_matcher(frozenset(keywords))
+
+
+@lru_cache(maxsize=256)
+def _compile_exclusion_matcher(keywords: frozenset):
+    exact_keywords = frozenset(keyword for keyword, match_type in keywords if match_type == "exact")
+    partial_keywords = sorted(keyword for keyword, match_type in keywords if match_type != "exact")
+    partial_pattern = (
+        re.compile("|".join(re.escape(keyword) for keyword in partial_keywords))
+        if partial_keywords
+        else None
+    )
+
+    def matches(title: str) -> bool:
+        if not title:
+            return False
+        title_lower = title.lower()
+        if title_lower in exact_keywords:
+            return True
+        return partial_pattern is not None and partial_pattern.search(title_lower) is not None
+
+    return matches
+
+
 def filter_excluded_items(items: list, user_id: int) -> tuple:
     """
     Filter out items that match user's exclusion keywords.
@@ -110,12 +146,13 @@ def filter_excluded_items(items: list, user_id: int) -> tuple:
     if not keywords:
         return items, 0
     
+    is_excluded_title = compile_exclusion_matcher(keywords)
     filtered = []
     excluded_count = 0
     
     for item in items:
         title = item.get("title", "")
-        if is_excluded(title, keywords):
+        if is_excluded_title(title):
             logger.info(f"Excluded: {title[:50]}...")
             excluded_count += 1
         else:
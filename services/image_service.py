@@ -10,6 +10,7 @@ from urllib.parse import urlparse
 
 import requests
 from PIL import Image, UnidentifiedImageError
+from requests.adapters import HTTPAdapter
 
 logger = logging.getLogger("services.image_service")
 
@@ -28,6 +29,13 @@ ALLOWED_IMAGE_CONTENT_TYPES = {
 
 Image.MAX_IMAGE_PIXELS = MAX_IMAGE_PIXELS
 
+# Shared keep-alive pool for image downloads; exports fetch many images from
+# the same CDN hosts, often from several threads at once.
+_HTTP_SESSION = requests.Session()
+_HTTP_ADAPTER = HTTPAdapter(pool_connections=16, pool_maxsize=32)
+_HTTP_SESSION.mount("https://", _HTTP_ADAPTER)
+_HTTP_SESSION.mount("http://", _HTTP_ADAPTER)
+
 
 class ImageValidationError(ValueError):
     """Raised when an image is missing, too large, or not a supported image."""
@@ -109,7 +117,7 @@ def validate_image_bytes(data: bytes, content_type: str | None = None) -> tuple[
 def download_external_image(url: str, headers: dict | None = None) -> tuple[bytes, str]:
     validate_image_url(url)
     request_headers = headers or {}
-    with requests.get(url, headers=request_headers, stream=True, timeout=(3.05, 10)) as resp:
+    with _HTTP_SESSION.get(url, headers=request_headers, stream=True, timeout=(3.05, 10)) as resp:
         resp.raise_for_status()
         content_type = resp.headers.get("Content-Type", "")
         _content_type_ext(content_type)
@@ -133,13 +141,31 @@ def download_external_image(url: str, headers: dict | None = None) -> tuple[byte
     return data, ext
 
 
+def find_cached_image(product_id, index):
+    """Return the filename of an image already cached for this product/index, or None."""
+    for cached_ext in dict.fromkeys(ALLOWED_IMAGE_CONTENT_TYPES.values()):
+        cached_filename = f"mercari_{product_id}_{index}{cached_ext}"
+        if os.path.exists(os.path.join(IMAGE_STORAGE_PATH, cached_filename)):
+            return cached_filename
+    return None
+
+
 def cache_mercari_image(mercari_url, product_id, index):
     """
     Download and cache a Mercari image locally.
     Returns the local filename if successful, None otherwise.
+
+    A file already cached for this product/index is returned without
+    re-downloading, so it is still served after the source URL goes dead and
+    is not replaced if the source image changes format.
     """
     if not mercari_url:
         return None
+    # Files are keyed by product/index, and an existing file always wins, so
+    # skip the download entirely when any cached variant is already on disk.
+    cached_filename = find_cached_image(product_id, index)
+    if cached_filename:
+        return cached_filename
     try:
         headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
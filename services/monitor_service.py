@@ -6,10 +6,12 @@ Non-Mercari sites use HTTP-only fetching (Scrapling) to avoid launching Chrome.
 import logging
 from datetime import timedelta
 from sqlalchemy import asc, func, or_
+from sqlalchemy.orm import selectinload
 from database import create_isolated_session
-from models import Product, Variant
+from models import Product
 from services.pricing_service import product_has_pricing_config, update_product_selling_price
 from services.scrape_result_policy import normalize_status_for_persistence
+from services.scraping_client import reset_thread_static_session
 from time_utils import utc_now
 from utils import is_valid_detail_url
 
@@ -84,8 +86,10 @@ class MonitorService:
         # Use an isolated session: helpers invoked during a patrol cycle
         # (selector repair store, pricing, alerts) close the thread-scoped
         # SessionLocal, which would detach every product mid-loop and make
-        # all patrol commits silent no-ops.
-        session_db = create_isolated_session()
+        # all patrol commits silent no-ops. Products are committed one at a
+        # time, so keep loaded state across commits instead of re-selecting
+        # each product and its variants after every commit.
+        session_db = create_isolated_session(expire_on_commit=False)
         driver = None
         summary = {
             "status": "started",
@@ -101,7 +105,9 @@ class MonitorService:
             # product-list updated_at sort.
             now = utc_now()
             patrol_cursor = func.coalesce(Product.last_patrolled_at, Product.updated_at, Product.created_at)
-            products = session_db.query(Product).filter(
+            products = session_db.query(Product).options(
+                selectinload(Product.variants)
+            ).filter(
                 Product.site.in_(list(MonitorService._patrols.keys())),
                 Product.archived != True,
                 Product.is_listed.isnot(False),
@@ -248,6 +254,7 @@ class MonitorService:
             return summary
         finally:
             session_db.close()
+            reset_thread_static_session()
             logger.info("--- Patrol Finished ---")
     
     @staticmethod
@@ -273,9 +280,7 @@ class MonitorService:
             product.last_status = normalized_status
             changes += 1
         
-        existing_variants = session_db.query(Variant).filter_by(
-            product_id=product.id
-        ).all()
+        existing_variants = product.variants
 
         if normalized_status in {"sold", "deleted"}:
             for existing in existing_variants:
@@ -6,6 +6,8 @@ import logging
 import os
 
 from flask import has_request_context, session
+from sqlalchemy import insert, or_
+from sqlalchemy.orm import selectinload
 
 from database import SessionLocal
 from models import Product, ProductSnapshot, Variant
@@ -109,27 +111,39 @@ def _normalize_scraped_variants(raw_variants, *, fallback_price, status: str):
     return normalized_variants
 
 
-def _find_product_for_source(session_db, *, url: str, user_id: int, shop_id):
-    base_query = session_db.query(Product).filter_by(source_url=url, user_id=user_id)
-
-    if shop_id is None:
-        return base_query.filter(Product.shop_id.is_(None)).order_by(Product.id.asc()).first()
+def _load_products_for_sources(session_db, *, urls, user_id: int, shop_id) -> dict:
+    """
+    Return ``{source_url: Product}`` for every URL that already has a product,
+    with its variants loaded, in one query.
 
-    scoped_product = (
-        base_query
-        .filter(Product.shop_id == shop_id)
+    A product in ``shop_id`` wins over an unassigned (``shop_id IS NULL``)
+    one; within each group the oldest product wins.
+    """
+    if not urls:
+        return {}
+
+    shop_filter = Product.shop_id.is_(None)
+    if shop_id is not None:
+        shop_filter = or_(Product.shop_id == shop_id, shop_filter)
+
+    candidates = (
+        session_db.query(Product)
+        .options(selectinload(Product.variants))
+        .filter(
+            Product.user_id == user_id,
+            Product.source_url.in_(urls),
+            shop_filter,
+        )
         .order_by(Product.id.asc())
-        .first()
+        .all()
     )
-    if scoped_product is not None:
-        return scoped_product
 
-    return (
-        base_query
-        .filter(Product.shop_id.is_(None))
-        .order_by(Product.id.asc())
-        .first()
-    )
+    products_by_url = {}
+    for candidate in candidates:
+        current = products_by_url.get(candidate.source_url)
+        if current is None or (current.shop_id is None and candidate.shop_id is not None):
+            products_by_url[candidate.source_url] = candidate
+    return products_by_url
 
 
 def _cache_external_images(
@@ -159,6 +173,12 @@ def _cache_external_images(
     return result
 
 
+def _bulk_insert_snapshots(session_db, rows: list[dict]) -> None:
+    """Insert all snapshot rows for a batch in one executemany round-trip."""
+    if rows:
+        session_db.execute(insert(ProductSnapshot), rows)
+
+
 def save_scraped_items_to_db(
     items,
     user_id: int,
@@ -186,12 +206,20 @@ def save_scraped_items_to_db(
     now = utc_now()
     repricing_product_ids = set()
     saved_product_ids: list[int] = []
+    snapshot_rows: list[dict] = []
 
     resolved_shop_id = shop_id
     if resolved_shop_id is None and has_request_context():
         resolved_shop_id = session.get('current_shop_id')
 
     try:
+        products_by_url = _load_products_for_sources(
+            session_db,
+            urls={normalize_url(item["url"]) for item in items if item.get("url")},
+            user_id=user_id,
+            shop_id=resolved_shop_id,
+        )
+
         for item in items:
             raw_url = item.get("url", "")
             if not raw_url:
@@ -209,12 +237,7 @@ def save_scraped_items_to_db(
             image_urls = _normalize_image_urls(normalized_item.get("image_urls"))
             image_urls_str = "|".join(image_urls)
 
-            product = _find_product_for_source(
-                session_db,
-                url=url,
-                user_id=user_id,
-                shop_id=resolved_shop_id,
-            )
+            product = products_by_url.get(url)
             persistence_action = evaluate_persistence(
                 site,
                 normalized_item,
@@ -248,6 +271,7 @@ def save_scraped_items_to_db(
                 )
                 session_db.add(product)
                 session_db.flush()
+                products_by_url[url] = product
                 new_count += 1
                 processed_count += 1
 
@@ -307,7 +331,7 @@ def save_scraped_items_to_db(
                     status_changed = bool(status) and product.last_status != status
                     product.last_status = status or product.last_status
                     product.updated_at = now
-                    existing_variants = session_db.query(Variant).filter_by(product_id=product.id).all()
+                    existing_variants = list(product.variants)
                     if status in {"sold", "deleted"}:
                         for existing_variant in existing_variants:
                             existing_variant.inventory_qty = 0
@@ -334,7 +358,7 @@ def save_scraped_items_to_db(
                 if price_changed and product_has_pricing_config(product):
                     repricing_product_ids.add(product.id)
 
-                existing_variants = session_db.query(Variant).filter_by(product_id=product.id).all()
+                existing_variants = list(product.variants)
                 for existing_variant in existing_variants:
                     if price is not None and (existing_variant.option1_value == "Default Title" or len(existing_variants) == 1):
                         existing_variant.price = price
@@ -350,17 +374,20 @@ def save_scraped_items_to_db(
             cached_image_urls = _cache_external_images(
                 image_urls, product.id
             )
-            snapshot = ProductSnapshot(
-                product_id=product.id,
-                scraped_at=now,
-                title=title,
-                price=price,
-                status=status,
-                description=description,
-                image_urls="|".join(cached_image_urls),
+            snapshot_rows.append(
+                {
+                    "product_id": product.id,
+                    "scraped_at": now,
+                    "title": title,
+                    "price": price,
+                    "status": status,
+                    "description": description,
+                    "image_urls": "|".join(cached_image_urls),
+                }
             )
-            session_db.add(snapshot)
 
+        session_db.flush()
+        _bulk_insert_snapshots(session_db, snapshot_rows)
         session_db.commit()
 
         for product_id in repricing_product_ids:
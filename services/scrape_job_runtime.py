@@ -13,6 +13,7 @@ from services.scrape_job_store import (
     mark_job_heartbeat,
     mark_job_running,
 )
+from services.scraping_client import reset_thread_static_session
 
 
 def _get_heartbeat_interval_seconds() -> float:
@@ -52,6 +53,8 @@ def run_tracked_job(job_id: str, task_fn: Callable[..., Any], *task_args, **task
     finally:
         stop_event.set()
         heartbeat_thread.join(timeout=1.0)
+        # Worker threads are reused; do not carry this job's cookies into the next one.
+        reset_thread_static_session()
 
     mark_job_completed(job_id, result)
     return result
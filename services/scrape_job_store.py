@@ -450,6 +450,28 @@ def list_job_records_for_user(
         session.close()
 
 
+def find_active_job_id_for_request(user_id: int, request_payload: dict[str, Any]) -> Optional[str]:
+    """Return the newest queued/running job this user submitted with an identical request payload."""
+    session = SessionLocal()
+    try:
+        record = (
+            session.query(ScrapeJob.job_id)
+            .filter(
+                ScrapeJob.requested_by == user_id,
+                ScrapeJob.request_payload == _json_dumps(request_payload),
+                ~ScrapeJob.status.in_(tuple(SCRAPE_JOB_TERMINAL_STATUSES)),
+            )
+            .order_by(ScrapeJob.created_at.desc())
+            .first()
+        )
+        return record.job_id if record is not None else None
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+
 def list_dismissed_job_ids_for_user(user_id: int, limit: int = 100) -> set[str]:
     safe_limit = max(1, int(limit or 100))
     session = SessionLocal()
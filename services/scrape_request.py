@@ -41,12 +41,52 @@ SEARCH_DEPTH_RULES = {
 }
 
 
-def detect_site_from_url(url: str) -> str:
-    """Infer the scrape site from a target URL."""
+SEARCH_BASE_URLS = {
+    "mercari": "https://jp.mercari.com/search?",
+    "yahoo": "https://shopping.yahoo.co.jp/search?",
+    "rakuma": "https://fril.jp/s?",
+    "surugaya": "https://www.suruga-ya.jp/search?",
+    "offmall": "https://netmall.hardoff.co.jp/search/?",
+    "yahuoku": "https://auctions.yahoo.co.jp/search/search?",
+    "snkrdunk": "https://snkrdunk.com/search?",
+}
+
+# Sites whose search URL is just (keyword, min price, max price) params.
+_SIMPLE_SEARCH_PARAMS = {
+    "yahoo": ("p", "pf", "pt"),
+    "rakuma": ("query", "min", "max"),
+    "offmall": ("q", "min", "max"),
+    "snkrdunk": ("keywords", "minPrice", "maxPrice"),
+}
+
+
+def _parse_target_url(url: str):
+    raw = (url or "").strip()
+    if not raw:
+        return None
+    try:
+        parsed = urlparse(raw)
+        if not parsed.hostname:
+            # Scheme-less pastes such as "jp.mercari.com/item/..."
+            parsed = urlparse(f"//{raw}")
+    except ValueError:
+        return None
+    return parsed
+
+
+def _site_for_host(host: str) -> str | None:
     for domain, site in DOMAIN_SITE_MAP:
-        if domain in url:
+        if host == domain or host.endswith(f".{domain}"):
             return site
-    return "mercari"
+    return None
+
+
+def detect_site_from_url(url: str) -> str:
+    """Infer the scrape site from a target URL's hostname."""
+    parsed = _parse_target_url(url)
+    if parsed is None:
+        return "mercari"
+    return _site_for_host((parsed.hostname or "").lower()) or "mercari"
 
 
 # Per-site predicates that decide whether a pasted URL points at a single
@@ -73,21 +113,13 @@ def classify_target_url(url: str) -> tuple[str, str]:
     listing pages). Unknown domains fall back to ("item", "mercari") to
     preserve the legacy single-item behaviour.
     """
-    raw = (url or "").strip()
-    if not raw:
-        return ("item", "mercari")
-    try:
-        parsed = urlparse(raw)
-    except ValueError:
+    parsed = _parse_target_url(url)
+    if parsed is None:
         return ("item", "mercari")
     host = (parsed.hostname or "").lower()
     path = parsed.path or "/"
 
-    site = None
-    for domain, mapped_site in DOMAIN_SITE_MAP:
-        if domain in raw:
-            site = mapped_site
-            break
+    site = _site_for_host(host)
     if site is None:
         return ("item", "mercari")
 
@@ -185,25 +217,17 @@ def build_search_url(
     sort = (sort or "").strip()
     category = (category or "").strip()
 
-    if site == "yahoo":
-        params = {}
-        if keyword:
-            params["p"] = keyword
-        if min_str:
-            params["pf"] = min_str
-        if max_str:
-            params["pt"] = max_str
-        return "https://shopping.yahoo.co.jp/search?" + urlencode(params)
-
-    if site == "rakuma":
+    simple_params = _SIMPLE_SEARCH_PARAMS.get(site)
+    if simple_params is not None:
+        keyword_param, min_param, max_param = simple_params
         params = {}
         if keyword:
-            params["query"] = keyword
+            params[keyword_param] = keyword
         if min_str:
-            params["min"] = min_str
+            params[min_param] = min_str
         if max_str:
-            params["max"] = max_str
-        return "https://fril.jp/s?" + urlencode(params)
+            params[max_param] = max_str
+        return SEARCH_BASE_URLS[site] + urlencode(params)
 
     if site == "surugaya":
         params = {}
@@ -212,17 +236,7 @@ def build_search_url(
             params["is_stock"] = "1"
         if min_str or max_str:
             params["price"] = f"[{min_str or 0},{max_str or '*'}]"
-        return "https://www.suruga-ya.jp/search?" + urlencode(params)
-
-    if site == "offmall":
-        params = {}
-        if keyword:
-            params["q"] = keyword
-        if min_str:
-            params["min"] = min_str
-        if max_str:
-            params["max"] = max_str
-        return "https://netmall.hardoff.co.jp/search/?" + urlencode(params)
+        return SEARCH_BASE_URLS["surugaya"] + urlencode(params)
 
     if site == "yahuoku":
         params = {}
@@ -233,17 +247,7 @@ def build_search_url(
             params["aucminprice"] = min_str
         if max_str:
             params["aucmaxprice"] = max_str
-        return "https://auctions.yahoo.co.jp/search/search?" + urlencode(params)
-
-    if site == "snkrdunk":
-        params = {}
-        if keyword:
-            params["keywords"] = keyword
-        if min_str:
-            params["minPrice"] = min_str
-        if max_str:
-            params["maxPrice"] = max_str
-        return "https://snkrdunk.com/search?" + urlencode(params)
+        return SEARCH_BASE_URLS["yahuoku"] + urlencode(params)
 
     params = {}
     if keyword:
@@ -256,7 +260,7 @@ def build_search_url(
         params["sort"] = sort
     if category:
         params["category_id"] = category
-    return "https://jp.mercari.com/search?" + urlencode(params)
+    return SEARCH_BASE_URLS["mercari"] + urlencode(params)
 
 
 def build_scrape_task_request(
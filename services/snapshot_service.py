@@ -0,0 +1,81 @@
+"""
+Snapshot Service
+
+Batched "latest snapshot per product" lookups shared by the list, catalog
+and export routes. Snapshots are ranked per product with row_number()
+(newest scraped_at first, id as tie-breaker) so one query serves any
+number of products.
+"""
+from sqlalchemy import func, select
+from sqlalchemy.orm import load_only
+
+from models import ProductSnapshot
+
+
+def ranked_snapshot_select(product_ids=None, product_ids_select=None):
+    """
+    Return a SELECT of snapshot id / product_id / price / status plus
+    ``snapshot_rank`` (1 = latest) for the given products.
+
+    Pass either a list of ``product_ids`` or a subquery exposing a
+    ``product_id`` column as ``product_ids_select``.
+    """
+    statement = select(
+        ProductSnapshot.id.label("snapshot_id"),
+        ProductSnapshot.product_id.label("product_id"),
+        ProductSnapshot.price.label("price"),
+        ProductSnapshot.status.label("status"),
+        func.row_number()
+        .over(
+            partition_by=ProductSnapshot.product_id,
+            order_by=(ProductSnapshot.scraped_at.desc(), ProductSnapshot.id.desc()),
+        )
+        .label("snapshot_rank"),
+    )
+    if product_ids_select is not None:
+        return statement.join(
+            product_ids_select,
+            ProductSnapshot.product_id == product_ids_select.c.product_id,
+        )
+    return statement.where(ProductSnapshot.product_id.in_(product_ids))
+
+
+def load_recent_snapshots_by_product(session_db, product_ids, depth: int = 1, columns=None) -> dict:
+    """
+    Return ``{product_id: {rank: ProductSnapshot}}`` for the ``depth`` most
+    recent snapshots of each product, in one query.
+
+    ``columns`` limits which snapshot attributes are loaded; callers that
+    read the snapshots after the session closes must list every one they use.
+    """
+    product_ids = list(product_ids)
+    if not product_ids:
+        return {}
+
+    ranked_snapshots = ranked_snapshot_select(product_ids=product_ids).subquery()
+    query = session_db.query(ProductSnapshot, ranked_snapshots.c.snapshot_rank)
+    if columns:
+        query = query.options(load_only(ProductSnapshot.product_id, *columns))
+    rows = (
+        query.join(ranked_snapshots, ProductSnapshot.id == ranked_snapshots.c.snapshot_id)
+        .filter(ranked_snapshots.c.snapshot_rank <= depth)
+        .order_by(ranked_snapshots.c.product_id, ranked_snapshots.c.snapshot_rank)
+        .all()
+    )
+
+    snapshots_by_product = {}
+    for snapshot, snapshot_rank in rows:
+        snapshots_by_product.setdefault(snapshot.product_id, {})[int(snapshot_rank)] = snapshot
+    return snapshots_by_product
+
+
+def attach_latest_snapshots(session_db, products, columns=None) -> None:
+    """Set ``product.latest_snapshot`` on every product (``None`` entries are skipped)."""
+    products = [product for product in products if product is not None]
+    snapshots_by_product = load_recent_snapshots_by_product(
+        session_db,
+        [product.id for product in products],
+        columns=columns,
+    )
+    for product in products:
+        product.latest_snapshot = snapshots_by_product.get(product.id, {}).get(1)
@@ -2,9 +2,10 @@ import pytest
 import os
 import sys
 import uuid
+from contextlib import contextmanager
 from pathlib import Path
 
-from sqlalchemy import inspect, text
+from sqlalchemy import event, inspect, text
 
 # Add the application root to the path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
@@ -126,3 +127,24 @@ def db_session(app):
     session = database._session_factory()
     yield session
     session.close()
+
+
+@contextmanager
+def _capture_sql_statements():
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = database.engine
+    event.listen(engine, 'before_cursor_execute', record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, 'before_cursor_execute', record)
+
+
+@pytest.fixture
+def capture_sql(app):
+    """Return a context manager that collects the SQL run on the app engine."""
+    return _capture_sql_statements
@@ -111,6 +111,25 @@ def test_register_can_be_disabled(client):
     assert b'Public signup is disabled' in response.data
 
 
+def test_login_with_unknown_username_still_verifies_a_hash(client, monkeypatch):
+    import routes.auth as auth_routes
+
+    verified = []
+    real_check = auth_routes.check_password_hash
+
+    def spy_check(pwhash, password):
+        verified.append(password)
+        return real_check(pwhash, password)
+
+    monkeypatch.setattr(auth_routes, "check_password_hash", spy_check)
+
+    response = client.post('/login', data={'username': 'no-such-user', 'password': 'guess123'})
+
+    assert response.status_code == 200
+    assert "ユーザー名またはパスワードが違います".encode("utf-8") in response.data
+    assert verified == ['guess123']
+
+
 def test_login_failed_attempts_are_rate_limited(client, db_session):
     client.application.config['LOGIN_RATE_LIMIT'] = 2
     user = User(username='ratelimituser')
@@ -20,6 +20,10 @@ def test_run_browser_page_task_uses_shared_runtime(monkeypatch):
         def __init__(self):
             self.page = FakePage()
             self.closed = False
+            self.route_handler = None
+
+        async def route(self, pattern, handler):
+            self.route_handler = handler
 
         async def new_page(self):
             return self.page
@@ -46,6 +50,7 @@ def test_run_browser_page_task_uses_shared_runtime(monkeypatch):
                 captured["scripts"] = browser.context.page.scripts
                 captured["context_options"] = browser.context_options
                 captured["context_closed"] = browser.context.closed
+                captured["route_handler"] = browser.context.route_handler
                 return result
 
             future.set_result(run_coro_sync(_runner()))
@@ -66,6 +71,7 @@ def test_run_browser_page_task_uses_shared_runtime(monkeypatch):
     assert captured["context_options"]["user_agent"] == "ua"
     assert captured["scripts"] == ["window.__esp = true;"]
     assert captured["context_closed"] is True
+    assert captured["route_handler"] is None
 
 
 def test_run_browser_page_task_falls_back_to_temporary_browser(monkeypatch):
@@ -108,6 +114,49 @@ def test_run_browser_page_task_falls_back_to_temporary_browser(monkeypatch):
     assert result == "temp-ok"
 
 
+def test_resource_blocking_aborts_only_configured_types(monkeypatch):
+    monkeypatch.delenv("BROWSER_BLOCK_RESOURCE_TYPES", raising=False)
+    monkeypatch.setenv("MERCARI_BROWSER_BLOCK_RESOURCE_TYPES", "image, font")
+    from services.browser_pool import _install_resource_blocking, _resolve_blocked_resource_types
+
+    blocked_types = _resolve_blocked_resource_types("mercari")
+    assert blocked_types == ("image", "font")
+    assert _resolve_blocked_resource_types("snkrdunk") == ()
+    assert _resolve_blocked_resource_types("mercari", []) == ()
+
+    class FakeRoute:
+        def __init__(self, resource_type):
+            self.request = type("Request", (), {"resource_type": resource_type})()
+            self.outcome = None
+
+        async def abort(self):
+            self.outcome = "abort"
+
+        async def continue_(self):
+            self.outcome = "continue"
+
+    class FakeContext:
+        handler = None
+
+        async def route(self, pattern, handler):
+            self.handler = handler
+
+    context = FakeContext()
+    run_coro_sync(_install_resource_blocking(context, blocked_types))
+
+    routes = {kind: FakeRoute(kind) for kind in ("image", "font", "document", "script", "xhr")}
+    for route in routes.values():
+        run_coro_sync(context.handler(route))
+
+    assert {kind: route.outcome for kind, route in routes.items()} == {
+        "image": "abort",
+        "font": "abort",
+        "document": "continue",
+        "script": "continue",
+        "xhr": "continue",
+    }
+
+
 def test_get_browser_runtime_uses_site_max_context_limit(monkeypatch):
     monkeypatch.setenv("ENABLE_SHARED_BROWSER_RUNTIME", "1")
     monkeypatch.setenv("MERCARI_BROWSER_POOL_MAX_CONTEXTS", "3")
@@ -140,3 +189,23 @@ def test_get_browser_runtime_uses_recycle_policy_env(monkeypatch):
     assert health["runtimes"]["mercari"]["max_runtime_seconds"] == 900.0
 
     close_browser_pool()
+
+
+def test_launch_args_disable_images_unless_opted_out(monkeypatch):
+    from services.browser_pool import _resolve_launch_args
+
+    monkeypatch.delenv("BROWSER_DISABLE_IMAGES", raising=False)
+    monkeypatch.delenv("MERCARI_BROWSER_DISABLE_IMAGES", raising=False)
+    monkeypatch.delenv("MERCARI_BROWSER_POOL_ARGS", raising=False)
+    monkeypatch.delenv("BROWSER_POOL_ARGS", raising=False)
+
+    assert _resolve_launch_args("mercari", ["--no-sandbox"]) == (
+        "--no-sandbox",
+        "--blink-settings=imagesEnabled=false",
+    )
+    assert _resolve_launch_args("mercari", ["--blink-settings=imagesEnabled=true"]) == (
+        "--blink-settings=imagesEnabled=true",
+    )
+
+    monkeypatch.setenv("MERCARI_BROWSER_DISABLE_IMAGES", "false")
+    assert _resolve_launch_args("mercari", ["--no-sandbox"]) == ("--no-sandbox",)
@@ -2,6 +2,7 @@
 Comprehensive E2E Tests for the refactored Flask application.
 Tests all routes after the app.py split to ensure functionality is preserved.
 """
+import csv
 import io
 import re
 import shutil
@@ -171,6 +172,29 @@ class TestMainRoutes:
         response = client.get('/')
         assert response.status_code == 200
 
+    def test_index_site_counts_and_status_options_from_grouped_counts(self, client, db_session):
+        """Site badges, total count and status options are derived from one grouped count"""
+        user = User(username='indexfiltercounts')
+        user.set_password('testpassword')
+        db_session.add(user)
+        db_session.commit()
+        db_session.add_all([
+            Product(user_id=user.id, site='mercari', source_url='https://example.com/fc-1', last_status='on_sale'),
+            Product(user_id=user.id, site='mercari', source_url='https://example.com/fc-2', last_status='sold'),
+            Product(user_id=user.id, site='rakuma', source_url='https://example.com/fc-3', last_status='on_sale'),
+        ])
+        db_session.commit()
+        client.post('/login', data={'username': 'indexfiltercounts', 'password': 'testpassword'})
+
+        response = client.get('/')
+
+        html = response.get_data(as_text=True)
+        assert re.search(r'全て <span class="site-badge-count">3</span>', html)
+        assert re.search(r'mercari <span class="site-badge-count">2</span>', html)
+        assert re.search(r'rakuma <span class="site-badge-count">1</span>', html)
+        assert html.count('<option value="on_sale"') == 1
+        assert '<option value="sold"' in html
+
     def test_loading_overlay_is_hidden_by_default(self, client, db_session):
         """Authenticated pages should not render the global loading overlay visibly by default."""
         user = User(username='overlaytest')
@@ -212,7 +236,7 @@ class TestMainRoutes:
         response = client.get('/dashboard')
         assert response.status_code == 200
 
-    def test_dashboard_uses_current_scope_metrics(self, client, db_session):
+    def test_dashboard_uses_current_scope_metrics(self, client, db_session, capture_sql):
         """Dashboard metrics should align with current product model and index scope."""
         user = User(username='dashmetricstest')
         user.set_password('testpassword')
@@ -316,9 +340,13 @@ class TestMainRoutes:
         with client.session_transaction() as session_state:
             session_state['current_shop_id'] = shop.id
 
-        response = client.get('/dashboard')
+        with capture_sql() as statements:
+            response = client.get('/dashboard')
         assert response.status_code == 200
         html = response.get_data(as_text=True)
+        # Zero-stock counts ride on the product query; snapshots are one ranked query.
+        assert sum('FROM variants' in statement for statement in statements) == 1
+        assert sum('FROM product_snapshots' in statement for statement in statements) == 1
 
         assert re.search(r'管理対象商品</span>\s*<strong class="dashboard-summary-value">2</strong>', html)
         assert re.search(r'公開中</span>\s*<strong class="dashboard-summary-value">1</strong>', html)
@@ -566,6 +594,41 @@ class TestMainRoutes:
         assert db_session.query(Product).filter_by(user_id=user.id, last_title='不正ショップ商品').count() == 0
 
 
+    def test_batch_edit_updates_titles_in_one_statement(self, client, db_session, capture_sql):
+        """Batch title edits apply to the user's selected products only"""
+        user = User(username='batchedittest')
+        user.set_password('testpassword')
+        other = User(username='batcheditother')
+        other.set_password('testpassword')
+        db_session.add_all([user, other])
+        db_session.commit()
+
+        custom = Product(user_id=user.id, site='mercari', source_url='https://example.com/be-1',
+                         last_title='Scraped A', custom_title='Custom A')
+        blank_custom = Product(user_id=user.id, site='mercari', source_url='https://example.com/be-2',
+                               last_title='Scraped B', custom_title='')
+        foreign = Product(user_id=other.id, site='mercari', source_url='https://example.com/be-3',
+                          last_title='Foreign', custom_title='Foreign')
+        db_session.add_all([custom, blank_custom, foreign])
+        db_session.commit()
+
+        client.post('/login', data={'username': 'batchedittest', 'password': 'testpassword'})
+        ids = [str(custom.id), str(custom.id), str(blank_custom.id), str(foreign.id), 'not-an-id']
+
+        with capture_sql() as statements:
+            response = client.post('/batch-edit', data={'action': 'prefix', 'input': '[JP] ', 'ids': ids})
+        assert response.status_code == 302
+        assert sum(statement.lstrip().upper().startswith('UPDATE PRODUCTS') for statement in statements) == 1
+
+        client.post('/batch-edit', data={'action': 'suffix', 'input': ' !', 'ids': ids})
+        client.post('/batch-edit', data={'action': 'replace', 'input': 'Scraped', 'input2': 'Used', 'ids': ids})
+
+        db_session.expire_all()
+        assert db_session.get(Product, custom.id).custom_title == '[JP] Custom A !'
+        assert db_session.get(Product, blank_custom.id).custom_title == '[JP] Used B !'
+        assert db_session.get(Product, foreign.id).custom_title == 'Foreign'
+
+
 class TestShopsRoutes:
     """E2E tests for shop routes (routes/shops.py)"""
     
@@ -597,6 +660,28 @@ class TestShopsRoutes:
         assert 'placeholder="ショップ名 (例: 文具店A)"' in html
         assert 'value="{{ csrf_token() }}"/> placeholder=' not in html
     
+    def test_shops_page_counts_products_in_one_query(self, client, db_session, capture_sql):
+        """Per-shop product counts come from a single grouped query"""
+        user = self._login_user(client, db_session, 'shopcounttest')
+        busy = Shop(name='Busy Shop', user_id=user.id)
+        empty = Shop(name='Empty Shop', user_id=user.id)
+        db_session.add_all([busy, empty])
+        db_session.commit()
+        db_session.add_all([
+            Product(user_id=user.id, shop_id=busy.id, site='mercari', source_url=f'https://example.com/shop-count-{i}')
+            for i in range(3)
+        ])
+        db_session.commit()
+
+        with capture_sql() as statements:
+            response = client.get('/shops')
+
+        html = response.get_data(as_text=True)
+        assert 'data-shop-product-count="3"' in html
+        assert 'data-shop-product-count="0"' in html
+        count_queries = [statement for statement in statements if 'count(' in statement.lower()]
+        assert len(count_queries) == 1
+
     def test_create_shop(self, client, db_session):
         """Test creating a new shop"""
         user = self._login_user(client, db_session, 'createshoptest')
@@ -642,6 +727,38 @@ class TestShopsRoutes:
         
         assert response.status_code == 200
     
+    def test_set_current_shop_ignores_other_users_shop(self, client, db_session):
+        """Only the user's own shops can become the current shop"""
+        user = self._login_user(client, db_session, 'setshopowner')
+        other = User(username='setshopother')
+        other.set_password('testpassword')
+        db_session.add(other)
+        db_session.commit()
+        own_shop = Shop(name='Own Shop', user_id=user.id)
+        foreign_shop = Shop(name='Foreign Shop', user_id=other.id)
+        db_session.add_all([own_shop, foreign_shop])
+        db_session.commit()
+
+        client.post('/set_current_shop', data={'shop_id': str(foreign_shop.id)})
+        with client.session_transaction() as flask_session:
+            assert 'current_shop_id' not in flask_session
+
+        client.post('/set_current_shop', data={'shop_id': 'abc'})
+        client.post('/set_current_shop', data={'shop_id': str(own_shop.id)})
+        with client.session_transaction() as flask_session:
+            assert flask_session['current_shop_id'] == own_shop.id
+
+    def test_create_shop_rejects_duplicate_name(self, client, db_session):
+        """Shop names are unique per user"""
+        user = self._login_user(client, db_session, 'dupshoptest')
+        db_session.add(Shop(name='Same Name', user_id=user.id))
+        db_session.commit()
+
+        response = client.post('/shops', data={'name': 'Same Name'})
+
+        assert '同じショップ名が既に登録されています'.encode('utf-8') in response.data
+        assert db_session.query(Shop).filter_by(user_id=user.id, name='Same Name').count() == 1
+
     def test_templates_page_requires_login(self, client):
         """Test that templates page requires authentication"""
         response = client.get('/templates', follow_redirects=True)
@@ -933,6 +1050,25 @@ class TestPriceListRoutes:
 
         return user, product, pricelist, item
 
+    def test_pricelist_pages_show_latest_snapshot_thumbnail(self, client, db_session):
+        """Items and add-products pages use the newest snapshot for thumbnails"""
+        user, product, pricelist, _ = self._create_catalog_fixture(db_session, username='pricelistthumbtest')
+        db_session.add(ProductSnapshot(
+            product_id=product.id,
+            title='Catalog Layout Product',
+            image_urls='https://img.example.com/stale.jpg',
+            scraped_at=datetime(2020, 1, 1),
+        ))
+        db_session.commit()
+        client.post('/login', data={'username': 'pricelistthumbtest', 'password': 'testpassword'})
+
+        items_html = client.get(f'/pricelists/{pricelist.id}/items').get_data(as_text=True)
+        add_html = client.get(f'/pricelists/{pricelist.id}/add-products-page').get_data(as_text=True)
+
+        for html in (items_html, add_html):
+            assert 'https://img.example.com/catalog-layout.jpg' in html
+            assert 'stale.jpg' not in html
+
     def test_pricelist_create_saves_layout(self, client, db_session):
         """Test creating a price list persists selected layout"""
         user = self._login_user(client, db_session, 'pricelistcreatetest')
@@ -1531,6 +1667,45 @@ class TestProductRoutes:
         assert variant.price == 3450
         assert variant.inventory_qty == 7
 
+    def test_product_detail_variant_edits_load_variants_once(self, client, db_session, capture_sql):
+        """Variant delete/update/create on save share one variant SELECT"""
+        user, product, first = self._setup_user_with_product(client, db_session, 'productvariantbatch')
+        second = Variant(product_id=product.id, option1_value='B', sku='SKU-B', price=200, inventory_qty=1, position=2)
+        other_product = Product(user_id=user.id, site='mercari', source_url='https://example.com/variant-other')
+        db_session.add_all([second, other_product])
+        db_session.commit()
+        foreign = Variant(product_id=other_product.id, option1_value='X', sku='SKU-X', price=1, position=1)
+        db_session.add(foreign)
+        db_session.commit()
+        first_id, second_id, foreign_id = first.id, second.id, foreign.id
+
+        with capture_sql() as statements:
+            response = client.post(f'/product/{product.id}', data={
+                'title': 'Variant Batch Title',
+                'status': 'active',
+                'delete_v_ids': f'{first_id},{foreign_id}',
+                'v_ids': [str(second_id)],
+                f'v_opt1_{second_id}': 'B2',
+                f'v_price_{second_id}': '2500',
+                f'v_qty_{second_id}': '4',
+                'new_v_indices': ['0'],
+                'new_v_opt1_0': 'C',
+                'new_v_price_0': '900',
+            })
+
+        assert response.status_code == 302
+        variant_selects = [
+            statement for statement in statements
+            if statement.lstrip().upper().startswith('SELECT') and 'FROM variants' in statement
+        ]
+        assert len(variant_selects) == 1
+
+        db_session.expire_all()
+        remaining = db_session.query(Variant).filter_by(product_id=product.id).order_by(Variant.id).all()
+        assert [(v.option1_value, v.price, v.inventory_qty) for v in remaining] == [('B2', 2500, 4), ('C', 900, 0)]
+        assert db_session.get(Variant, foreign_id) is not None
+        assert db_session.get(Product, product.id).selling_price == 2500
+
     def test_product_detail_does_not_expose_other_users_pricing_rules(self, client, db_session):
         """Product edit pricing rule choices must stay scoped to the current user."""
         user, product, _ = self._setup_user_with_product(client, db_session, 'productsalesrulescope')
@@ -2083,6 +2258,7 @@ class TestExportRoutes:
         
         response = client.get('/export/shopify')
         assert response.status_code == 200
+        assert response.is_streamed
         assert response.content_type == 'text/csv'
         assert b'Handle' in response.data
         assert b'Title' in response.data
@@ -2146,6 +2322,469 @@ class TestExportRoutes:
         assert b'Variant Price' in response.data
 
 
+    def test_export_price_update_applies_markup_without_float_truncation(self, client, db_session):
+        """Markup is applied in integer arithmetic: 100 * 1.15 must be 115, not 114."""
+        user, product, variant = self._setup_user_with_product(client, db_session, 'pricemarkuptest')
+        variant.price = 100
+        db_session.commit()
+
+        response = client.get(f'/export_price_update?id={product.id}&markup=1.15')
+
+        assert response.status_code == 200
+        rows = list(csv.reader(io.StringIO(response.get_data(as_text=True))))
+        assert rows[1][-1] == '115'
+
+    def test_export_ebay_rounds_usd_price_half_up(self, client, db_session):
+        """USD StartPrice is rounded half-up to cents."""
+        user, product, _ = self._setup_user_with_product(client, db_session, 'ebayroundingtest')
+
+        response = client.get(f'/export_ebay?id={product.id}&rate=160&markup=1')
+
+        assert response.status_code == 200
+        rows = list(csv.reader(io.StringIO(response.get_data(as_text=True).lstrip('\ufeff'))))
+        header = rows[0]
+        assert rows[1][header.index('StartPrice')] == '12.50'
+
+
+    def test_iter_csv_chunks_formats_rows_in_batches(self):
+        """CSV rows are formatted in writerows batches, one streamed chunk per batch."""
+        from routes.export import _CSV_STREAM_BATCH_ROWS, _iter_csv_chunks
+
+        rows = [(i, f'name-{i}') for i in range(_CSV_STREAM_BATCH_ROWS * 2 + 1)]
+
+        chunks = list(_iter_csv_chunks(('id', 'name'), rows, prefix='\ufeff'))
+
+        assert len(chunks) == 3
+        assert chunks[0].startswith('\ufeffid,name\r\n0,name-0\r\n')
+        assert list(csv.reader(io.StringIO(''.join(chunks).lstrip('\ufeff'))))[1:] == [
+            [str(i), name] for i, name in rows
+        ]
+        assert list(_iter_csv_chunks(('id',), [])) == ['id\r\n']
+
+
+    def test_export_shopify_prepares_products_concurrently_in_order(self, client, db_session, monkeypatch):
+        """Shopify rows are built on worker threads but written in product order"""
+        import threading
+
+        user, first_product, _ = self._setup_user_with_product(client, db_session, 'parallelshopifytest')
+        first_product.custom_handle = 'handle-0'
+        products = [first_product]
+        for index in range(1, 5):
+            product = Product(
+                user_id=user.id,
+                site='mercari',
+                source_url=f'https://jp.mercari.com/item/m8{index}',
+                last_title=f'Parallel Product {index}',
+                custom_handle=f'handle-{index}',
+                status='active',
+            )
+            db_session.add(product)
+            db_session.commit()
+            db_session.add_all([
+                Variant(product_id=product.id, option1_value='Default Title', sku=f'PAR-{index}', price=1000, position=1),
+                ProductSnapshot(product_id=product.id, image_urls='https://img.example.com/x.jpg', scraped_at=utc_now()),
+            ])
+            db_session.commit()
+            products.append(product)
+
+        monkeypatch.setenv('EXPORT_SHOPIFY_ROW_WORKERS', '3')
+        thread_names = set()
+
+        def fake_cache(url, product_id, index):
+            thread_names.add(threading.current_thread().name)
+            return f'mercari_{product_id}_{index}.jpg'
+
+        monkeypatch.setattr('routes.export.cache_mercari_image', fake_cache)
+
+        response = client.get('/export/shopify?' + '&'.join(f'id={product.id}' for product in products))
+
+        assert response.status_code == 200
+        rows = list(csv.reader(io.StringIO(response.get_data(as_text=True))))
+        assert [row[0] for row in rows[1:]] == [f'handle-{index}' for index in range(5)]
+        assert thread_names
+        assert threading.current_thread().name not in thread_names
+
+
+    def test_export_shopify_batches_snapshot_and_variant_queries(self, client, db_session, capture_sql):
+        """Shopify export loads latest snapshots and variants in one query each, not per product"""
+        user, first_product, _ = self._setup_user_with_product(client, db_session, 'batchexporttest')
+        for index in range(2):
+            product = Product(
+                user_id=user.id,
+                site='mercari',
+                source_url=f'https://jp.mercari.com/item/m9{index}',
+                last_title=f'Batch Product {index}',
+                status='active',
+            )
+            db_session.add(product)
+            db_session.commit()
+            db_session.add_all([
+                Variant(product_id=product.id, option1_value='Default Title', sku=f'BATCH-{index}', price=1000, position=1),
+                ProductSnapshot(product_id=product.id, description='old description', scraped_at=datetime(2024, 1, 1)),
+                ProductSnapshot(product_id=product.id, description=f'latest description {index}', scraped_at=datetime(2024, 2, 1)),
+            ])
+            db_session.commit()
+
+        with capture_sql() as statements:
+            response = client.get('/export/shopify')
+
+        body = response.get_data(as_text=True)
+        assert response.status_code == 200
+        assert 'latest description 0' in body
+        assert 'latest description 1' in body
+        assert 'old description' not in body
+        assert 'BATCH-1' in body
+        assert sum('FROM product_snapshots' in statement for statement in statements) == 1
+        assert sum('FROM variants' in statement for statement in statements) == 1
+
+
+    def test_export_stock_update_loads_only_needed_columns(self, client, db_session, capture_sql):
+        """Stock update export skips snapshots and wide product columns"""
+        user, product, variant = self._setup_user_with_product(client, db_session, 'stockcolumnstest')
+        product.custom_handle = 'stock-handle'
+        product.last_status = 'sold'
+        variant.inventory_qty = 5
+        db_session.commit()
+
+        with capture_sql() as statements:
+            response = client.get('/export_stock_update')
+
+        body = response.get_data(as_text=True)
+        assert response.status_code == 200
+        assert 'stock-handle,Default Title,,,0' in body
+        assert not any('FROM product_snapshots' in statement for statement in statements)
+        product_selects = [statement for statement in statements if 'FROM products' in statement]
+        assert product_selects
+        assert all('custom_description' not in statement for statement in product_selects)
+
+
+    def test_export_images_downloads_concurrently_and_skips_failures(self, client, db_session, monkeypatch):
+        """Image ZIP export keeps entry order and drops images that fail to download"""
+        import threading
+        import zipfile
+
+        user, product, _ = self._setup_user_with_product(client, db_session, 'imageexporttest')
+        snapshot = db_session.query(ProductSnapshot).filter_by(product_id=product.id).one()
+        snapshot.image_urls = 'https://img.example.com/a.jpg|https://img.example.com/bad.jpg|https://img.example.com/c.jpg'
+        db_session.commit()
+
+        monkeypatch.setenv('EXPORT_IMAGE_DOWNLOAD_WORKERS', '3')
+        thread_names = set()
+
+        def fake_download(url):
+            thread_names.add(threading.current_thread().name)
+            if 'bad' in url:
+                raise RuntimeError('boom')
+            return url.encode('utf-8'), '.jpg'
+
+        monkeypatch.setattr('routes.export.download_external_image', fake_download)
+
+        response = client.get('/export_images')
+
+        assert response.status_code == 200
+        assert response.is_streamed
+        assert response.content_type == 'application/zip'
+        with zipfile.ZipFile(io.BytesIO(response.data)) as archive:
+            assert archive.namelist() == [
+                f'product_{product.id}/image_1.jpg',
+                f'product_{product.id}/image_3.jpg',
+            ]
+            assert archive.read(f'product_{product.id}/image_3.jpg') == b'https://img.example.com/c.jpg'
+        assert threading.current_thread().name not in thread_names
+
+
+    def test_export_images_reads_cached_images_without_downloading(self, client, db_session, monkeypatch, tmp_path):
+        """Images already in the local cache are zipped from disk, not re-downloaded"""
+        import zipfile
+
+        from services import image_service
+
+        user, product, _ = self._setup_user_with_product(client, db_session, 'imagecacheexporttest')
+        snapshot = db_session.query(ProductSnapshot).filter_by(product_id=product.id).one()
+        snapshot.image_urls = 'https://img.example.com/a.jpg|https://img.example.com/b.jpg'
+        db_session.commit()
+
+        monkeypatch.setattr(image_service, 'IMAGE_STORAGE_PATH', str(tmp_path))
+        monkeypatch.setattr('routes.export.IMAGE_STORAGE_PATH', str(tmp_path))
+        (tmp_path / f'mercari_{product.id}_0.png').write_bytes(b'cached-png')
+        downloaded = []
+
+        def fake_download(url):
+            downloaded.append(url)
+            return b'fresh', '.jpg'
+
+        monkeypatch.setattr('routes.export.download_external_image', fake_download)
+
+        response = client.get('/export_images')
+
+        assert response.status_code == 200
+        with zipfile.ZipFile(io.BytesIO(response.data)) as archive:
+            assert archive.namelist() == [
+                f'product_{product.id}/image_1.png',
+                f'product_{product.id}/image_2.jpg',
+            ]
+            assert archive.read(f'product_{product.id}/image_1.png') == b'cached-png'
+        assert downloaded == ['https://img.example.com/b.jpg']
+
+
+class TestArchiveRoutes:
+    """E2E tests for archive routes (routes/archive.py)"""
+
+    def _login_user(self, client, db_session, username='archivetest'):
+        """Helper to create and login a user"""
+        user = User(username=username)
+        user.set_password('testpassword')
+        db_session.add(user)
+        db_session.commit()
+
+        client.post('/login', data={
+            'username': username,
+            'password': 'testpassword'
+        })
+        return user
+
+    def test_archive_and_restore_only_touch_current_users_products(self, client, db_session):
+        user = self._login_user(client, db_session)
+        other_user = User(username='archiveother')
+        other_user.set_password('testpassword')
+        db_session.add(other_user)
+        db_session.commit()
+
+        own_products = [
+            Product(user_id=user.id, site='mercari', source_url=f'https://example.com/own-{i}', archived=False)
+            for i in range(2)
+        ]
+        other_product = Product(user_id=other_user.id, site='mercari', source_url='https://example.com/other', archived=False)
+        db_session.add_all(own_products + [other_product])
+        db_session.commit()
+        ids = [str(product.id) for product in own_products + [other_product]]
+
+        response = client.post('/archive/add', data={'ids': ids}, follow_redirects=True)
+        assert response.status_code == 200
+        assert "2件をアーカイブしました".encode("utf-8") in response.data
+
+        db_session.expire_all()
+        assert all(product.archived for product in own_products)
+        assert other_product.archived is False
+
+        response = client.post('/archive/restore', data={'ids': ids}, follow_redirects=True)
+        assert response.status_code == 200
+        assert "2件を復元しました".encode("utf-8") in response.data
+
+        db_session.expire_all()
+        assert not any(product.archived for product in own_products)
+
+    def test_empty_archive_submission_skips_db_session(self, client, db_session, monkeypatch):
+        self._login_user(client, db_session, 'archiveemptytest')
+
+        def fail_session():
+            raise AssertionError('empty submissions should not open a DB session')
+
+        monkeypatch.setattr('routes.archive.SessionLocal', fail_session)
+
+        response = client.post('/archive/add', data={})
+        assert response.status_code == 302
+        response = client.post('/archive/restore', data={})
+        assert response.status_code == 302
+
+    def test_archive_rejects_malformed_ids_and_dedupes(self, client, db_session):
+        user = self._login_user(client, db_session, 'archiveidstest')
+        product = Product(user_id=user.id, site='mercari', source_url='https://example.com/dupe', archived=False)
+        db_session.add(product)
+        db_session.commit()
+
+        response = client.post('/archive/add', data={'ids': [str(product.id), 'abc']}, follow_redirects=True)
+        assert "不正な商品IDが含まれています".encode("utf-8") in response.data
+        db_session.expire_all()
+        assert product.archived is False
+
+        response = client.post('/archive/add', data={'ids': [str(product.id), str(product.id)]}, follow_redirects=True)
+        assert "1件をアーカイブしました".encode("utf-8") in response.data
+        db_session.expire_all()
+        assert product.archived is True
+
+    def test_archive_list_renders_archived_products(self, client, db_session):
+        user = self._login_user(client, db_session, 'archivelisttest')
+        db_session.add_all([
+            Shop(name='Archive Shop', user_id=user.id),
+            Product(
+                user_id=user.id,
+                site='mercari',
+                source_url='https://example.com/archived-item',
+                last_title='Archived Camera',
+                last_price=12000,
+                archived=True,
+            ),
+            Product(
+                user_id=user.id,
+                site='mercari',
+                source_url='https://example.com/active-item',
+                last_title='Active Lens',
+                archived=False,
+            ),
+        ])
+        db_session.commit()
+
+        response = client.get('/archive')
+        html = response.get_data(as_text=True)
+
+        assert response.status_code == 200
+        assert 'Archived Camera' in html
+        assert '¥12,000' in html
+        assert 'Active Lens' not in html
+        assert 'Archive Shop' in html
+
+    def test_archive_list_is_paginated(self, client, db_session, monkeypatch):
+        monkeypatch.setattr('routes.archive.ARCHIVE_PAGE_SIZE', 2)
+        user = self._login_user(client, db_session, 'archivepagetest')
+        db_session.add_all([
+            Product(
+                user_id=user.id,
+                site='mercari',
+                source_url=f'https://example.com/archived-{i}',
+                last_title=f'Archived Item {i}',
+                archived=True,
+                updated_at=datetime(2024, 1, 1 + i),
+            )
+            for i in range(3)
+        ])
+        db_session.commit()
+
+        first_page = client.get('/archive').get_data(as_text=True)
+        assert 'Archived Item 2' in first_page
+        assert 'Archived Item 1' in first_page
+        assert 'Archived Item 0' not in first_page
+        assert '1 / 2ページ' in first_page
+
+        last_page = client.get('/archive?page=9').get_data(as_text=True)
+        assert 'Archived Item 0' in last_page
+        assert 'Archived Item 2' not in last_page
+        assert '2 / 2ページ' in last_page
+
+    def test_archive_list_pages_rows_with_equal_timestamps_without_overlap(self, client, db_session, monkeypatch):
+        monkeypatch.setattr('routes.archive.ARCHIVE_PAGE_SIZE', 2)
+        user = self._login_user(client, db_session, 'archivetietest')
+        archived_at = datetime(2024, 3, 1)
+        db_session.add_all([
+            Product(
+                user_id=user.id,
+                site='mercari',
+                source_url=f'https://example.com/tied-{i}',
+                last_title=f'Tied Item {i}',
+                archived=True,
+                updated_at=archived_at,
+            )
+            for i in range(4)
+        ])
+        db_session.commit()
+
+        pages = [client.get(f'/archive?page={page}').get_data(as_text=True) for page in (1, 2)]
+        for i in range(4):
+            assert sum(f'Tied Item {i}' in page for page in pages) == 1
+        # Newest id first among equal timestamps
+        assert 'Tied Item 3' in pages[0]
+        assert 'Tied Item 0' in pages[1]
+
+
+class TestTrashRoutes:
+    """E2E tests for trash routes (routes/trash.py)"""
+
+    def _login_user(self, client, db_session, username='trashtest'):
+        """Helper to create and login a user"""
+        user = User(username=username)
+        user.set_password('testpassword')
+        db_session.add(user)
+        db_session.commit()
+
+        client.post('/login', data={
+            'username': username,
+            'password': 'testpassword'
+        })
+        return user
+
+    def _add_product(self, db_session, user, suffix, deleted_at=None):
+        product = Product(user_id=user.id, site='mercari', source_url=f'https://example.com/trash-{suffix}',
+                          deleted_at=deleted_at)
+        db_session.add(product)
+        db_session.flush()
+        db_session.add(Variant(product_id=product.id, option1_value='Default Title', price=100, inventory_qty=1))
+        db_session.add(ProductSnapshot(product_id=product.id, title='Snap', price=100))
+        db_session.commit()
+        return product
+
+    def test_trash_delete_restore_and_purge_are_user_scoped(self, client, db_session):
+        user = self._login_user(client, db_session)
+        other = User(username='trashother')
+        other.set_password('testpassword')
+        db_session.add(other)
+        db_session.commit()
+
+        own = [self._add_product(db_session, user, f'own-{i}') for i in range(2)]
+        foreign = self._add_product(db_session, other, 'foreign')
+        own_ids = [product.id for product in own]
+        foreign_id = foreign.id
+        ids = [str(product_id) for product_id in own_ids + [foreign_id]] + ['bogus']
+
+        response = client.post('/trash/delete', data={'id': ids}, follow_redirects=True)
+        assert "2件をゴミ箱に移動しました".encode("utf-8") in response.data
+        db_session.expire_all()
+        assert all(db_session.get(Product, product_id).deleted_at for product_id in own_ids)
+        assert db_session.get(Product, foreign_id).deleted_at is None
+
+        response = client.post('/trash/restore', data={'id': [str(own_ids[0])]}, follow_redirects=True)
+        assert "1件を復元しました".encode("utf-8") in response.data
+
+        response = client.post('/trash/purge', data={'id': ids}, follow_redirects=True)
+        assert "1件を完全に削除しました".encode("utf-8") in response.data
+        db_session.expire_all()
+        assert db_session.get(Product, own_ids[1]) is None
+        assert db_session.query(Variant).filter_by(product_id=own_ids[1]).count() == 0
+        assert db_session.query(ProductSnapshot).filter_by(product_id=own_ids[1]).count() == 0
+        assert db_session.get(Product, own_ids[0]) is not None
+        assert db_session.get(Product, foreign_id) is not None
+
+    def test_purge_old_trash_removes_only_expired_items(self, app, db_session):
+        from datetime import timedelta
+        from routes.trash import purge_old_trash
+
+        user = User(username='trashpurgeold')
+        user.set_password('testpassword')
+        db_session.add(user)
+        db_session.commit()
+
+        expired = self._add_product(db_session, user, 'expired', deleted_at=utc_now() - timedelta(days=31))
+        recent = self._add_product(db_session, user, 'recent', deleted_at=utc_now() - timedelta(days=2))
+        expired_id, recent_id = expired.id, recent.id
+
+        assert purge_old_trash() == 1
+
+        db_session.expire_all()
+        assert db_session.get(Product, expired_id) is None
+        assert db_session.query(Variant).filter_by(product_id=expired_id).count() == 0
+        assert db_session.get(Product, recent_id) is not None
+
+
+class TestSettingsRoutes:
+    """E2E tests for settings routes (routes/settings.py)"""
+
+    def test_add_keyword_rejects_duplicates_per_user(self, client, db_session):
+        from models import ExclusionKeyword
+
+        user = User(username='keywordtest')
+        user.set_password('testpassword')
+        db_session.add(user)
+        db_session.commit()
+        client.post('/login', data={'username': 'keywordtest', 'password': 'testpassword'})
+
+        response = client.post('/settings/keyword/add', data={'keyword': 'ジャンク'}, follow_redirects=True)
+        assert '追加しました。'.encode('utf-8') in response.data
+
+        response = client.post('/settings/keyword/add', data={'keyword': ' ジャンク '}, follow_redirects=True)
+        assert '同じ言葉が登録されています。'.encode('utf-8') in response.data
+
+        assert db_session.query(ExclusionKeyword).filter_by(user_id=user.id).count() == 1
+
+
 class TestBackwardCompatibility:
     """Tests to ensure backward compatibility of endpoint aliases"""
     
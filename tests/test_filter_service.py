@@ -0,0 +1,38 @@
+from models import ExclusionKeyword, User
+from services.filter_service import compile_exclusion_matcher, filter_excluded_items, is_excluded
+
+
+def test_compile_exclusion_matcher_agrees_with_is_excluded():
+    keywords = [("ジャンク", "partial"), ("a+b", "partial"), ("部品取り", "exact"), ("case", "exact")]
+    matches = compile_exclusion_matcher(keywords)
+
+    titles = ["ジャンク品 カメラ", "Nikon A+B set", "部品取り", "部品取り カメラ", "Case", "Suitcase", "", None]
+    for title in titles:
+        assert matches(title) is is_excluded(title, keywords), title
+
+
+def test_filter_excluded_items_uses_user_keywords(app, db_session):
+    user = User(username="filterkeywords")
+    user.set_password("testpassword")
+    db_session.add(user)
+    db_session.commit()
+    db_session.add_all([
+        ExclusionKeyword(user_id=user.id, keyword="Junk", match_type="partial"),
+        ExclusionKeyword(user_id=user.id, keyword="box only", match_type="exact"),
+    ])
+    db_session.commit()
+
+    items = [{"title": "JUNK camera"}, {"title": "Box Only"}, {"title": "Box only lens"}, {"title": "Lens"}]
+
+    filtered, excluded_count = filter_excluded_items(items, user.id)
+
+    assert [item["title"] for item in filtered] == ["Box only lens", "Lens"]
+    assert excluded_count == 2
+
+
+def test_compile_exclusion_matcher_reuses_matcher_for_same_keywords():
+    keywords = [("junk", "partial"), ("box only", "exact")]
+
+    first = compile_exclusion_matcher(keywords)
+    assert compile_exclusion_matcher(list(reversed(keywords))) is first
+    assert compile_exclusion_matcher(keywords + [("parts", "partial")]) is not first
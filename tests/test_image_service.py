@@ -51,7 +51,19 @@ def test_download_external_image_enforces_streamed_size_limit(monkeypatch):
             yield b"x" * 4
 
     monkeypatch.setattr(image_service, "MAX_IMAGE_DOWNLOAD_BYTES", 6)
-    monkeypatch.setattr(image_service.requests, "get", lambda *args, **kwargs: FakeResponse())
+    monkeypatch.setattr(image_service._HTTP_SESSION, "get", lambda *args, **kwargs: FakeResponse())
 
     with pytest.raises(ImageValidationError, match="byte limit"):
         download_external_image("https://img.example.com/test.png")
+
+
+def test_cache_mercari_image_skips_download_when_file_is_cached(monkeypatch, tmp_path):
+    (tmp_path / "mercari_7_0.png").write_bytes(_png_bytes())
+    monkeypatch.setattr(image_service, "IMAGE_STORAGE_PATH", str(tmp_path))
+
+    def fail_download(*args, **kwargs):
+        raise AssertionError("cached images must not be downloaded again")
+
+    monkeypatch.setattr(image_service, "download_external_image", fail_download)
+
+    assert image_service.cache_mercari_image("https://static.mercdn.net/item/m1_1.jpg", 7, 0) == "mercari_7_0.png"
@@ -1,6 +1,6 @@
-from io import BytesIO
+from io import BytesIO, StringIO
 
-from models import Product, Shop, User
+from models import Product, ProductSnapshot, Shop, User, Variant
 
 
 def _login_user(client, db_session, username):
@@ -104,3 +104,221 @@ def test_csv_preview_rejects_other_users_shop_without_session_token(client, db_s
     with client.session_transaction() as flask_session:
         assert 'import_csv_token' not in flask_session
         assert 'import_csv_content' not in flask_session
+
+
+def test_direct_csv_import_writes_rows_in_bulk_and_skips_bad_rows(client, db_session):
+    user = _login_user(client, db_session, 'import_bulk_user')
+    existing = Product(user_id=user.id, site='import', source_url='https://example.com/item/existing', last_title='Old')
+    db_session.add(existing)
+    db_session.commit()
+
+    content = (
+        'title,price,url,sku,description,inventory\n'
+        'First,1000,https://example.com/item/a,SKU-A,<p>desc</p>,2\n'
+        'Duplicate In File,1100,https://example.com/item/a,,,\n'
+        'Already Stored,1200,https://example.com/item/existing,,,\n'
+        'Bad Price,abc,https://example.com/item/b,,,\n'
+        ',1300,https://example.com/item/c,,,\n'
+        'Second,1400,,,,\n'
+    )
+    response = client.post('/import/csv', data={
+        'site': 'import',
+        'file': _csv_upload(content),
+    }, content_type='multipart/form-data', follow_redirects=True)
+
+    assert response.status_code == 200
+    assert '2件のインポートが完了しました。 4件スキップ。'.encode('utf-8') in response.data
+
+    first = db_session.query(Product).filter_by(user_id=user.id, last_title='First').one()
+    second = db_session.query(Product).filter_by(user_id=user.id, last_title='Second').one()
+    assert db_session.query(Product).filter_by(user_id=user.id).count() == 3
+
+    first_variant = db_session.query(Variant).filter_by(product_id=first.id).one()
+    assert (first_variant.sku, first_variant.price, first_variant.inventory_qty) == ('SKU-A', 1000, 2)
+    assert db_session.query(Variant).filter_by(product_id=second.id).one().sku == f'IMP-{second.id}'
+    assert db_session.query(ProductSnapshot).filter_by(product_id=first.id).count() == 1
+    assert db_session.query(ProductSnapshot).filter_by(product_id=second.id).count() == 0
+
+
+def test_csv_preview_marks_existing_urls_with_one_lookup(client, db_session, monkeypatch):
+    import routes.import_routes as import_routes
+
+    user = _login_user(client, db_session, 'import_preview_dup_user')
+    existing = Product(user_id=user.id, site='import', source_url='https://example.com/item/1', last_title='Existing')
+    db_session.add(existing)
+    db_session.commit()
+
+    lookups = []
+    original = import_routes._existing_product_ids_by_url
+
+    def _tracking_lookup(session_db, urls):
+        lookups.append(list(urls))
+        return original(session_db, urls)
+
+    monkeypatch.setattr(import_routes, '_existing_product_ids_by_url', _tracking_lookup)
+
+    content = (
+        'title,price,url\n'
+        'Dup Product,1200,https://example.com/item/1\n'
+        'New Product,800,https://example.com/item/2\n'
+    )
+    response = client.post('/import/preview', data={
+        'site': 'import',
+        'file': _csv_upload(content),
+    }, content_type='multipart/form-data')
+
+    assert response.status_code == 200
+    assert f'重複 (ID: {existing.id})'.encode('utf-8') in response.data
+    assert lookups == [['https://example.com/item/1', 'https://example.com/item/2']]
+
+
+def test_csv_preview_keeps_raw_upload_on_disk_until_execute(client, db_session, app, tmp_path):
+    app.config['IMPORT_PREVIEW_STORAGE_PATH'] = str(tmp_path)
+    user = _login_user(client, db_session, 'import_preview_stream_user')
+
+    content = '\ufefftitle,price,url\n' + ''.join(
+        f'Streamed Product {i},{100 + i},https://example.com/stream/{i}\n' for i in range(60)
+    )
+    response = client.post('/import/preview', data={
+        'site': 'import',
+        'file': _csv_upload(content),
+    }, content_type='multipart/form-data')
+
+    assert response.status_code == 200
+    assert 'プレビューは最初の50行のみ表示'.encode('utf-8') in response.data
+    stored_files = list(tmp_path.glob('*.csv'))
+    assert len(stored_files) == 1
+    assert stored_files[0].read_bytes() == content.encode('utf-8')
+
+    response = client.post('/import/execute', follow_redirects=True)
+
+    assert response.status_code == 200
+    assert db_session.query(Product).filter_by(user_id=user.id).count() == 60
+    assert db_session.query(Product).filter_by(user_id=user.id, last_title='Streamed Product 0').count() == 1
+    assert list(tmp_path.glob('*.csv')) == []
+
+
+def test_detect_shopify_matches_handle_or_title_with_variant_sku():
+    from routes.import_routes import _detect_shopify
+
+    assert _detect_shopify(['Handle', 'Body (HTML)'])
+    assert _detect_shopify(['Variant SKU', 'Title'])
+    assert not _detect_shopify(['Title', 'Price'])
+    assert not _detect_shopify(None)
+
+
+def test_csv_row_mapper_falls_back_across_present_aliases():
+    from routes.import_routes import _build_csv_row_mapper
+
+    standard = _build_csv_row_mapper(['title', 'Title', '価格', 'URL'])
+    assert standard(['', 'Fallback', '500', 'https://example.com/a']) == {
+        'title': 'Fallback',
+        'price': '500',
+        'url': 'https://example.com/a',
+        'sku': '',
+        'description': '',
+        'image_urls': '',
+        'inventory': '1',
+    }
+
+    shopify = _build_csv_row_mapper(['Handle', 'Title', 'Variant Price', 'Price'], is_shopify=True)
+    mapped = shopify(['h', 'Shirt', '', '900'])
+    assert mapped['title'] == 'Shirt'
+    assert mapped['price'] == '900'
+    assert mapped['url'] == ''
+
+    # Short rows fall back to defaults instead of raising IndexError.
+    assert standard(['Only title'])['price'] == '0'
+
+
+def test_read_csv_rows_skips_blank_lines_like_dict_reader():
+    from routes.import_routes import _read_csv_rows
+
+    header, rows = _read_csv_rows(StringIO('title,price\r\nA,1\r\n\r\nB,2\r\n'))
+
+    assert header == ['title', 'price']
+    assert list(rows) == [['A', '1'], ['B', '2']]
+    assert _read_csv_rows(StringIO(''))[0] == []
+
+
+def test_direct_csv_import_writes_in_batches_and_skips_cross_batch_duplicates(client, db_session, monkeypatch):
+    import routes.import_routes as import_routes
+
+    user = _login_user(client, db_session, 'import_batch_user')
+    monkeypatch.setattr(import_routes, '_IMPORT_BATCH_SIZE', 2)
+    inserted_batches = []
+    original_insert = import_routes._insert_import_rows
+
+    def _tracking_insert(session_db, pending_rows):
+        inserted_batches.append(len(pending_rows))
+        return original_insert(session_db, pending_rows)
+
+    monkeypatch.setattr(import_routes, '_insert_import_rows', _tracking_insert)
+
+    content = (
+        'title,price,url\n'
+        'Batch 1,100,https://example.com/batch/1\n'
+        'Batch 2,200,https://example.com/batch/2\n'
+        'Batch 1 again,300,https://example.com/batch/1\n'
+        'Batch 3,400,https://example.com/batch/3\n'
+        'Batch 4,500,https://example.com/batch/4\n'
+    )
+    response = client.post('/import/csv', data={
+        'site': 'import',
+        'file': _csv_upload(content),
+    }, content_type='multipart/form-data', follow_redirects=True)
+
+    assert response.status_code == 200
+    assert inserted_batches == [2, 1, 1]
+    titles = sorted(title for (title,) in db_session.query(Product.last_title).filter_by(user_id=user.id))
+    assert titles == ['Batch 1', 'Batch 2', 'Batch 3', 'Batch 4']
+    assert '4件のインポートが完了しました。 1件スキップ。' in response.get_data(as_text=True)
+
+
+def test_direct_csv_import_keeps_committed_batches_when_a_later_batch_fails(client, db_session, monkeypatch):
+    import routes.import_routes as import_routes
+
+    user = _login_user(client, db_session, 'import_partial_user')
+    monkeypatch.setattr(import_routes, '_IMPORT_BATCH_SIZE', 2)
+    original_insert = import_routes._insert_import_rows
+    calls = []
+
+    def _failing_second_batch(session_db, pending_rows):
+        calls.append(len(pending_rows))
+        if len(calls) == 2:
+            raise RuntimeError('disk full')
+        return original_insert(session_db, pending_rows)
+
+    monkeypatch.setattr(import_routes, '_insert_import_rows', _failing_second_batch)
+
+    content = (
+        'title,price,url\n'
+        'Kept 1,100,https://example.com/partial/1\n'
+        'Kept 2,200,https://example.com/partial/2\n'
+        'Lost 3,300,https://example.com/partial/3\n'
+    )
+    response = client.post('/import/csv', data={
+        'site': 'import',
+        'file': _csv_upload(content),
+    }, content_type='multipart/form-data', follow_redirects=True)
+
+    titles = sorted(title for (title,) in db_session.query(Product.last_title).filter_by(user_id=user.id))
+    assert titles == ['Kept 1', 'Kept 2']
+    assert 'インポートエラー: disk full (2件はインポート済みです)' in response.get_data(as_text=True)
+
+
+def test_csv_preview_rejects_undecodable_upload_and_removes_stored_file(client, db_session, app, tmp_path):
+    app.config['IMPORT_PREVIEW_STORAGE_PATH'] = str(tmp_path)
+    _login_user(client, db_session, 'import_preview_bad_encoding_user')
+
+    content = 'title,price,url\n' + 'Shift JIS 商品,100,https://example.com/sjis\n'
+    response = client.post('/import/preview', data={
+        'site': 'import',
+        'file': (BytesIO(content.encode('shift_jis')), 'products.csv'),
+    }, content_type='multipart/form-data', follow_redirects=True)
+
+    assert response.status_code == 200
+    assert 'UTF-8 形式のCSVを選択してください' in response.get_data(as_text=True)
+    assert list(tmp_path.glob('*.csv')) == []
+    with client.session_transaction() as flask_session:
+        assert 'import_csv_token' not in flask_session
@@ -22,6 +22,7 @@ def _make_product(product_id=1, site="mercari", last_status="on_sale"):
         patrol_fail_count=0,
         updated_at=None,
         pricing_rule_id=None,
+        variants=[],
     )
     return product
 
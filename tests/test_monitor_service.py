@@ -306,6 +306,45 @@ def test_patrol_deleted_status_only_preserves_price_and_zeroes_inventory(client,
     assert refreshed_variant.inventory_qty == 0
 
 
+def test_patrol_loads_variants_in_one_query(client, db_session, monkeypatch, capture_sql):
+    user = _create_user(db_session, 'monitor_variant_batch_user')
+    old_time = utc_now() - timedelta(days=1)
+    product_ids = []
+    for index in range(3):
+        product = Product(
+            user_id=user.id,
+            site='mercari',
+            source_url=f'https://jp.mercari.com/item/m-variant-batch-{index}',
+            last_title=f'Batch Item {index}',
+            last_price=1000,
+            last_status='on_sale',
+            archived=False,
+            deleted_at=None,
+            created_at=old_time,
+            updated_at=old_time,
+        )
+        db_session.add(product)
+        db_session.flush()
+        db_session.add(Variant(product_id=product.id, option1_value='Default Title', price=1000, inventory_qty=1, position=1))
+        product_ids.append(product.id)
+    db_session.commit()
+
+    sold_patrol = FakePatrol(PatrolResult(price=1000, status='sold', variants=[], confidence='high'))
+    monkeypatch.setattr(MonitorService, '_patrols', {'mercari': sold_patrol})
+
+    with capture_sql() as statements:
+        summary = MonitorService.check_stale_products(limit=10)
+    selects = [statement for statement in statements if statement.lstrip().upper().startswith('SELECT')]
+
+    assert summary['updated_count'] == 3
+    assert len([s for s in selects if 'FROM variants' in s]) == 1
+    assert len([s for s in selects if 'FROM products' in s]) == 1
+
+    db_session.expire_all()
+    variants = db_session.query(Variant).filter(Variant.product_id.in_(product_ids)).all()
+    assert [variant.inventory_qty for variant in variants] == [0, 0, 0]
+
+
 def test_rakuma_404_marks_product_deleted_without_backoff(client, db_session, monkeypatch):
     user = _create_user(db_session, 'monitor_rakuma_deleted_user')
     old_time = utc_now() - timedelta(days=1)
@@ -468,3 +468,98 @@ def test_save_scraped_items_respects_cache_disabled_flag(
     )
     assert snapshot.image_urls == external_url
 
+
+
+def test_save_scraped_items_writes_one_snapshot_per_item_in_batch(client, db_session, monkeypatch):
+    import services.product_service as product_service
+
+    user = _create_user(db_session, 'product_service_bulk_snapshot_user')
+    monkeypatch.setattr(product_service, '_IMAGE_CACHE_ENABLED', False)
+    calls = []
+    original = product_service._bulk_insert_snapshots
+
+    def _spy(session_db, rows):
+        calls.append(len(rows))
+        return original(session_db, rows)
+
+    monkeypatch.setattr(product_service, '_bulk_insert_snapshots', _spy)
+
+    items = [
+        {
+            'url': f'https://jp.mercari.com/item/m-bulk-{index}',
+            'title': f'Bulk Item {index}',
+            'price': 1000 + index,
+            'status': 'on_sale',
+            'image_urls': [f'https://img.example.com/bulk-{index}.jpg'],
+        }
+        for index in range(3)
+    ]
+
+    new_count, _ = save_scraped_items_to_db(items, user_id=user.id, site='mercari')
+
+    assert new_count == 3
+    assert calls == [3]
+    db_session.expire_all()
+    snapshots = (
+        db_session.query(ProductSnapshot)
+        .join(Product, Product.id == ProductSnapshot.product_id)
+        .filter(Product.user_id == user.id)
+        .order_by(ProductSnapshot.price)
+        .all()
+    )
+    assert [snapshot.price for snapshot in snapshots] == [1000, 1001, 1002]
+    assert snapshots[0].image_urls == 'https://img.example.com/bulk-0.jpg'
+
+
+def test_save_scraped_items_loads_existing_products_and_variants_once(client, db_session, monkeypatch, capture_sql):
+    import services.product_service as product_service
+
+    user = _create_user(db_session, 'product_service_prefetch_user')
+    monkeypatch.setattr(product_service, '_IMAGE_CACHE_ENABLED', False)
+    now = utc_now()
+    for index in range(3):
+        product = Product(
+            user_id=user.id,
+            site='mercari',
+            source_url=f'https://jp.mercari.com/item/m-prefetch-{index}',
+            last_title=f'Prefetch {index}',
+            last_price=1000,
+            last_status='on_sale',
+            created_at=now,
+            updated_at=now,
+        )
+        db_session.add(product)
+        db_session.flush()
+        db_session.add(Variant(product_id=product.id, option1_value='Default Title', price=1000, position=1))
+    db_session.commit()
+    user_id = user.id
+
+    items = [
+        {
+            'url': f'https://jp.mercari.com/item/m-prefetch-{index}',
+            'title': f'Prefetch {index}',
+            'price': 1500,
+            'status': 'sold',
+        }
+        for index in range(3)
+    ]
+    items.append({'url': 'https://jp.mercari.com/item/m-prefetch-new', 'title': 'New', 'price': 900, 'status': 'on_sale'})
+    items.append({'url': 'https://jp.mercari.com/item/m-prefetch-new', 'title': 'New', 'price': 950, 'status': 'on_sale'})
+
+    with capture_sql() as statements:
+        summary = save_scraped_items_to_db(items, user_id=user_id, site='mercari', return_summary=True)
+    selects = [statement for statement in statements if statement.lstrip().upper().startswith('SELECT')]
+
+    assert summary['new_count'] == 1
+    assert summary['updated_count'] == 4
+    assert len([s for s in selects if 'FROM products' in s]) == 1
+    # One prefetch for the existing products, one lazy load for the repeated new URL.
+    assert len([s for s in selects if 'FROM variants' in s]) == 2
+
+    db_session.expire_all()
+    products = db_session.query(Product).filter_by(user_id=user_id).order_by(Product.id).all()
+    assert len(products) == 4
+    assert [product.last_price for product in products] == [1500, 1500, 1500, 950]
+    variants = db_session.query(Variant).filter(Variant.product_id.in_([p.id for p in products[:3]])).all()
+    assert {(variant.price, variant.inventory_qty) for variant in variants} == {(1500, 0)}
+    assert db_session.query(Variant).filter_by(product_id=products[3].id).one().price == 950
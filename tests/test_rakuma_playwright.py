@@ -16,8 +16,10 @@ from unittest.mock import patch, MagicMock, AsyncMock
 # ---------------------------------------------------------------------------
 
 @pytest.fixture(autouse=True)
-def _patch_scrapling():
+def _patch_scrapling(monkeypatch):
     """Patch scrapling and scrapling.fetchers modules for every test."""
+    # These tests assert against the one-shot Fetcher.get path.
+    monkeypatch.setenv("SCRAPE_STATIC_SESSION_REUSE", "0")
     original = sys.modules.get("scrapling")
     original_fetchers = sys.modules.get("scrapling.fetchers")
 
@@ -460,6 +462,42 @@ def test_scrape_single_item_no_selenium(_patch_scrapling):
         mock_create_driver.assert_not_called()
 
 
+# ---------------------------------------------------------------------------
+# rakuma_db.scrape_search_result
+# ---------------------------------------------------------------------------
+
+def test_scrape_search_result_runs_search_page_through_browser_pool(_patch_scrapling, monkeypatch):
+    """検索ページは browser_pool の page task として実行され、詳細は HTTP で取得されることを確認"""
+    import rakuma_db
+
+    link = MagicMock()
+    link.get_attribute = AsyncMock(return_value="https://item.fril.jp/abc123")
+    pw_page = MagicMock()
+    pw_page.goto = AsyncMock()
+    pw_page.title = AsyncMock(return_value="ラクマ検索")
+    pw_page.evaluate = AsyncMock()
+    pw_page.wait_for_timeout = AsyncMock()
+    pw_page.query_selector_all = AsyncMock(return_value=[link])
+    captured = {}
+
+    async def fake_run_browser_page_task(site, task, **kwargs):
+        captured["site"] = site
+        return await task(pw_page, MagicMock())
+
+    async def fake_detail(url):
+        return {"url": url, "title": "Camera", "price": 1000, "status": "active",
+                "description": "", "image_urls": [], "variants": []}
+
+    monkeypatch.setattr(rakuma_db, "run_browser_page_task", fake_run_browser_page_task)
+    monkeypatch.setattr(rakuma_db, "_scrape_item_detail_async", fake_detail)
+
+    result = rakuma_db.scrape_search_result("https://fril.jp/s?query=camera", max_items=1, max_scroll=1)
+
+    assert captured["site"] == "rakuma"
+    pw_page.goto.assert_awaited_once()
+    assert [item["url"] for item in result] == ["https://item.fril.jp/abc123"]
+
+
 # ---------------------------------------------------------------------------
 # RakumaPatrol
 # ---------------------------------------------------------------------------
@@ -68,3 +68,21 @@ def test_maybe_mark_job_stalled_converts_old_running_job(app):
     assert stored["status"] == "failed"
     assert stored["error_payload"]["kind"] == "job_stalled"
     assert "停止" in stored["error"]
+
+
+def test_run_tracked_job_closes_thread_static_session(app, monkeypatch):
+    import services.scrape_job_runtime as scrape_job_runtime
+
+    resets = []
+    monkeypatch.setattr(scrape_job_runtime, "reset_thread_static_session", lambda: resets.append(True))
+    create_job_record(
+        job_id="runtime-job-session",
+        site="rakuma",
+        context={"persist_to_db": False},
+        request_payload={"site": "rakuma", "persist_to_db": False},
+        mode="preview",
+    )
+
+    run_tracked_job("runtime-job-session", lambda: {"items": [], "persist_to_db": False})
+
+    assert resets == [True]
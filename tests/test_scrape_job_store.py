@@ -1,6 +1,7 @@
 from models import User
 from services.scrape_job_store import (
     create_job_record,
+    find_active_job_id_for_request,
     get_job_backlog_snapshot,
     get_job_record,
     list_job_records_for_user,
@@ -58,6 +59,30 @@ def test_scrape_job_store_round_trip(app, db_session):
     assert [job["job_id"] for job in jobs] == ["job-store-1"]
 
 
+def test_find_active_job_id_for_request_ignores_finished_and_other_requests(app, db_session):
+    user = User(username="job_store_dedupe_user")
+    user.set_password("testpassword")
+    db_session.add(user)
+    db_session.commit()
+
+    payload = {"site": "mercari", "keyword": "camera", "limit": 10, "persist_to_db": True}
+    create_job_record(job_id="dedupe-done", site="mercari", user_id=user.id, request_payload=payload)
+    mark_job_completed("dedupe-done", {"items": []})
+    create_job_record(
+        job_id="dedupe-other",
+        site="mercari",
+        user_id=user.id,
+        request_payload={**payload, "keyword": "lens"},
+    )
+
+    assert find_active_job_id_for_request(user.id, payload) is None
+
+    create_job_record(job_id="dedupe-live", site="mercari", user_id=user.id, request_payload=dict(reversed(payload.items())))
+
+    assert find_active_job_id_for_request(user.id, payload) == "dedupe-live"
+    assert find_active_job_id_for_request(user.id + 1, payload) is None
+
+
 def test_reconcile_stalled_jobs_marks_only_expired_running_jobs(app, db_session):
     user = User(username="job_store_reconcile_user")
     user.set_password("testpassword")
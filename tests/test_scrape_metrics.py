@@ -0,0 +1,62 @@
+import threading
+
+import scrape_metrics
+from scrape_metrics import MAX_RECORDED_ERRORS, ScrapeMetrics, get_metrics
+
+
+def test_get_metrics_is_isolated_per_thread():
+    main_metrics = get_metrics()
+    main_metrics.start("yahoo", "search")
+    main_metrics.record_attempt(True, "https://example.com/main")
+
+    seen = {}
+
+    def worker():
+        metrics = get_metrics()
+        metrics.start("rakuma", "search")
+        metrics.record_attempt(False, "https://example.com/worker", "boom")
+        seen["metrics"] = metrics
+        seen["summary"] = metrics.finish()
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    thread.join()
+
+    assert seen["metrics"] is not main_metrics
+    assert seen["summary"]["site"] == "rakuma"
+    assert seen["summary"]["failed"] == 1
+    assert get_metrics() is main_metrics
+
+    summary = main_metrics.finish()
+    assert summary["site"] == "yahoo"
+    assert summary["successful"] == 1
+    assert summary["failed"] == 0
+
+
+def test_record_attempt_keeps_only_first_errors(monkeypatch):
+    monkeypatch.setattr(scrape_metrics.scrape_logger, "disabled", True)
+    metrics = ScrapeMetrics()
+    metrics.start("surugaya", "search")
+    for index in range(MAX_RECORDED_ERRORS + 3):
+        metrics.record_attempt(False, f"https://example.com/{index}", "missing title")
+
+    summary = metrics.finish()
+
+    assert summary["failed"] == MAX_RECORDED_ERRORS + 3
+    assert len(metrics.errors) == MAX_RECORDED_ERRORS
+    assert summary["errors"][0] == "https://example.com/0: missing title"
+
+
+
+def test_scrape_logger_writes_through_lazily_started_listener(capsys, monkeypatch):
+    # Alembic's fileConfig (run by the migration tests) disables existing loggers.
+    monkeypatch.setattr(scrape_metrics.scrape_logger, "disabled", False)
+    scrape_metrics._stop_log_listener()
+    assert scrape_metrics._log_listener is None
+
+    scrape_metrics.scrape_logger.info("[%s] queued record", "mercari")
+    assert scrape_metrics._log_listener is not None
+
+    # Stopping drains the queue, so the record has reached stderr.
+    scrape_metrics._stop_log_listener()
+    assert "scraping - INFO - [mercari] queued record" in capsys.readouterr().err
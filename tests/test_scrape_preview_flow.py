@@ -185,6 +185,51 @@ def test_scrape_run_standard_mode_redirects_and_keeps_persist_flow(client, db_se
     assert build_calls['persist_to_db'] is True
 
 
+def test_scrape_run_reuses_identical_in_flight_job(client, db_session, monkeypatch):
+    from services.scrape_job_store import create_job_record
+    from services.scrape_request import build_scrape_task_request
+
+    user = login_user(client, db_session, 'preview_dedupe_user')
+    fake_queue = FakeQueue()
+    create_job_record(
+        job_id='job-live',
+        site='mercari',
+        user_id=user.id,
+        request_payload=build_scrape_task_request(
+            site='mercari',
+            target_url=None,
+            keyword='duplicate',
+            price_min=None,
+            price_max=None,
+            sort='created_desc',
+            category=None,
+            limit=10,
+            user_id=user.id,
+        ),
+    )
+    fake_queue.jobs['job-live'] = {
+        'job_id': 'job-live',
+        'status': 'running',
+        'site': 'mercari',
+        'user_id': user.id,
+        'created_at': 1.0,
+    }
+
+    monkeypatch.setattr('routes.scrape.get_queue', lambda: fake_queue)
+    monkeypatch.setattr('routes.scrape._build_scrape_task', lambda **kwargs: lambda: {'items': []})
+
+    response = client.post('/scrape/run', data={'site': 'mercari', 'keyword': 'duplicate'})
+
+    assert response.status_code == 302
+    assert '/scrape/status/job-live' in response.headers['Location']
+    assert fake_queue.counter == 0
+
+    response = client.post('/scrape/run', data={'site': 'mercari', 'keyword': 'different'})
+
+    assert '/scrape/status/job-1' in response.headers['Location']
+    assert fake_queue.counter == 1
+
+
 def test_register_selected_saves_only_selected_items(client, db_session, monkeypatch):
     user = login_user(client, db_session, 'register_selected_user')
     fake_queue = FakeQueue()
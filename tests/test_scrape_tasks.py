@@ -117,3 +117,54 @@ def test_execute_scrape_job_uses_internal_smoke_payload(monkeypatch):
     assert result["search_url"] == "internal://stack-smoke/test"
     assert result["new_count"] == 1
     assert save_calls[0][1:] == ("mercari", 1, 3)
+
+
+def test_execute_scrape_job_coalesces_identical_concurrent_scrapes(monkeypatch):
+    import threading
+
+    calls = []
+    started = threading.Event()
+    release = threading.Event()
+
+    def fake_scrape_search_result(search_url, max_items, max_scroll, headless):
+        calls.append(search_url)
+        started.set()
+        assert release.wait(timeout=5)
+        return [{"url": "https://jp.mercari.com/item/m-1", "title": "Shared Item", "price": 1200, "image_urls": []}]
+
+    monkeypatch.setattr("jobs.scrape_tasks.scrape_search_result", fake_scrape_search_result)
+    monkeypatch.setattr("jobs.scrape_tasks.filter_excluded_items", lambda items, user_id: (items, 0))
+    monkeypatch.setattr("jobs.scrape_tasks.filter_items_by_price", lambda items, price_min, price_max: (items, 0))
+
+    def build_request(user_id):
+        return build_scrape_task_request(
+            site="mercari",
+            target_url="",
+            keyword="shared",
+            price_min=None,
+            price_max=None,
+            sort="created_desc",
+            category=None,
+            limit=2,
+            user_id=user_id,
+            persist_to_db=False,
+        )
+
+    results = {}
+    first = threading.Thread(target=lambda: results.setdefault(1, execute_scrape_job(build_request(1))))
+    first.start()
+    assert started.wait(timeout=5)
+    second = threading.Thread(target=lambda: results.setdefault(2, execute_scrape_job(build_request(2))))
+    second.start()
+    second.join(timeout=0.5)
+    release.set()
+    first.join(timeout=5)
+    second.join(timeout=5)
+
+    assert len(calls) == 1
+    assert results[1]["items"][0]["title"] == "Shared Item"
+    assert results[2]["items"][0]["title"] == "Shared Item"
+    assert results[1]["items"][0] is not results[2]["items"][0]
+
+    execute_scrape_job(build_request(3))
+    assert len(calls) == 2
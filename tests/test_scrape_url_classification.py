@@ -5,6 +5,7 @@ from services.scrape_request import (
     build_scrape_job_context,
     build_scrape_task_request,
     classify_target_url,
+    detect_site_from_url,
 )
 
 
@@ -49,6 +50,49 @@ def test_classify_target_url_unknown_domain_falls_back_to_item():
     assert classify_target_url("") == ("item", "mercari")
 
 
+def test_detect_site_from_url_matches_hostname_not_query_string():
+    assert detect_site_from_url("https://store.shopping.yahoo.co.jp/shop/item.html") == "yahoo"
+    assert detect_site_from_url("snkrdunk.com/products/DZ5485-612") == "snkrdunk"
+    assert detect_site_from_url("https://example.com/redirect?to=https://fril.jp/s") == "mercari"
+    assert classify_target_url("https://example.com/?u=netmall.hardoff.co.jp") == ("item", "mercari")
+
+
+def test_execute_scrape_job_dispatches_keyword_search_by_site(monkeypatch):
+    import jobs.scrape_tasks as scrape_tasks
+
+    calls = {}
+
+    def fake_search(search_url, max_items, max_scroll, headless):
+        calls["search_url"] = search_url
+        return [{"url": "https://snkrdunk.com/products/1", "title": "Sneaker", "price": 9000, "image_urls": []}]
+
+    monkeypatch.setattr(scrape_tasks.snkrdunk_db, "scrape_search_result", fake_search)
+    monkeypatch.setattr("jobs.scrape_tasks.filter_excluded_items", lambda items, user_id: (items, 0))
+    monkeypatch.setattr(
+        "jobs.scrape_tasks.filter_items_by_price",
+        lambda items, price_min, price_max: (items, 0),
+    )
+
+    result = execute_scrape_job(
+        build_scrape_task_request(
+            site="snkrdunk",
+            target_url=None,
+            keyword="jordan",
+            price_min=None,
+            price_max=None,
+            sort="",
+            category=None,
+            limit=5,
+            user_id=1,
+            persist_to_db=False,
+        )
+    )
+
+    assert calls["search_url"] == "https://snkrdunk.com/search?keywords=jordan"
+    assert result["search_url"] == calls["search_url"]
+    assert [item["title"] for item in result["items"]] == ["Sneaker"]
+
+
 def test_build_scrape_job_context_item_url_keeps_limit_one():
     context = build_scrape_job_context(
         site="mercari",
@@ -61,3 +61,84 @@ def test_run_coro_sync_propagates_exceptions():
 
     with pytest.raises(ValueError, match="bad coroutine"):
         run_coro_sync(boom())
+
+
+def test_fetch_static_reuses_thread_session_and_resets_after_failure(monkeypatch):
+    import sys
+    import types
+
+    import services.scraping_client as scraping_client
+
+    created = []
+
+    class FakeFetcherSession:
+        def __init__(self, **kwargs):
+            self.calls = []
+            self.closed = False
+            created.append(self)
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc_info):
+            self.closed = True
+
+        def get(self, url, timeout=30, **kwargs):
+            self.calls.append(url)
+            if url.endswith("/boom"):
+                raise RuntimeError("connection reset")
+            return f"page:{url}"
+
+    fake_module = types.ModuleType("scrapling.engines.static")
+    fake_module.FetcherSession = FakeFetcherSession
+    monkeypatch.setitem(sys.modules, "scrapling.engines.static", fake_module)
+    monkeypatch.delenv("SCRAPE_STATIC_SESSION_REUSE", raising=False)
+    scraping_client.reset_thread_static_session()
+
+    assert scraping_client.fetch_static("https://example.com/a") == "page:https://example.com/a"
+    assert scraping_client.fetch_static("https://example.com/b") == "page:https://example.com/b"
+    assert len(created) == 1
+
+    with pytest.raises(RuntimeError):
+        scraping_client.fetch_static("https://example.com/boom")
+    assert created[0].closed is True
+
+    scraping_client.fetch_static("https://example.com/c")
+    assert len(created) == 2
+    scraping_client.reset_thread_static_session()
+
+
+def test_fetch_static_passes_kwargs_through_reused_session_for_patrol(monkeypatch):
+    import sys
+    import types
+
+    import services.scraping_client as scraping_client
+    from services.patrol.rakuma_patrol import RakumaPatrol
+
+    calls = []
+
+    class FakeFetcherSession:
+        def __init__(self, **kwargs):
+            self.init_kwargs = kwargs
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc_info):
+            return None
+
+        def get(self, url, **kwargs):
+            calls.append((url, kwargs))
+            raise RuntimeError("offline")
+
+    fake_module = types.ModuleType("scrapling.engines.static")
+    fake_module.FetcherSession = FakeFetcherSession
+    monkeypatch.setitem(sys.modules, "scrapling.engines.static", fake_module)
+    monkeypatch.delenv("SCRAPE_STATIC_SESSION_REUSE", raising=False)
+    scraping_client.reset_thread_static_session()
+
+    result = RakumaPatrol().fetch("https://item.fril.jp/abc")
+
+    assert result.success is False
+    assert calls == [("https://item.fril.jp/abc", {"timeout": 30, "follow_redirects": True})]
+    scraping_client.reset_thread_static_session()
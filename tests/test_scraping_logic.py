@@ -317,3 +317,104 @@ def test_mercari_shops_status_detects_full_sold_out():
     """
     assert _infer_mercari_shops_status(body_text) == "sold"
 
+
+class _FakeSearchLink:
+    def __init__(self, href):
+        self._href = href
+
+    async def get_attribute(self, name):
+        return self._href if name == "href" else None
+
+
+class _FakeMercariSearchPage:
+    """Search page whose item grid grows once after the first scroll."""
+
+    def __init__(self, batches):
+        self._batches = list(batches)
+        self.visible = self._batches.pop(0)
+        self.link_growth_waits = []
+        self.scrolls = 0
+
+    async def goto(self, url, **kwargs):
+        return None
+
+    async def wait_for_selector(self, selector, **kwargs):
+        return None
+
+    async def query_selector_all(self, selector):
+        if selector == "a[data-testid='thumbnail-link']":
+            return [_FakeSearchLink(f"/item/m{index}") for index in range(self.visible)]
+        return []
+
+    async def evaluate(self, script, *args):
+        self.scrolls += 1
+
+    async def wait_for_function(self, script, arg=None, timeout=None):
+        self.link_growth_waits.append((arg, timeout))
+        if self._batches:
+            self.visible = self._batches.pop(0)
+            return True
+        raise TimeoutError("no new links")
+
+    async def wait_for_timeout(self, timeout):
+        raise AssertionError("fixed sleeps should not be used")
+
+
+@pytest.mark.asyncio
+async def test_mercari_search_scroll_waits_for_link_growth_and_stops_when_flat():
+    import mercari_db
+
+    page = _FakeMercariSearchPage([2, 4])
+
+    async def fake_run_browser_page_task(site, task, **kwargs):
+        return await task(page, None)
+
+    with patch("mercari_db.run_browser_page_task", side_effect=fake_run_browser_page_task):
+        urls = await mercari_db._scrape_search_async("https://jp.mercari.com/search?keyword=x", max_items=10, max_scroll=3)
+
+    assert urls == [f"https://jp.mercari.com/item/m{index}" for index in range(4)]
+    # One wait per scroll, keyed on the link count seen before scrolling.
+    assert page.link_growth_waits == [(2, 2000), (4, 2000)]
+    assert page.scrolls == 2
+
+
+class _FakeShopsPage:
+    def __init__(self):
+        self.selector_waits = []
+
+    async def goto(self, url, **kwargs):
+        return None
+
+    async def wait_for_load_state(self, state, **kwargs):
+        return None
+
+    async def wait_for_selector(self, selector, timeout=None):
+        self.selector_waits.append((selector, timeout))
+        if selector == "[data-testid='product-description']":
+            raise TimeoutError("description never rendered")
+
+    async def evaluate(self, script, *args):
+        return {"title": "Shops Item", "description": "", "bodyText": "Shops Item ¥1,000", "documentTitle": ""}
+
+    async def content(self):
+        return "<html><body><h1>Shops Item</h1><div data-testid='product-price'>¥1,000</div></body></html>"
+
+    async def wait_for_timeout(self, timeout):
+        raise AssertionError("fixed sleeps should not be used")
+
+
+@pytest.mark.asyncio
+async def test_mercari_shops_waits_for_description_selector_without_fixed_sleep():
+    import mercari_db
+
+    page = _FakeShopsPage()
+
+    async def fake_run_browser_page_task(site, task, **kwargs):
+        return await task(page, None)
+
+    with patch("mercari_db.run_browser_page_task", side_effect=fake_run_browser_page_task):
+        data = await mercari_db._scrape_shops_product_async("https://jp.mercari.com/shops/product/abc")
+
+    assert ("[data-testid='product-description']", 3000) in page.selector_waits
+    assert data["title"] == "Shops Item"
+    assert data["price"] == 1000
@@ -232,6 +232,36 @@ def test_yahoo_search_result_uses_extra_candidates_to_fill_requested_count(monke
     assert [item["title"] for item in results] == ["Yahoo 3", "Yahoo 4", "Yahoo 5"]
 
 
+def test_yahoo_search_result_fetches_details_concurrently_and_skips_failures(monkeypatch):
+    import threading
+
+    urls = [f"https://store.shopping.yahoo.co.jp/test/item-{idx}.html" for idx in range(4)]
+    search_page = MockPage(
+        css_map={
+            "a[class*='SearchResult_SearchResultItem__detailLink']": [
+                MockElement(attrib={"href": url}) for url in urls
+            ]
+        }
+    )
+    barrier = threading.Barrier(2, timeout=5)
+
+    def fake_detail(url):
+        if url in urls[:2]:
+            barrier.wait()
+        if url == urls[0]:
+            raise RuntimeError("detail failed")
+        return {"title": f"Yahoo {url[-6]}", "status": "on_sale", "url": url}
+
+    monkeypatch.setenv("YAHOO_DETAIL_CONCURRENCY", "2")
+    monkeypatch.setattr("services.scraping_client.fetch_static", lambda url: search_page)
+    monkeypatch.setattr(yahoo_db, "scrape_item_detail", fake_detail)
+    monkeypatch.setattr(yahoo_db, "log_scrape_result", lambda *args, **kwargs: True)
+
+    results = yahoo_db.scrape_search_result("https://shopping.yahoo.co.jp/search?p=sneaker", max_items=2, max_scroll=1)
+
+    assert [item["title"] for item in results] == ["Yahoo 1", "Yahoo 2"]
+
+
 def test_offmall_search_result_uses_extra_candidates_to_fill_requested_count(monkeypatch):
     urls = [f"https://netmall.hardoff.co.jp/product/{idx}/" for idx in range(5)]
     search_page = MockPage(
@@ -256,6 +286,66 @@ def test_offmall_search_result_uses_extra_candidates_to_fill_requested_count(mon
     assert [item["title"] for item in results] == ["Offmall 3", "Offmall 4", "Offmall 5"]
 
 
+def test_offmall_search_result_fetches_details_concurrently_and_skips_failures(monkeypatch):
+    import threading
+
+    urls = [f"https://netmall.hardoff.co.jp/product/{idx}/" for idx in range(4)]
+    search_page = MockPage(
+        css_map={
+            "a[href*='/product/']": [MockElement(attrib={"href": url}) for url in urls]
+        }
+    )
+    barrier = threading.Barrier(2, timeout=5)
+
+    def fake_detail(url):
+        if url in urls[:2]:
+            # Both of the first two details must be in flight at once.
+            barrier.wait()
+        if url == urls[0]:
+            raise RuntimeError("detail failed")
+        return {"title": f"Offmall {url[-2]}", "status": "active", "url": url}
+
+    monkeypatch.setenv("OFFMALL_DETAIL_CONCURRENCY", "2")
+    monkeypatch.setattr("services.scraping_client.fetch_static", lambda url: search_page)
+    monkeypatch.setattr(offmall_db, "scrape_item_detail", fake_detail)
+
+    results = offmall_db.scrape_search_result("https://netmall.hardoff.co.jp/search?q=camera", max_items=2, max_scroll=1)
+
+    assert [item["title"] for item in results] == ["Offmall 1", "Offmall 2"]
+
+
+def test_offmall_search_result_closes_each_worker_static_session(monkeypatch):
+    import threading
+
+    urls = [f"https://netmall.hardoff.co.jp/product/{idx}/" for idx in range(6)]
+    search_page = MockPage(
+        css_map={
+            "a[href*='/product/']": [MockElement(attrib={"href": url}) for url in urls]
+        }
+    )
+    fetch_threads = []
+    reset_threads = []
+
+    def fake_detail(url):
+        fetch_threads.append(threading.get_ident())
+        return {"title": f"Offmall {url[-2]}", "status": "active", "url": url}
+
+    monkeypatch.setenv("OFFMALL_DETAIL_CONCURRENCY", "2")
+    monkeypatch.setattr("services.scraping_client.fetch_static", lambda url: search_page)
+    monkeypatch.setattr(
+        "services.scraping_client.reset_thread_static_session",
+        lambda: reset_threads.append(threading.get_ident()),
+    )
+    monkeypatch.setattr(offmall_db, "scrape_item_detail", fake_detail)
+
+    results = offmall_db.scrape_search_result("https://netmall.hardoff.co.jp/search?q=camera", max_items=3, max_scroll=1)
+
+    assert [item["title"] for item in results] == ["Offmall 0", "Offmall 1", "Offmall 2"]
+    assert len(fetch_threads) == 6
+    assert len(reset_threads) == 2
+    assert set(fetch_threads) <= set(reset_threads)
+
+
 def test_yahuoku_search_result_uses_extra_candidates_to_fill_requested_count(monkeypatch):
     urls = [f"https://page.auctions.yahoo.co.jp/auction/g12345678{idx}" for idx in range(5)]
     search_page = MockPage(
@@ -280,6 +370,33 @@ def test_yahuoku_search_result_uses_extra_candidates_to_fill_requested_count(mon
     assert [item["title"] for item in results] == ["Auction 3", "Auction 4", "Auction 5"]
 
 
+def test_yahuoku_search_result_fetches_details_concurrently_and_skips_failures(monkeypatch):
+    import threading
+
+    urls = [f"https://page.auctions.yahoo.co.jp/auction/g12345678{idx}" for idx in range(4)]
+    search_page = MockPage(
+        css_map={
+            ".Product__titleLink": [MockElement(attrib={"href": url}) for url in urls]
+        }
+    )
+    barrier = threading.Barrier(2, timeout=5)
+
+    def fake_detail(url):
+        if url in urls[:2]:
+            barrier.wait()
+        if url == urls[0]:
+            raise RuntimeError("detail failed")
+        return {"title": f"Auction {url[-1]}", "status": "active", "url": url}
+
+    monkeypatch.setenv("YAHUOKU_DETAIL_CONCURRENCY", "2")
+    monkeypatch.setattr("services.scraping_client.fetch_static", lambda url: search_page)
+    monkeypatch.setattr(yahuoku_db, "scrape_item_detail", fake_detail)
+
+    results = yahuoku_db.scrape_search_result("https://auctions.yahoo.co.jp/search/search?p=console", max_items=2, max_scroll=1)
+
+    assert [item["title"] for item in results] == ["Auction 1", "Auction 2"]
+
+
 def test_snkrdunk_search_result_uses_extra_candidates_to_fill_requested_count(monkeypatch):
     urls = [f"https://snkrdunk.com/products/CT8013-17{idx}" for idx in range(5)]
     search_page = MockPage(
@@ -0,0 +1,63 @@
+from datetime import datetime
+
+from models import Product, ProductSnapshot, User
+from services.snapshot_service import attach_latest_snapshots, load_recent_snapshots_by_product
+
+
+def _product_with_snapshots(db_session, user, source_url, scraped_days):
+    product = Product(user_id=user.id, site='mercari', source_url=source_url, last_title=source_url)
+    db_session.add(product)
+    db_session.commit()
+    db_session.add_all([
+        ProductSnapshot(product_id=product.id, price=day * 100, scraped_at=datetime(2024, 1, day))
+        for day in scraped_days
+    ])
+    db_session.commit()
+    return product
+
+
+def test_load_recent_snapshots_ranks_newest_first_per_product(db_session):
+    user = User(username='snapshot_service_user')
+    user.set_password('testpassword')
+    db_session.add(user)
+    db_session.commit()
+
+    first = _product_with_snapshots(db_session, user, 'https://example.com/a', [1, 3, 2])
+    second = _product_with_snapshots(db_session, user, 'https://example.com/b', [5])
+
+    recent = load_recent_snapshots_by_product(db_session, [first.id, second.id], depth=2)
+
+    assert {rank: snapshot.price for rank, snapshot in recent[first.id].items()} == {1: 300, 2: 200}
+    assert {rank: snapshot.price for rank, snapshot in recent[second.id].items()} == {1: 500}
+    assert load_recent_snapshots_by_product(db_session, []) == {}
+
+
+def test_attach_latest_snapshots_sets_latest_and_skips_missing(db_session):
+    user = User(username='snapshot_attach_user')
+    user.set_password('testpassword')
+    db_session.add(user)
+    db_session.commit()
+
+    with_snapshots = _product_with_snapshots(db_session, user, 'https://example.com/c', [4, 7])
+    without_snapshots = _product_with_snapshots(db_session, user, 'https://example.com/d', [])
+
+    attach_latest_snapshots(db_session, [with_snapshots, None, without_snapshots])
+
+    assert with_snapshots.latest_snapshot.price == 700
+    assert without_snapshots.latest_snapshot is None
+
+
+def test_load_recent_snapshots_can_limit_loaded_columns(db_session):
+    user = User(username='snapshot_columns_user')
+    user.set_password('testpassword')
+    db_session.add(user)
+    db_session.commit()
+
+    product_id = _product_with_snapshots(db_session, user, 'https://example.com/e', [2, 6]).id
+    db_session.expunge_all()
+
+    recent = load_recent_snapshots_by_product(db_session, [product_id], columns=(ProductSnapshot.price,))
+
+    latest = recent[product_id][1]
+    assert latest.price == 600
+    assert 'scraped_at' not in latest.__dict__
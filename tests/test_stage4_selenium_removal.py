@@ -601,3 +601,31 @@ def test_surugaya_scrape_single_item_works_without_browser_fallback():
     assert len(results) == 1
     assert results[0]["title"] == "Surugaya Test"
     assert results[0]["price"] == 1980
+
+
+def test_offmall_detail_cache_reuses_successful_results_until_refresh(monkeypatch):
+    import offmall_db
+
+    url = "https://netmall.hardoff.co.jp/product/cache-test/"
+    calls = []
+
+    def fake_light(detail_url):
+        calls.append(detail_url)
+        if len(calls) == 1:
+            return {"url": detail_url, "title": "", "status": "error"}
+        return {"url": detail_url, "title": f"Cached Camera {len(calls)}", "status": "active"}
+
+    monkeypatch.delenv("OFFMALL_DETAIL_CACHE_TTL", raising=False)
+    monkeypatch.setattr(offmall_db, "scrape_item_detail_light", fake_light)
+    monkeypatch.setattr(offmall_db, "report_detail_result", lambda *args, **kwargs: None)
+    offmall_db.clear_detail_cache()
+
+    assert offmall_db.scrape_item_detail(url)["title"] == ""
+    first = offmall_db.scrape_item_detail(url)
+    first["title"] = "mutated by caller"
+    assert offmall_db.scrape_item_detail(url)["title"] == "Cached Camera 2"
+    assert len(calls) == 2
+
+    assert offmall_db.scrape_single_item(url)[0]["title"] == "Cached Camera 3"
+    assert len(calls) == 3
+    offmall_db.clear_detail_cache()
@@ -465,7 +465,11 @@ def scrape_search_result(
     candidate_target = max(max_items, max_items * 2)
 
     try:
-        from services.scraping_client import fetch_static
+        from services.scraping_client import (
+            fetch_static,
+            get_async_fetch_settings,
+            scrape_details_concurrently,
+        )
 
         current_url = search_url
         seen_pages = set()
@@ -483,10 +487,20 @@ def scrape_search_result(
                 break
             current_url = _find_next_page_url(page, current_url)
 
-        for item_url in candidate_urls:
+        settings = get_async_fetch_settings("yahoo")
+        detail_results = scrape_details_concurrently(
+            scrape_item_detail,
+            candidate_urls,
+            settings.concurrency,
+            thread_name_prefix="yahoo-detail",
+        )
+
+        for item_url, data in zip(candidate_urls, detail_results):
             if len(items) >= max_items:
                 break
-            data = scrape_item_detail(item_url)
+            if isinstance(data, Exception):
+                metrics.record_attempt(False, item_url, str(data))
+                continue
             log_scrape_result("yahoo", item_url, data)
             if data.get("title"):
                 items.append(data)
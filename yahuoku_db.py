@@ -357,7 +357,11 @@ def scrape_search_result(
     candidate_target = max(max_items, max_items * 2)
 
     try:
-        from services.scraping_client import fetch_static
+        from services.scraping_client import (
+            fetch_static,
+            get_async_fetch_settings,
+            scrape_details_concurrently,
+        )
 
         current_url = search_url
         seen_pages = set()
@@ -375,10 +379,20 @@ def scrape_search_result(
                 break
             current_url = _find_next_page_url(page, current_url)
 
-        for item_url in candidate_urls:
+        settings = get_async_fetch_settings("yahuoku")
+        detail_results = scrape_details_concurrently(
+            scrape_item_detail,
+            candidate_urls,
+            settings.concurrency,
+            thread_name_prefix="yahuoku-detail",
+        )
+
+        for item_url, result in zip(candidate_urls, detail_results):
             if len(results) >= max_items:
                 break
-            result = scrape_item_detail(item_url)
+            if isinstance(result, Exception):
+                logger.debug("Yahuoku detail scrape failed for %s: %s", item_url, result)
+                continue
             if result.get("title"):
                 results.append(result)
 